@@ -0,0 +1,111 @@
+"""Classical item analysis of the responses stored by `ingest_responses.py`.
+
+Usage:
+    python analyze_items.py [<quiz_name_or_pattern> ...] [--all-items] [--json PATH]
+
+Examples:
+    python analyze_items.py
+    python analyze_items.py "verbos_*" --all-items
+    python analyze_items.py --json item_report.json
+
+What this script does:
+    - Builds a students x questions answer matrix per quiz from
+      `.publish/responses.sqlite` and the answer keys (`correct_answer`) in
+      `forms/<quiz>.json`.
+    - Computes, with vectorized NumPy operations (`global/item_analysis.py`):
+        p        - share of students answering correctly (difficulty)
+        r_pb     - corrected point-biserial correlation with the rest score
+        D        - upper 27% minus lower 27% proportion correct
+        shares   - share of students choosing each option
+    - Flags questions that are too hard or too easy, weakly or negatively
+      discriminating, or with distractors that are rarely chosen or chosen
+      more often than the key. Quizzes with fewer than --min-responses
+      responses are listed without flags.
+
+Exit codes:
+    0 - report produced (flags do not change the exit code)
+    1 - no stored responses match
+"""
+import argparse
+import fnmatch
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from item_analysis import analyze_quiz
+from responses import RESPONSES_DB_FILE, connect
+from validation import load_quiz
+
+
+def _clean(value):
+    """NaN is not valid JSON; report it as null."""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, list):
+        return [_clean(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    return value
+
+
+def print_quiz(report, all_items, min_responses):
+    print(f"\n{report['quiz']}: {report['students']} responses, mean score {report['mean_score']:.1f}")
+    reliable = report['students'] >= min_responses
+    if not reliable:
+        print(f"  (fewer than {min_responses} responses; flags skipped)")
+    for item in report['items']:
+        flags = item['flags'] if reliable else []
+        if not all_items and not flags:
+            continue
+        shares = ' '.join('-' if s is None or math.isnan(s) else f"{s:.2f}" for s in item['option_shares'])
+        print(f"  #{item['id']:<4} p={item['p_value']:.2f} r_pb={item['point_biserial']:+.2f} "
+              f"D={item['discrimination']:+.2f} shares=[{shares}]"
+              + (f"  <- {'; '.join(flags)}" if flags else ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Item analysis over the stored quiz responses')
+    parser.add_argument('names', nargs='*', help='quiz names or glob patterns (default: all)')
+    parser.add_argument('--all-items', action='store_true', help='print every question, not only flagged ones')
+    parser.add_argument('--min-responses', type=int, default=20,
+                        help='responses needed before flagging (default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write the full report as JSON')
+    parser.add_argument('--db', default=RESPONSES_DB_FILE, help='responses store (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    quizzes = [row[0] for row in conn.execute('SELECT DISTINCT quiz FROM responses ORDER BY quiz')]
+    if args.names:
+        quizzes = [q for q in quizzes if any(fnmatch.fnmatch(q, p) for p in args.names)]
+    if not quizzes:
+        print("No stored responses match; run ingest_responses.py first.")
+        return 1
+
+    started = time.perf_counter()
+    reports = []
+    for quiz in quizzes:
+        config, errors = load_quiz(ROOT / 'forms' / f"{quiz}.json")
+        if config is None or errors:
+            print(f"\n{quiz}: skipped, forms/{quiz}.json is missing or invalid")
+            continue
+        report = analyze_quiz(conn, quiz, config)
+        if report['students'] < args.min_responses:
+            for item in report['items']:
+                item['flags'] = []
+        reports.append(report)
+        print_quiz(report, args.all_items, args.min_responses)
+    conn.close()
+
+    flagged = sum(1 for r in reports for item in r['items'] if item['flags'])
+    print(f"\n{len(reports)} quiz(zes), {flagged} flagged question(s) in {time.perf_counter() - started:.2f}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(_clean(reports), indent=2, ensure_ascii=False), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Publish-pipeline benchmark with round-trip budgets.
+
+Runs `criar_formulario_do_json` against the in-memory fake backend
+(`global/fake_backend.py`) with a fixed per-call latency, for real quizzes
+from `forms/` and synthetic quizzes of 10 to 500 questions. Three
+scenarios are measured for every quiz:
+
+    create  - first publish of a new form
+    update  - republish after editing the text of one question
+    noop    - republish of an unchanged quiz (manifest hit)
+
+For each run it reports API calls, bytes sent, wall time and round trips
+per question. The run fails (exit code 1) when a scenario makes more calls
+than its budget allows: BUDGETS[scenario] = (fixed calls, calls per question).
+
+Usage:
+    python benchmarks/publish_benchmark.py
+    python benchmarks/publish_benchmark.py --latency 0.05 --sizes 10 100 500
+    python benchmarks/publish_benchmark.py --json bench_output.json
+
+Exit codes:
+    0 - every run within budget
+    1 - at least one run over budget
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FORMS_DIR = ROOT / 'forms'
+
+# Allowed API calls per run: fixed overhead + marginal cost per question.
+# The per-item get/batchUpdate loop this replaced cost ~2 calls per question.
+BUDGETS = {
+    'create': (6, 0.01),
+    'update': (4, 0.01),
+    'noop': (1, 0.0),
+}
+
+DEFAULT_SIZES = [10, 50, 100, 250, 500]
+DEFAULT_REAL_QUIZZES = ['lua_terra_movimentos', 'ingles_preparacao_prova', 'energias_renovaveis']
+
+
+def synthetic_quiz(size):
+    """Build a valid quiz with `size` questions spread over five sections."""
+    return {
+        "metadata": {
+            "title": f"Benchmark - {size} questões",
+            "description": ["Quiz sintético", "gerado pelo benchmark"],
+            "subject": "Benchmark",
+            "grade": "5ª série",
+            "topic": "Desempenho"
+        },
+        "content": {
+            "introduction": "Quiz sintético para medir a publicação.",
+            "instructions": ["Escolha a alternativa correta."]
+        },
+        "questions": [
+            {
+                "id": i,
+                "section": f"Seção {i % 5 + 1}",
+                "question": f"Pergunta sintética número {i}?",
+                "options": [f"Opção {i}-{k}" for k in range(4)],
+                "correct_answer": i % 4,
+                "difficulty": ["fácil", "médio", "difícil"][i % 3]
+            }
+            for i in range(1, size + 1)
+        ],
+        "settings": {"collect_email": True, "require_login": True}
+    }
+
+
+def run_scenario(generator, backend, quiz_path, **kwargs):
+    """Publish once and return calls, bytes and wall time measured by the fake backend."""
+    backend.reset_stats()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = generator.criar_formulario_do_json(str(quiz_path), **kwargs)
+    elapsed = time.perf_counter() - started
+    if result is None:
+        raise RuntimeError(f"publish failed for {quiz_path.name}")
+    return {
+        'calls': sum(backend.calls.values()),
+        'calls_by_method': dict(backend.calls),
+        'bytes_sent': backend.bytes_sent,
+        'seconds': elapsed,
+    }
+
+
+def benchmark_quiz(generator, backend_factory, name, quiz, workdir):
+    """Run create, update and noop for one quiz; returns one row per scenario."""
+    from config import use_backend
+
+    backend = backend_factory()
+    use_backend(backend)
+    quiz_path = workdir / f"{name}.json"
+    quiz_path.write_text(json.dumps(quiz, ensure_ascii=False), encoding='utf-8')
+    size = len(quiz['questions'])
+
+    rows = []
+    rows.append(('create', run_scenario(generator, backend, quiz_path)))
+
+    quiz['questions'][size // 2]['question'] += ' (revisada)'
+    quiz_path.write_text(json.dumps(quiz, ensure_ascii=False), encoding='utf-8')
+    rows.append(('update', run_scenario(generator, backend, quiz_path)))
+
+    rows.append(('noop', run_scenario(generator, backend, quiz_path)))
+
+    results = []
+    for scenario, stats in rows:
+        fixed, per_question = BUDGETS[scenario]
+        budget = fixed + per_question * size
+        results.append({
+            'quiz': name,
+            'questions': size,
+            'scenario': scenario,
+            **stats,
+            'round_trips_per_question': stats['calls'] / size,
+            'budget': budget,
+            'within_budget': stats['calls'] <= budget,
+        })
+    return results
+
+
+def print_table(results):
+    print(f"{'quiz':<28} {'q':>4} {'scenario':<8} {'calls':>5} {'budget':>6} "
+          f"{'rt/q':>6} {'KB sent':>8} {'time':>7}")
+    for r in results:
+        flag = '' if r['within_budget'] else '  OVER BUDGET'
+        print(f"{r['quiz']:<28} {r['questions']:>4} {r['scenario']:<8} {r['calls']:>5} "
+              f"{r['budget']:>6.1f} {r['round_trips_per_question']:>6.3f} "
+              f"{r['bytes_sent'] / 1024:>8.1f} {r['seconds']:>6.2f}s{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the publish pipeline against the fake backend')
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='simulated seconds per API call (default: 0.02)')
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help='synthetic quiz sizes (default: 10 50 100 250 500)')
+    parser.add_argument('--quizzes', nargs='*', default=DEFAULT_REAL_QUIZZES,
+                        help='real quizzes from forms/ to include')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Isolated manifest/item maps so the real .publish/ state is untouched
+        os.environ['PUBLISH_STATE_DIR'] = os.path.join(tmp, 'state')
+        sys.path.insert(0, str(ROOT / 'global'))
+        import generator
+        from fake_backend import FakeGoogleBackend
+        from ratelimit import set_rate_limits
+
+        # Quota throttling is not what is being measured here
+        set_rate_limits({})
+
+        workdir = Path(tmp)
+        results = []
+        for name in args.quizzes:
+            quiz = json.loads((FORMS_DIR / f"{name}.json").read_text(encoding='utf-8'))
+            results += benchmark_quiz(generator, lambda: FakeGoogleBackend(latency=args.latency),
+                                      name, quiz, workdir)
+        for size in args.sizes:
+            results += benchmark_quiz(generator, lambda: FakeGoogleBackend(latency=args.latency),
+                                      f"synthetic_{size}", synthetic_quiz(size), workdir)
+
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    over = [r for r in results if not r['within_budget']]
+    if over:
+        print(f"\nFAILED: {len(over)} run(s) over the round-trip budget")
+        return 1
+    print("\nOK: all runs within the round-trip budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
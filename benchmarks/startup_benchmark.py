@@ -0,0 +1,126 @@
+"""CLI startup benchmark for commands that never touch the network.
+
+Runs each command in a fresh interpreter several times and compares the
+median wall time with a bare `python -c pass`:
+
+    help       - python form.py --help
+    missing    - python form.py <quiz that does not exist>
+    validate   - python validate.py <quiz>
+    plan       - python form.py <quiz> --plan (writes to a temporary directory)
+
+It also imports the publish modules (`generator`, `drive_folder`,
+`publish_plan`) and lists any Google client or HTTP module they load at
+import time; those must only be imported by the first API call
+(`global/config.py`).
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --repeat 20 --max-overhead 0.1
+    python benchmarks/startup_benchmark.py --json startup.json
+
+Exit codes:
+    0 - no eager Google imports and every command within the overhead budget
+    1 - otherwise
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Allowed median overhead over bare Python, in seconds. Importing the Google
+# client libraries alone costs ~0.3s, so an eager import fails this budget.
+DEFAULT_MAX_OVERHEAD = 0.15
+DEFAULT_REPEAT = 7
+DEFAULT_QUIZ = 'pronomes'
+
+HEAVY_MODULE_PREFIXES = ('googleapiclient', 'google_auth_oauthlib', 'google.oauth2',
+                         'google_auth_httplib2', 'httplib2')
+
+IMPORT_CHECK = (
+    "import sys; sys.path.insert(0, 'global'); "
+    "import generator, drive_folder, publish_plan; "
+    f"print(','.join(sorted(m for m in sys.modules if m.startswith({HEAVY_MODULE_PREFIXES!r}))))"
+)
+
+
+def commands(quiz):
+    """Commands measured, as (name, argv) pairs."""
+    python = sys.executable
+    return [
+        ('bare', [python, '-c', 'pass']),
+        ('help', [python, 'form.py', '--help']),
+        ('missing', [python, 'form.py', '__startup_benchmark_missing__']),
+        ('validate', [python, 'validate.py', quiz]),
+        ('plan', [python, 'form.py', quiz, '--plan']),
+    ]
+
+
+def time_command(argv, repeat, env):
+    """Median and minimum wall time of `argv` over `repeat` runs (after one warm-up)."""
+    subprocess.run(argv, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), min(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup of non-network commands')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'runs per command (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--max-overhead', type=float, default=DEFAULT_MAX_OVERHEAD,
+                        help=f'allowed median seconds over bare Python (default: {DEFAULT_MAX_OVERHEAD})')
+    parser.add_argument('--quiz', default=DEFAULT_QUIZ, help=f'quiz used by validate/plan (default: {DEFAULT_QUIZ})')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # --plan writes its artifact under the state dir; keep the real .publish/ untouched
+        env = {**os.environ, 'PUBLISH_STATE_DIR': os.path.join(tmp, 'state')}
+        env.pop('FAKE_GOOGLE_BACKEND', None)
+
+        heavy = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        results = []
+        for name, command in commands(args.quiz):
+            median, best = time_command(command, args.repeat, env)
+            results.append({'command': name, 'median_seconds': median, 'min_seconds': best})
+
+    bare = results[0]['median_seconds']
+    print(f"{'command':<10} {'median':>8} {'min':>8} {'overhead':>9}")
+    for r in results:
+        r['overhead_seconds'] = r['median_seconds'] - bare
+        r['within_budget'] = r['overhead_seconds'] <= args.max_overhead
+        flag = '' if r['within_budget'] else '  OVER'
+        print(f"{r['command']:<10} {r['median_seconds']:>7.3f}s {r['min_seconds']:>7.3f}s "
+              f"{r['overhead_seconds']:>+8.3f}s{flag}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'eager_imports': heavy.split(',') if heavy else [],
+                                               'results': results}, indent=2), encoding='utf-8')
+
+    failed = False
+    if heavy:
+        print(f"\nFAILED: importing the publish modules loads {heavy}")
+        failed = True
+    over = [r['command'] for r in results if not r['within_budget']]
+    if over:
+        print(f"\nFAILED: over the {args.max_overhead:.2f}s startup budget: {', '.join(over)}")
+        failed = True
+    if failed:
+        return 1
+    print(f"\nOK: no eager Google imports; every command within {args.max_overhead:.2f}s of bare Python")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
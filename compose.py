@@ -0,0 +1,90 @@
+"""Compose a new quiz JSON from questions that already exist in `forms/`.
+
+Usage:
+    python compose.py <output_name> --count N [filters] [--seed S]
+
+Examples:
+    python compose.py revisao_portugues_5a --count 30 --subject Português --grade "5ª série" --seed 7
+    python compose.py pronomes_dificeis --count 15 --section "Pronomes Pessoais" \
+        --section "Pronomes Possessivos" --difficulty difícil --title "Pronomes: desafio"
+    python compose.py rascunho --count 20 --subject Matemática --stdout
+
+What this script does:
+    - Treats every `forms/*.json` question as one bank, read one file at a time
+      (`global/composer.py`), so memory does not grow with the bank.
+    - Keeps the questions matching the filters (subject and grade come from the
+      quiz metadata; section and difficulty from each question; every filter
+      accepts several values and ignores case).
+    - Draws `--count` of them with reservoir sampling. The same `--seed` always
+      gives the same quiz.
+    - Groups the questions by section, renumbers the ids from 1 and reuses the
+      source `content.sections` descriptions.
+    - Validates the result with the same checks as `validate.py` and writes it to
+      `forms/<output_name>.json` (refusing to overwrite unless --overwrite).
+
+Exit codes:
+    0 - quiz written (or printed)
+    2 - no question matches, the result is invalid, or the file already exists
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from composer import compose_quiz
+from validation import validate_quiz_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compose a quiz from the question bank in forms/')
+    parser.add_argument('name', help='output quiz name (file name without .json)')
+    parser.add_argument('--count', type=int, required=True, help='number of questions')
+    parser.add_argument('--seed', type=int, default=0, help='sampling seed (default: %(default)s)')
+    parser.add_argument('--subject', action='append', help='accepted subject (repeatable)')
+    parser.add_argument('--grade', action='append', help='accepted grade (repeatable)')
+    parser.add_argument('--section', action='append', help='accepted question section (repeatable)')
+    parser.add_argument('--difficulty', action='append', help='accepted difficulty (repeatable)')
+    parser.add_argument('--title', help='quiz title (default: built from the subject)')
+    parser.add_argument('--topic', help='quiz topic (default: most common source topic)')
+    parser.add_argument('--stdout', action='store_true', help='print the JSON instead of writing it')
+    parser.add_argument('--overwrite', action='store_true', help='replace an existing forms/<name>.json')
+    args = parser.parse_args(argv)
+
+    name = args.name[:-5] if args.name.endswith('.json') else args.name
+    output = ROOT / 'forms' / f"{name}.json"
+    if output.exists() and not args.overwrite and not args.stdout:
+        print(f"ERROR: {output.relative_to(ROOT)} already exists (use --overwrite)")
+        return 2
+
+    quiz, available = compose_quiz(
+        ROOT / 'forms', args.count, seed=args.seed, subjects=args.subject, grades=args.grade,
+        sections=args.section, difficulties=args.difficulty, title=args.title, topic=args.topic
+    )
+    if not quiz['questions']:
+        print("ERROR: no question in forms/ matches the filters")
+        return 2
+
+    errors = validate_quiz_data(quiz)
+    if errors:
+        print("ERROR: the composed quiz does not validate:")
+        for e in errors:
+            print(" -", e)
+        return 2
+
+    text = json.dumps(quiz, indent=2, ensure_ascii=False) + "\n"
+    if args.stdout:
+        print(text, end='')
+        return 0
+
+    output.write_text(text, encoding='utf-8')
+    print(f"Wrote {output.relative_to(ROOT)}: {len(quiz['questions'])} questions "
+          f"({available} matched the filters), seed {args.seed}")
+    if len(quiz['questions']) < args.count:
+        print(f"Note: only {len(quiz['questions'])} questions matched; asked for {args.count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Report near-duplicate questions across every quiz in `forms/`.
+
+Usage:
+    python find_duplicates.py [--threshold 0.7] [--cross-file] [--json PATH]
+
+Examples:
+    python find_duplicates.py
+    python find_duplicates.py --threshold 0.9 --cross-file
+    python find_duplicates.py --json duplicates.json
+
+What this script does:
+    - Reads the question bank one file at a time (`global/question_bank.py`).
+    - Turns each question (text plus options, normalized) into word shingles and
+      a MinHash signature. LSH banding then picks candidate pairs, so the cost
+      grows with the number of questions rather than the number of pairs
+      (`global/dedup.py`).
+    - Confirms candidates with the exact Jaccard similarity and prints clusters
+      of near-duplicate questions, largest first.
+
+Exit codes:
+    0 - always (this is a report, not a gate)
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from dedup import DEFAULT_THRESHOLD, find_near_duplicates, iter_bank_entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find near-duplicate questions across forms/')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='minimum Jaccard similarity of word shingles (default: %(default)s)')
+    parser.add_argument('--cross-file', action='store_true',
+                        help='only report clusters that span more than one quiz')
+    parser.add_argument('--limit', type=int, default=50, help='clusters to print (default: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='write every cluster as JSON')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    result = find_near_duplicates(iter_bank_entries(ROOT / 'forms'), threshold=args.threshold)
+    elapsed = time.perf_counter() - started
+
+    clusters = result['clusters']
+    if args.cross_file:
+        clusters = [c for c in clusters if len({q['quiz'] for q in c}) > 1]
+
+    for n, cluster in enumerate(clusters[:args.limit], start=1):
+        print(f"Cluster {n} ({len(cluster)} questions):")
+        for q in cluster:
+            print(f"  {q['quiz']}#{q['id']}  [{q['similarity']:.2f}]  {q['question']}")
+    if len(clusters) > args.limit:
+        print(f"... {len(clusters) - args.limit} more cluster(s); use --json for the full list")
+
+    duplicated = sum(len(c) for c in clusters)
+    print(f"\n{len(clusters)} cluster(s), {duplicated} of {result['questions']} questions; "
+          f"{result['candidate_pairs']} candidate pairs checked in {elapsed:.2f}s")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(clusters, indent=2, ensure_ascii=False), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
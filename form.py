@@ -1,39 +1,91 @@
 """Universal Form Generator (simplified)
 
 This script creates or updates Google Forms from JSON quiz files located
-in the project's `forms/` directory. Before publishing, it runs the
-project validator `validate.py` (if present) to ensure the JSON meets the
-project schema constraints (metadata, content, questions, option uniqueness,
-correct answer indexes, etc.). If validation fails, the publication is
-aborted.
+in the project's `forms/` directory. Before publishing, it validates the
+JSON in-process with the same checks as `validate.py` (metadata, content,
+questions, option uniqueness, correct answer indexes, etc.). If
+validation fails, the publication is aborted.
 
 Typical steps performed by this script:
-    1. Parse command-line argument: the quiz name (file name without .json)
+    1. Parse command-line arguments: quiz names (file names without .json)
     2. Locate the JSON file under `forms/<quiz_name>.json`
-    3. If `validate.py` exists in project root, run it as:
-             python validate.py <quiz_name>
+    3. Parse and validate it once (`global/validation.py`); the parsed
+         configuration is cached and reused by the generator.
          Abort if validation fails.
-    4. Load the JSON and call the internal generator to create or update
-         the corresponding Google Form.
+    4. Call the internal generator to create or update the corresponding
+         Google Form.
     5. Save a brief history in `ultimo_formulario_criado.txt` with links
          and metadata returned by the generator.
 
 Usage examples:
     python form.py pronomes
     python form.py energia_renovavel_nao_renovavel
+    python form.py pronomes --force
+    python form.py pronomes verbos "ingles_*"
+    python form.py --all --workers 6
+
+Several names, glob patterns or `--all` publish the quizzes concurrently
+with a bounded pool of workers. A failing form does not abort the others,
+and a summary table (status, duration, API calls, network time, time spent
+waiting on the rate limiter or retry backoff, form URL) is printed at the end.
+
+Unchanged quizzes are skipped: `.publish/manifest.json` stores the hash of
+the last published JSON together with the form's remote `revisionId`.
+Use `--force` to republish anyway, or `--skip-remote-check` to trust the
+manifest without reading the remote revision.
+
+Existing forms are synced (only the differences, keeping item IDs). If the
+sync fails, the form is re-read and diffed again; deleting and recreating
+every item only happens with `--rebuild` or when no diff can be computed.
+
+`--plan` publishes nothing: it compiles each quiz into the ordered API calls
+the generator would send for a new form (Drive lookup, `forms.create`, the
+Drive move, every `batchUpdate` body) and writes them to
+`.publish/plans/<quiz_name>.json` with call counts and payload sizes
+(`global/publish_plan.py`). No credentials or network are needed:
+    python form.py --plan --all
+    python form.py pronomes --plan --plan-dir build/plans
+
+`--profile` times every phase of the publish (validation, manifest check,
+Drive lookup, authentication, create/sync, item batches, manifest record)
+and writes the spans to `.publish/profiles/` as JSON Lines and as a Chrome
+trace-event file. The bulk summary always shows each form's slowest phase.
+
+Every HTTP request to the Forms and Drive APIs (retries and Drive batches
+included) is counted with its method, status, latency and payload sizes
+(`global/api_metrics.py`); a per-method table is printed at the end of the
+run, and `--metrics FILE` appends it, with per-form call counts, as one JSON
+line to FILE to track quota use and round trips across runs:
+    python form.py --all --metrics .publish/api_metrics.jsonl
+
+`--watch` keeps running and republishes quizzes as they are saved: it
+watches `forms/` (OS notifications through the optional `watchdog` package,
+or polling every second without it), waits for a burst of saves to settle,
+validates in-process and publishes only the changed files, reusing the
+authenticated clients and the Drive folder index of the running process.
+Names or glob patterns restrict which files are watched:
+    python form.py --watch
+    python form.py "verbos_*" --watch
+
+Exit codes:
+    0 - every selected quiz was published (or skipped as unchanged)
+    2 - at least one quiz failed, was published incomplete or was not found
+        (also returned when no quiz matches; with --plan, when a plan fails)
 
 Note:
     - The script expects the `global` package and generator utilities to be
         available in `global/` (project folder). In normal execution the
         existing project structure resolves these imports.
-    - The validator is optional but recommended; keep `validate.py` at the
-        project root to enable automatic validation before publishing.
 """
 
 import sys
 import os
+import time
+import fnmatch
 import json
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Adicionar pasta global ao path
@@ -43,105 +95,482 @@ sys.path.append(global_dir)
 
 # Usar o novo generator
 from generator import criar_formulario_do_json
-import subprocess
+from publish_plan import build_publish_plan
+from api_metrics import append_metrics, get_thread_calls, reset_thread_calls, summarize
+from config import PUBLISH_STATE_DIR
+from ratelimit import get_global_stats, get_thread_stats, reset_thread_stats
+import tracing
+from tracing import get_thread_phases, reset_thread_phases, slowest_phase, span
+from validation import load_quiz
 
-def main():
+forms_dir = os.path.join(current_dir, 'forms')
+
+# Número padrão de formulários publicados em paralelo no modo em massa
+DEFAULT_WORKERS = 4
+
+# Pasta padrão dos planos gerados com --plan
+DEFAULT_PLAN_DIR = os.path.join(PUBLISH_STATE_DIR, 'plans')
+
+# Pasta padrão dos perfis gerados com --profile
+DEFAULT_PROFILE_DIR = os.path.join(PUBLISH_STATE_DIR, 'profiles')
+
+# Status do resumo que contam como falha (código de saída EXIT_FALHA)
+STATUS_FALHA = ('falhou', 'erro', 'incompleto')
+
+# Código de saída quando algum quiz não foi publicado (o mesmo do validate.py)
+EXIT_FALHA = 2
+
+# Protege o arquivo de histórico quando vários formulários terminam juntos
+_historico_lock = threading.Lock()
+
+def listar_quizzes_disponiveis():
     """
-    Função principal simplificada que usa o form_generator.
+    Nomes (sem .json) de todos os quizzes da pasta forms/, em ordem alfabética.
+    """
+    if not os.path.exists(forms_dir):
+        return []
+    return sorted(f[:-5] for f in os.listdir(forms_dir) if f.endswith('.json'))
+
+
+def resolver_nomes(padroes, todos=False):
+    """
+    Expande nomes e padrões glob (ex: "verbos_*") em nomes de quizzes.
+
+    Nomes sem caracteres de glob são mantidos mesmo que o arquivo não exista,
+    para que o erro seja reportado na publicação.
+
+    Returns:
+        list: Nomes únicos, na ordem em que foram pedidos
+    """
+    disponiveis = listar_quizzes_disponiveis()
+    if todos:
+        return disponiveis
+
+    nomes = []
+    for padrao in padroes:
+        if padrao.endswith('.json'):
+            padrao = padrao[:-5]
+        if any(c in padrao for c in '*?['):
+            encontrados = fnmatch.filter(disponiveis, padrao)
+            if not encontrados:
+                print(f"⚠️ Nenhum quiz corresponde ao padrão '{padrao}'")
+        else:
+            encontrados = [padrao]
+        for nome in encontrados:
+            if nome not in nomes:
+                nomes.append(nome)
+    return nomes
+
+
+def salvar_historico(nome_quiz, json_path, resultado):
+    """
+    Salva em `ultimo_formulario_criado.txt` um resumo do formulário publicado.
+    """
+    historico_file = os.path.join(current_dir, 'ultimo_formulario_criado.txt')
+    with _historico_lock, open(historico_file, 'w', encoding='utf-8') as f:
+        f.write(f"Último formulário criado/atualizado:\n")
+        f.write(f"Nome: {nome_quiz}\n")
+        f.write(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Título: {resultado['config']['metadata']['title']}\n")
+        f.write(f"ID: {resultado['form_id']}\n")
+        f.write(f"Link público: {resultado['public_url']}\n")
+        f.write(f"Link de edição: {resultado['edit_url']}\n")
+        f.write(f"Total de questões: {resultado['total_questions']}\n")
+        f.write(f"Arquivo fonte: {json_path}\n")
+        f.write(f"Seções:\n")
+        for secao, qtd in resultado['sections'].items():
+            f.write(f"  - {secao}: {qtd} questões\n")
+
+
+def publicar_quiz(nome_quiz, args):
+    """
+    Valida e publica um único quiz.
+
+    Returns:
+        dict or None: Resultado do generator ou None em caso de falha
     """
-    parser = argparse.ArgumentParser(
-        description='Criar ou atualizar formulário do Google Forms a partir de JSON'
-    )
-    parser.add_argument(
-        'nome_quiz', 
-        help='Nome do quiz (arquivo JSON na pasta forms/)'
-    )
-    
-    args = parser.parse_args()
-    nome_quiz = args.nome_quiz
-    
     print(f"🚀 Criando/atualizando formulário: {nome_quiz}")
     print("=" * 50)
     
     # Definir caminho do arquivo JSON
-    json_path = os.path.join(current_dir, 'forms', f'{nome_quiz}.json')
+    json_path = os.path.join(forms_dir, f'{nome_quiz}.json')
     
     if not os.path.exists(json_path):
         print(f"❌ Arquivo não encontrado: {json_path}")
         print(f"📁 Arquivos disponíveis na pasta forms/:")
-        forms_dir = os.path.join(current_dir, 'forms')
-        if os.path.exists(forms_dir):
-            files = [f[:-5] for f in os.listdir(forms_dir) if f.endswith('.json')]
-            for file in files:
-                print(f"   • {file}")
+        for file in listar_quizzes_disponiveis():
+            print(f"   • {file}")
         return None
     
-    print(f"✅ Configuração carregada: ", end='')
-    
-    # Carregar título para mostrar
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        print(config['metadata']['title'])
-    except:
-        print("(título não disponível)")
-    
+    # Ler e validar uma única vez; o generator reaproveita o resultado em cache
+    print("🔎 Validando o arquivo antes da publicação...")
+    with span('validate'):
+        config, errors = load_quiz(json_path)
+    titulo = config.get('metadata', {}).get('title') if isinstance(config, dict) else None
+    print(f"✅ Configuração carregada: {titulo or '(título não disponível)'}")
     print(f"📁 Arquivo: {json_path}")
-
-    # Run validator before publishing
-    validate_script = os.path.join(current_dir, 'validate.py')
-    if os.path.exists(validate_script):
-        print("🔎 Validando o arquivo antes da publicação...")
-        try:
-            # Use lista de argumentos para evitar problemas de shell
-            completed = subprocess.run(
-                [sys.executable, validate_script, nome_quiz], 
-                check=False, 
-                capture_output=True, 
-                text=True,
-                encoding='utf-8'
-            )
-            if completed.stdout:
-                print(completed.stdout)
-            if completed.returncode != 0:
-                print("❌ Validação falhou. Abortando publicação.")
-                if completed.stderr:
-                    print(completed.stderr)
-                return None
-            else:
-                print("✅ Validação OK. Prosseguindo com a publicação...")
-        except Exception as e:
-            print(f"Erro ao executar validador: {e}")
-            return None
-    else:
-        print("⚠️ Validador 'validate.py' não encontrado. Pulando validação.")
+    
+    if errors:
+        print("VALIDATION FAILED. Issues found:")
+        for e in errors:
+            print(" -", e)
+        print("❌ Validação falhou. Abortando publicação.")
+        return None
+    print("✅ Validação OK. Prosseguindo com a publicação...")
     
     # Usar o form_generator (com sistema de atualização)
-    resultado = criar_formulario_do_json(json_path)
+    resultado = criar_formulario_do_json(
+        json_path,
+        forcar=args.force,
+        verificar_remoto=not args.skip_remote_check,
+        recriar=args.rebuild
+    )
+    
+    if resultado and resultado.get('skipped'):
+        print(f"\n⏭️ Formulário já está atualizado: {resultado['public_url']}")
+        return resultado
     
     if resultado:
         print(f"\n🎯 Formulário criado/atualizado com sucesso!")
         
         # Salvar histórico simplificado
-        historico_file = os.path.join(current_dir, 'ultimo_formulario_criado.txt')
-        with open(historico_file, 'w', encoding='utf-8') as f:
-            f.write(f"Último formulário criado/atualizado:\n")
-            f.write(f"Nome: {nome_quiz}\n")
-            f.write(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Título: {resultado['config']['metadata']['title']}\n")
-            f.write(f"ID: {resultado['form_id']}\n")
-            f.write(f"Link público: {resultado['public_url']}\n")
-            f.write(f"Link de edição: {resultado['edit_url']}\n")
-            f.write(f"Total de questões: {resultado['total_questions']}\n")
-            f.write(f"Arquivo fonte: {json_path}\n")
-            f.write(f"Seções:\n")
-            for secao, qtd in resultado['sections'].items():
-                f.write(f"  - {secao}: {qtd} questões\n")
+        salvar_historico(nome_quiz, json_path, resultado)
         
         return resultado
     else:
         print(f"\n❌ Falha ao criar/atualizar o formulário '{nome_quiz}'!")
         return None
 
+
+def observar(args):
+    """
+    Republica os quizzes de forms/ sempre que forem salvos, até Ctrl+C.
+    """
+    from config import get_authenticated_service, get_drive_service
+    from drive_folder import invalidate_folder_index
+    from watcher import iter_changes, watch_mode
+
+    padroes = [p[:-5] if p.endswith('.json') else p for p in args.nome_quiz] or ['*']
+    modo = 'polling' if args.poll else watch_mode()
+
+    # Autenticar antes da primeira gravação: cada publicação reaproveita os clientes
+    if not get_authenticated_service() or not get_drive_service():
+        print("❌ Erro na autenticação!")
+        return None
+
+    print(f"👀 Observando {forms_dir} ({modo}); Ctrl+C para sair")
+    try:
+        for nomes in iter_changes(forms_dir, use_watchdog=not args.poll):
+            for nome in nomes:
+                if not any(fnmatch.fnmatch(nome, padrao) for padrao in padroes):
+                    continue
+                if not os.path.exists(os.path.join(forms_dir, f'{nome}.json')):
+                    continue
+                print(f"\n✏️ {nome}.json alterado às {datetime.now().strftime('%H:%M:%S')}")
+                inicio = time.perf_counter()
+                try:
+                    resultado = publicar_quiz(nome, args)
+                except Exception as e:
+                    print(f"❌ Erro inesperado em '{nome}': {e}")
+                    resultado = None
+                if resultado is None:
+                    # O Drive pode ter mudado por fora (formulário apagado, movido): listar de novo
+                    invalidate_folder_index()
+                print(f"⏱️ {nome}: {time.perf_counter() - inicio:.1f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Observação encerrada")
+    return None
+
+
+def planejar_quiz(nome_quiz, plan_dir):
+    """
+    Valida um quiz e grava o plano de requisições da sua publicação, sem rede.
+
+    Returns:
+        dict or None: Plano gerado ou None se o quiz não existe ou é inválido
+    """
+    json_path = os.path.join(forms_dir, f'{nome_quiz}.json')
+    config, errors = load_quiz(json_path)
+    if errors:
+        print(f"❌ {nome_quiz}: {'; '.join(errors)}")
+        return None
+
+    plano = build_publish_plan(config, nome_quiz)
+    os.makedirs(plan_dir, exist_ok=True)
+    plan_path = os.path.join(plan_dir, f'{nome_quiz}.json')
+    with open(plan_path, 'w', encoding='utf-8') as f:
+        json.dump(plano, f, ensure_ascii=False, indent=2)
+
+    resumo = plano['summary']
+    metodos = ', '.join(f"{metodo} x{qtd}" for metodo, qtd in resumo['by_method'].items())
+    sem_mudancas = " (sem mudanças desde a última publicação)" if plano['unchanged'] else ""
+    print(f"📋 {nome_quiz}: {resumo['calls']} chamadas, {resumo['batch_requests']} requisições "
+          f"em lote, {resumo['request_bytes'] / 1024:.1f} KiB{sem_mudancas}")
+    print(f"   {metodos}")
+    print(f"   📁 {plan_path}")
+    return plano
+
+
+def _publicar_com_resumo(nome_quiz, args):
+    """
+    Publica um quiz dentro de um worker e devolve a linha do resumo.
+    Exceções são capturadas para não interromper os demais formulários.
+    """
+    reset_thread_stats()
+    reset_thread_phases()
+    reset_thread_calls()
+    inicio = time.perf_counter()
+    resultado = None
+    try:
+        resultado = publicar_quiz(nome_quiz, args)
+        if resultado is None:
+            status = 'falhou'
+        elif resultado.get('skipped'):
+            status = 'sem mudanças'
+        elif resultado.get('skipped_requests'):
+            status = 'incompleto'
+        else:
+            status = 'ok'
+    except Exception as e:
+        print(f"❌ Erro inesperado em '{nome_quiz}': {e}")
+        status = 'erro'
+    stats = get_thread_stats()
+    return {
+        'nome': nome_quiz,
+        'status': status,
+        'duracao': time.perf_counter() - inicio,
+        'chamadas': stats['calls'],
+        'espera': stats['throttled_seconds'] + stats['backoff_seconds'],
+        'rede': stats['network_seconds'],
+        'url': resultado['public_url'] if resultado else '',
+        'fases': get_thread_phases(),
+        'metodos': get_thread_calls(),
+        'resultado': resultado
+    }
+
+
+def imprimir_resumo(linhas, duracao_total):
+    """
+    Imprime a tabela de resumo da publicação em massa.
+    """
+    largura_nome = max([len('Quiz')] + [len(linha['nome']) for linha in linhas])
+    print("\n" + "=" * 60)
+    print("📊 RESUMO DA PUBLICAÇÃO")
+    print("=" * 60)
+    print(f"{'Quiz':<{largura_nome}}  {'Status':<12}  {'Tempo':>7}  {'API':>4}  "
+          f"{'Rede':>7}  {'Espera':>7}  {'Fase mais lenta':<22}  URL")
+    for linha in linhas:
+        fase = slowest_phase(linha['fases'])
+        fase = f"{fase[0]} {fase[1]:.1f}s" if fase else '-'
+        print(f"{linha['nome']:<{largura_nome}}  {linha['status']:<12}  "
+              f"{linha['duracao']:>6.1f}s  {linha['chamadas']:>4}  "
+              f"{linha['rede']:>6.1f}s  {linha['espera']:>6.1f}s  {fase:<22}  {linha['url']}")
+    falhas = sum(1 for linha in linhas if linha['status'] in STATUS_FALHA)
+    stats = get_global_stats()
+    print("-" * 60)
+    print(f"Total: {len(linhas)} formulários, {falhas} com falha, "
+          f"{stats['calls']} chamadas de API ({stats['retries']} retentativas), {duracao_total:.1f}s")
+    print(f"Tempo em rede: {stats['network_seconds']:.1f}s | "
+          f"limitado pela cota: {stats['throttled_seconds']:.1f}s | "
+          f"em backoff: {stats['backoff_seconds']:.1f}s")
+
+
+def imprimir_fases(fases):
+    """
+    Tempo de cada fase de uma publicação, da mais lenta para a mais rápida.
+    """
+    if not fases:
+        return
+    print("\n⏱️ Tempo por fase:")
+    for nome, segundos in sorted(fases.items(), key=lambda item: -item[1]):
+        print(f"   {nome:<16} {segundos:>7.3f}s")
+
+
+def imprimir_chamadas_api(resumo):
+    """
+    Imprime as requisições HTTP da execução por método da API.
+    """
+    if not resumo:
+        return
+    largura = max(len('Método'), *(len(metodo) for metodo in resumo))
+    print("\n📡 Chamadas de API por método:")
+    print(f"   {'Método':<{largura}}  {'Chamadas':>8}  {'Erros':>5}  {'Média':>8}  {'Máx':>8}  "
+          f"{'Enviado':>10}  {'Recebido':>10}")
+    for metodo, totais in resumo.items():
+        print(f"   {metodo:<{largura}}  {totais['calls']:>8}  {totais['errors']:>5}  "
+              f"{totais['mean_seconds'] * 1000:>6.0f}ms  {totais['max_seconds'] * 1000:>6.0f}ms  "
+              f"{totais['request_bytes'] / 1024:>6.1f} KiB  {totais['response_bytes'] / 1024:>6.1f} KiB")
+    print(f"   {'Total':<{largura}}  {sum(t['calls'] for t in resumo.values()):>8}  "
+          f"{sum(t['errors'] for t in resumo.values()):>5}")
+
+
+def gravar_metricas(caminho, nomes, resultado):
+    """
+    Acrescenta o resumo das chamadas de API da execução ao arquivo de métricas,
+    com as chamadas por método de cada formulário.
+    """
+    if isinstance(resultado, list):
+        formularios = {linha['nome']: linha['metodos'] for linha in resultado}
+    else:
+        # Publicação de um único quiz, feita na thread principal
+        formularios = {nomes[0]: get_thread_calls()}
+    append_metrics(caminho, command=' '.join(sys.argv[1:]), forms={
+        nome: {'calls': sum(metodos.values()), 'by_method': metodos}
+        for nome, metodos in formularios.items()
+    })
+    print(f"📈 Métricas de API acrescentadas a {caminho}")
+
+
+def exportar_perfil(pasta):
+    """
+    Grava os spans registrados com --profile em JSON Lines e no formato de trace do Chrome.
+    """
+    base = os.path.join(pasta, f"publish-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    tracing.export_jsonl(base + '.jsonl')
+    tracing.export_chrome_trace(base + '.trace.json')
+    print(f"\n📈 Perfil gravado: {base}.jsonl")
+    print(f"   Trace (chrome://tracing ou ui.perfetto.dev): {base}.trace.json")
+
+
+def publicar_em_massa(nomes, args):
+    """
+    Publica vários quizzes em paralelo com um número limitado de workers.
+
+    Returns:
+        list: Linhas do resumo, na ordem dos nomes recebidos
+    """
+    print(f"🚀 Publicando {len(nomes)} formulários com {args.workers} workers...")
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        linhas = list(executor.map(lambda nome: _publicar_com_resumo(nome, args), nomes))
+    imprimir_resumo(linhas, time.perf_counter() - inicio)
+    return linhas
+
+
+def main():
+    """
+    Função principal simplificada que usa o form_generator.
+    """
+    parser = argparse.ArgumentParser(
+        description='Criar ou atualizar formulário do Google Forms a partir de JSON'
+    )
+    parser.add_argument(
+        'nome_quiz',
+        nargs='*',
+        help='Nome(s) ou padrões glob dos quizzes (arquivos JSON na pasta forms/)'
+    )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Publicar todos os quizzes da pasta forms/'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Formulários publicados em paralelo (padrão: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Publicar mesmo que o JSON não tenha mudado desde a última publicação'
+    )
+    parser.add_argument(
+        '--skip-remote-check',
+        action='store_true',
+        help='Confiar no manifesto local sem conferir a revisão remota do formulário'
+    )
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Apagar e recriar todos os itens de formulários existentes em vez de '
+             'sincronizar (novos IDs: respostas antigas perdem a ligação com as questões)'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Não publicar: gravar o plano de requisições de cada quiz (sem rede)'
+    )
+    parser.add_argument(
+        '--plan-dir',
+        default=DEFAULT_PLAN_DIR,
+        help='Pasta dos planos gerados com --plan (padrão: .publish/plans)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Gravar os tempos de cada fase da publicação (JSON Lines e trace do Chrome)'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        default=DEFAULT_PROFILE_DIR,
+        help='Pasta dos arquivos gerados com --profile (padrão: .publish/profiles)'
+    )
+    parser.add_argument(
+        '--metrics',
+        metavar='ARQUIVO',
+        help='Acrescentar o resumo das chamadas de API a este arquivo (JSON Lines)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Observar forms/ e republicar cada quiz alterado (Ctrl+C para sair)'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='No modo --watch, comparar os arquivos periodicamente em vez de usar o watchdog'
+    )
+    
+    args = parser.parse_args()
+    if args.watch:
+        return observar(args)
+    
+    if not args.nome_quiz and not args.all:
+        parser.error('informe o nome de um quiz, um padrão glob ou --all')
+    
+    nomes = resolver_nomes(args.nome_quiz, todos=args.all)
+    if not nomes:
+        print("❌ Nenhum quiz encontrado para publicar.")
+        sys.exit(EXIT_FALHA)
+    
+    if args.plan:
+        planos = [planejar_quiz(nome, args.plan_dir) for nome in nomes]
+        if len(planos) > 1:
+            validos = [p for p in planos if p]
+            print(f"\nTotal: {len(validos)} planos, "
+                  f"{sum(p['summary']['calls'] for p in validos)} chamadas de API, "
+                  f"{sum(1 for p in planos if p is None)} com erro")
+        if any(p is None for p in planos):
+            sys.exit(EXIT_FALHA)
+        return planos
+    
+    if args.profile:
+        tracing.enable()
+    
+    if len(nomes) == 1 and not args.all:
+        reset_thread_phases()
+        resultado = publicar_quiz(nomes[0], args)
+        if args.profile:
+            imprimir_fases(get_thread_phases())
+    else:
+        args.workers = max(1, min(args.workers, len(nomes)))
+        resultado = publicar_em_massa(nomes, args)
+    
+    imprimir_chamadas_api(summarize())
+    if args.metrics:
+        gravar_metricas(args.metrics, nomes, resultado)
+    if args.profile:
+        exportar_perfil(args.profile_dir)
+    
+    # Scripts e CI detectam a falha pelo código de saída, e não só pela tabela
+    if isinstance(resultado, list):
+        falhou = any(linha['status'] in STATUS_FALHA for linha in resultado)
+    else:
+        falhou = resultado is None or bool(resultado.get('skipped_requests'))
+    if falhou:
+        sys.exit(EXIT_FALHA)
+    return resultado
+
 if __name__ == "__main__":
     main()
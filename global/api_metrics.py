@@ -0,0 +1,185 @@
+"""
+Contabilidade das Chamadas de API
+Cada requisição HTTP feita pelos clientes do Forms e do Drive passa por
+`MeteredHttp`, que registra método da API, endpoint, status, latência e bytes
+enviados e recebidos. Retentativas e lotes do Drive também contam, pois cada
+um é uma requisição que consome cota.
+
+Os totais são agregados por método (ex: 'forms.batchUpdate',
+'drive.files.list', 'drive.batch', os mesmos nomes do backend falso).
+`summarize()` alimenta o resumo do fim da execução, e `append_metrics()`
+acrescenta esse resumo a um arquivo JSON Lines para acompanhar o uso de
+cota e o número de idas e voltas por formulário entre execuções. Com o
+perfilamento ligado (`tracing.enable()`), cada requisição também vira um
+evento 'http' no trace.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+import tracing
+
+_totals = {}
+_totals_lock = threading.Lock()
+_local = threading.local()
+
+
+def method_label(method_id):
+    """
+    Nome curto de um método do documento de descoberta
+    (ex: 'forms.forms.batchUpdate' -> 'forms.batchUpdate').
+    """
+    parts = method_id.split('.')
+    if len(parts) > 2 and parts[0] == parts[1]:
+        parts = parts[1:]
+    return '.'.join(parts)
+
+
+@contextmanager
+def api_method(method_id):
+    """
+    Identifica o método da API das requisições HTTP feitas dentro do bloco.
+
+    Args:
+        method_id (str): `methodId` da requisição (ex: 'drive.files.list')
+    """
+    previous = getattr(_local, 'method', None)
+    _local.method = method_label(method_id) if method_id else None
+    try:
+        yield
+    finally:
+        _local.method = previous
+
+
+def _label_for(uri, method):
+    label = getattr(_local, 'method', None)
+    if label:
+        return label
+    # Requisições sem HttpRequest por trás: o lote HTTP do Drive
+    path = urlparse(uri).path
+    if path.startswith('/batch/'):
+        return path.split('/')[2] + '.batch'
+    return f"{method} {path}"
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    return len(body.encode('utf-8') if isinstance(body, str) else body)
+
+
+def _empty_totals():
+    return {'calls': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+            'request_bytes': 0, 'response_bytes': 0, 'statuses': {}}
+
+
+def record_call(label, endpoint, http_method, status, started, seconds, request_bytes, response_bytes):
+    """
+    Registra uma requisição HTTP concluída (status None: falha de rede).
+    """
+    status_key = str(status) if status is not None else 'rede'
+    failed = status is None or status >= 400
+    with _totals_lock:
+        totals = _totals.setdefault(label, _empty_totals())
+        totals['calls'] += 1
+        totals['errors'] += failed
+        totals['seconds'] += seconds
+        totals['max_seconds'] = max(totals['max_seconds'], seconds)
+        totals['request_bytes'] += request_bytes
+        totals['response_bytes'] += response_bytes
+        totals['statuses'][status_key] = totals['statuses'].get(status_key, 0) + 1
+
+    calls = getattr(_local, 'calls', None)
+    if calls is None:
+        calls = _local.calls = {}
+    calls[label] = calls.get(label, 0) + 1
+
+    tracing.add_event('http', started, seconds, method=label, http_method=http_method,
+                      endpoint=endpoint, status=status, request_bytes=request_bytes,
+                      response_bytes=response_bytes)
+
+
+class MeteredHttp:
+    """
+    Envolve um objeto compatível com `httplib2.Http` e contabiliza cada
+    `request()`. Os demais atributos (credenciais, timeout) são do objeto
+    envolvido, então o googleapiclient o trata como o original.
+    """
+
+    def __init__(self, http):
+        self.http = http
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        started = time.perf_counter()
+        status = None
+        content = b''
+        try:
+            response, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+            status = int(response.status)
+            return response, content
+        finally:
+            record_call(_label_for(uri, method), urlparse(uri).path, method, status, started,
+                        time.perf_counter() - started, _body_size(body), len(content or b''))
+
+
+def reset_thread_calls():
+    """
+    Zera a contagem por método da thread atual (início de cada publicação).
+    """
+    _local.calls = {}
+
+
+def get_thread_calls():
+    """
+    Requisições feitas pela thread atual, por método.
+    """
+    return dict(getattr(_local, 'calls', None) or {})
+
+
+def summarize():
+    """
+    Totais do processo por método, do mais chamado para o menos chamado.
+
+    Returns:
+        dict: método -> calls, errors, seconds, mean_seconds, max_seconds,
+            request_bytes, response_bytes e statuses (status -> quantidade)
+    """
+    with _totals_lock:
+        items = [(label, dict(totals, statuses=dict(totals['statuses']))) for label, totals in _totals.items()]
+    summary = {}
+    for label, totals in sorted(items, key=lambda item: (-item[1]['calls'], item[0])):
+        totals['mean_seconds'] = totals['seconds'] / totals['calls']
+        summary[label] = totals
+    return summary
+
+
+def append_metrics(path, **extra):
+    """
+    Acrescenta o resumo da execução como uma linha JSON em `path`.
+
+    Args:
+        path (str): Arquivo de métricas (criado se não existir)
+        **extra: Campos adicionais da linha (ex: comando, chamadas por formulário)
+    """
+    summary = summarize()
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'calls': sum(totals['calls'] for totals in summary.values()),
+        'errors': sum(totals['errors'] for totals in summary.values()),
+        'request_bytes': sum(totals['request_bytes'] for totals in summary.values()),
+        'response_bytes': sum(totals['response_bytes'] for totals in summary.values()),
+        **extra,
+        'methods': summary,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,164 @@
+"""
+Composição de Quizzes a partir do Banco de Questões
+Monta um novo quiz com questões já existentes em forms/, filtradas por
+matéria, série, seção e dificuldade. O banco é lido em fluxo (um arquivo
+por vez) e a amostra é mantida por reservoir sampling: a memória usada
+depende só da quantidade pedida, não do tamanho do banco, e a mesma
+semente sempre produz o mesmo quiz.
+"""
+
+import copy
+import random
+from collections import Counter
+from datetime import date
+
+from question_bank import iter_quizzes
+
+DEFAULT_INTRODUCTION = "Quiz montado a partir do banco de questões do projeto. Bom estudo!"
+DEFAULT_INSTRUCTIONS = [
+    "Leia cada pergunta com atenção.",
+    "Escolha a opção que você considera correta."
+]
+
+
+def _matches(value, accepted):
+    """
+    Compara ignorando maiúsculas/minúsculas; `accepted` vazio aceita qualquer valor.
+    """
+    if not accepted:
+        return True
+    return isinstance(value, str) and value.strip().casefold() in accepted
+
+
+def _accepted(values):
+    if values is None:
+        return set()
+    if isinstance(values, str):
+        values = [values]
+    return {v.strip().casefold() for v in values}
+
+
+def sample_questions(forms_dir, count, seed=None, subjects=None, grades=None,
+                     sections=None, difficulties=None):
+    """
+    Sorteia até `count` questões do banco que atendem aos filtros.
+
+    Args:
+        forms_dir (str): Pasta dos quizzes
+        count (int): Quantidade de questões
+        seed (int): Semente do sorteio (mesma semente, mesmo resultado)
+        subjects, grades, sections, difficulties (str or list): Valores aceitos
+            de cada filtro (None = qualquer)
+
+    Returns:
+        tuple: (lista de amostras, total de questões que atendiam aos filtros).
+            Cada amostra tem 'quiz', 'metadata', 'question' e
+            'section_description' (texto da seção em `content.sections`).
+    """
+    subjects, grades = _accepted(subjects), _accepted(grades)
+    sections, difficulties = _accepted(sections), _accepted(difficulties)
+    rng = random.Random(seed)
+    reservoir = []
+    seen = 0
+
+    for quiz, data in iter_quizzes(forms_dir):
+        metadata = data.get('metadata') if isinstance(data.get('metadata'), dict) else {}
+        if not _matches(metadata.get('subject'), subjects) or not _matches(metadata.get('grade'), grades):
+            continue
+        content = data.get('content') if isinstance(data.get('content'), dict) else {}
+        section_texts = {
+            s.get('name'): s.get('description')
+            for s in content.get('sections') or [] if isinstance(s, dict)
+        }
+        for question in data['questions']:
+            if not isinstance(question, dict):
+                continue
+            if not _matches(question.get('section'), sections):
+                continue
+            if not _matches(question.get('difficulty'), difficulties):
+                continue
+            seen += 1
+            if len(reservoir) < count:
+                slot = len(reservoir)
+                reservoir.append(None)
+            else:
+                slot = rng.randrange(seen)
+                if slot >= count:
+                    continue
+            reservoir[slot] = {
+                'quiz': quiz,
+                'metadata': {k: metadata.get(k) for k in ('subject', 'grade', 'topic')},
+                'question': question,
+                'section_description': section_texts.get(question.get('section'))
+            }
+
+    return reservoir, seen
+
+
+def build_quiz(samples, title=None, topic=None, description=None):
+    """
+    Monta o JSON do quiz a partir das amostras, agrupando as questões por
+    seção e renumerando os `id`s a partir de 1.
+
+    Returns:
+        dict: Quiz no formato do `schema.json`
+    """
+    # Seções na ordem da primeira aparição; dentro delas, a ordem do sorteio
+    section_order = {}
+    for sample in samples:
+        section_order.setdefault(sample['question'].get('section'), len(section_order))
+    ordered = sorted(samples, key=lambda s: section_order[s['question'].get('section')])
+
+    questions = []
+    for new_id, sample in enumerate(ordered, start=1):
+        question = copy.deepcopy(sample['question'])
+        question['id'] = new_id
+        questions.append(question)
+
+    def most_common(key):
+        values = Counter(s['metadata'].get(key) for s in samples if s['metadata'].get(key))
+        return values.most_common(1)[0][0] if values else 'Geral'
+
+    subject = most_common('subject')
+    sources = sorted({s['quiz'] for s in samples})
+    sections = []
+    for name in section_order:
+        text = next((s['section_description'] for s in samples
+                     if s['question'].get('section') == name and s['section_description']), None)
+        sections.append({'name': name, 'description': text or name})
+
+    return {
+        'metadata': {
+            'title': title or f"Quiz composto: {subject}",
+            'description': description or [
+                f"Quiz com {len(questions)} questões selecionadas do banco de questões.",
+                f"Fontes: {', '.join(sources)}"
+            ],
+            'subject': subject,
+            'grade': most_common('grade'),
+            'topic': topic or most_common('topic'),
+            'version': '1.0',
+            'created_date': date.today().isoformat()
+        },
+        'content': {
+            'introduction': DEFAULT_INTRODUCTION,
+            'instructions': list(DEFAULT_INSTRUCTIONS),
+            'sections': sections
+        },
+        'questions': questions
+    }
+
+
+def compose_quiz(forms_dir, count, seed=None, subjects=None, grades=None, sections=None,
+                 difficulties=None, title=None, topic=None):
+    """
+    Sorteia as questões e monta o quiz.
+
+    Returns:
+        tuple: (quiz, total de questões que atendiam aos filtros)
+    """
+    samples, available = sample_questions(
+        forms_dir, count, seed=seed, subjects=subjects, grades=grades,
+        sections=sections, difficulties=difficulties
+    )
+    return build_quiz(samples, title=title, topic=topic), available
@@ -5,23 +5,22 @@ Este arquivo centraliza as configurações e imports necessários para todos os
 
 import os
 import sys
+import threading
 
 # Adicionar pasta global ao path para importações
 GLOBAL_PATH = os.path.dirname(os.path.abspath(__file__))
 if GLOBAL_PATH not in sys.path:
     sys.path.insert(0, GLOBAL_PATH)
 
-# Importações globais
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.errors import HttpError
+# As bibliotecas do Google são importadas apenas na primeira chamada de API:
+# `form.py --help`, erros de validação e o modo --plan não pagam esse custo
+# (ver benchmarks/startup_benchmark.py).
 
 # Configurações padrão
 DEFAULT_SCOPES = [
     'https://www.googleapis.com/auth/forms.body',
-    'https://www.googleapis.com/auth/drive.file'
+    'https://www.googleapis.com/auth/drive.file',
+    'https://www.googleapis.com/auth/forms.responses.readonly'
 ]
 CREDENTIALS_FILE = 'credentials.json'
 TOKEN_FILE = 'token.json'
@@ -30,64 +29,231 @@ TOKEN_FILE = 'token.json'
 GOOGLE_DRIVE_FOLDER_NAME = 'Personal study assistant'
 GOOGLE_DRIVE_FOLDER_ID = '1GTXIcWBu-cQwot0arZe6qW921R4I-Hk7'  # ID da pasta para otimização
 
+# Máximo de requisições enviadas em um único batchUpdate do Google Forms
+FORMS_BATCH_MAX_REQUESTS = 500
+
+# Máximo de chamadas numa requisição em lote (batch HTTP) do Google Drive
+DRIVE_BATCH_MAX_REQUESTS = 100
+
+# Cotas por minuto (por usuário) aplicadas pelo limitador de requisições.
+# Forms: 390 leituras e 150 escritas por minuto por usuário.
+# Drive: 12.000 consultas por minuto; escritas contínuas limitadas a ~3/s.
+API_RATE_LIMITS = {
+    ('forms', 'read'): 390,
+    ('forms', 'write'): 150,
+    ('drive', 'read'): 12000,
+    ('drive', 'write'): 180,
+}
+
+# Retentativas com backoff exponencial para respostas 429/5xx e erros de rede
+API_RETRY_ATTEMPTS = 6
+API_RETRY_BASE_DELAY = 1.0   # segundos
+API_RETRY_MAX_DELAY = 64.0   # segundos
+
+# Pasta local com o estado de publicação (mapas de itens, manifestos, etc.).
+# Pode ser trocada pela variável de ambiente PUBLISH_STATE_DIR (ex: benchmarks).
+PUBLISH_STATE_DIR = os.environ.get(
+    'PUBLISH_STATE_DIR',
+    os.path.join(os.path.dirname(GLOBAL_PATH), '.publish')
+)
+
+# Documentos de descoberta das APIs baixados (quando a biblioteca não traz uma cópia)
+DISCOVERY_CACHE_DIR = os.path.join(PUBLISH_STATE_DIR, 'discovery')
+
+# Cache de credenciais e serviços compartilhado por todo o processo
+_auth_lock = threading.RLock()
+_services = {}
+_thread_local = threading.local()
+_TrackedHttpRequest = None
+
+# Backend alternativo (ex: FakeGoogleBackend) usado no lugar das APIs reais
+_backend = None
+_backend_checked = False
+
+
+def get_credentials():
+    """
+    Retorna as credenciais OAuth compartilhadas pelo processo.
+
+    O `token.json` é lido, renovado antes de expirar e regravado apenas pelo
+    gerenciador de credenciais (`credential_manager.py`), que coordena as
+    renovações entre threads e entre processos.
+
+    Returns:
+        Credentials or None: Credenciais válidas ou None se não houver
+        arquivo de credenciais para autorizar
+    """
+    from credential_manager import get_credential_manager
+    return get_credential_manager().get_credentials()
+
+
+def use_backend(backend):
+    """
+    Direciona todas as chamadas de API para um backend alternativo.
+
+    O backend precisa oferecer `http()`, que retorna um objeto compatível com
+    `httplib2.Http` (ver `fake_backend.py`). Passe None para voltar às APIs
+    reais. Os clientes e o índice da pasta do Drive em cache são descartados.
+    """
+    from drive_folder import invalidate_folder_index
+
+    global _backend, _backend_checked
+    with _auth_lock:
+        _backend = backend
+        _backend_checked = True
+        _services.clear()
+    invalidate_folder_index()
+
+
+def _active_backend():
+    """
+    Backend alternativo em uso. Na primeira chamada, instala o backend falso
+    se a variável de ambiente FAKE_GOOGLE_BACKEND estiver definida
+    (ex: FAKE_GOOGLE_BACKEND="latency=0.1,error_rate=0.02").
+    """
+    global _backend, _backend_checked
+    if not _backend_checked:
+        with _auth_lock:
+            if not _backend_checked:
+                spec = os.environ.get('FAKE_GOOGLE_BACKEND')
+                if spec is not None:
+                    from fake_backend import FakeGoogleBackend
+                    _backend = FakeGoogleBackend.from_spec(spec)
+                    print("🧪 Usando backend falso do Google (FAKE_GOOGLE_BACKEND)")
+                _backend_checked = True
+    return _backend
+
+
+def _thread_http():
+    """
+    Conexão HTTP autorizada da thread atual.
+
+    O httplib2 não é thread-safe, então cada thread usa sua própria conexão
+    (reaproveitada entre chamadas) sobre as mesmas credenciais compartilhadas.
+    O AuthorizedHttp renova o token automaticamente quando ele expira.
+    Toda requisição é contabilizada por `api_metrics.MeteredHttp`.
+    """
+    from api_metrics import MeteredHttp
+
+    backend = _active_backend()
+    if backend is not None:
+        return MeteredHttp(backend.http())
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        http = MeteredHttp(AuthorizedHttp(get_credentials(), http=httplib2.Http()))
+        _thread_local.http = http
+    return http
+
+
+def _tracked_request_class():
+    """
+    Subclasse de HttpRequest que passa pelo limitador de taxa e pelas
+    retentativas (ver `ratelimit.py`; só requisições idempotentes são
+    repetidas), que também contabilizam as chamadas
+    por thread, e identifica o método da API das requisições HTTP
+    contabilizadas em `api_metrics.py`. Criada na primeira requisição, junto
+    com o import do googleapiclient.
+    """
+    global _TrackedHttpRequest
+    if _TrackedHttpRequest is None:
+        from googleapiclient.http import HttpRequest
+        from api_metrics import api_method
+        from ratelimit import execute_with_policy, is_idempotent
+
+        class TrackedHttpRequest(HttpRequest):
+            def execute(self, http=None, num_retries=0):
+                if _active_backend() is None:
+                    # Renova o token antes de ele expirar, e não depois de uma chamada falhar
+                    get_credentials()
+                api_name = 'forms' if 'forms.googleapis.com' in self.uri else 'drive'
+                kind = 'read' if self.method == 'GET' else 'write'
+                with api_method(self.methodId):
+                    return execute_with_policy(
+                        api_name, kind,
+                        lambda: super(TrackedHttpRequest, self).execute(http=http, num_retries=num_retries),
+                        retry=is_idempotent(self.method, self.methodId, self.body)
+                    )
+
+        _TrackedHttpRequest = TrackedHttpRequest
+    return _TrackedHttpRequest
+
+
+def _build_request(http, *args, **kwargs):
+    """
+    requestBuilder dos serviços: envia cada requisição pela conexão da thread atual.
+    """
+    return _tracked_request_class()(_thread_http(), *args, **kwargs)
+
+
+def _discovery_document(api_name, version):
+    """
+    Documento de descoberta da API, sem ir à rede sempre que possível.
+
+    Ordem: cache local (DISCOVERY_CACHE_DIR), cópia embutida no
+    googleapiclient e, só se nenhuma existir (versões antigas da biblioteca),
+    download único gravado no cache.
+
+    Returns:
+        str: Documento JSON
+    """
+    cache_path = os.path.join(DISCOVERY_CACHE_DIR, f'{api_name}.{version}.json')
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+        document = get_static_doc(api_name, version)
+    except ImportError:
+        document = None
+    if document is None:
+        import httplib2
+        from googleapiclient.discovery import V2_DISCOVERY_URI
+        uri = V2_DISCOVERY_URI.format(api=api_name, apiVersion=version)
+        response, content = httplib2.Http().request(uri)
+        if response.status >= 400:
+            raise RuntimeError(f"Documento de descoberta indisponível ({response.status}): {uri}")
+        document = content.decode('utf-8')
+        os.makedirs(DISCOVERY_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(document)
+        os.replace(tmp_path, cache_path)
+    return document
+
+
+def _get_service(api_name, version):
+    """
+    Retorna o cliente em cache para a API, construindo-o na primeira chamada.
+    """
+    with _auth_lock:
+        service = _services.get((api_name, version))
+        if service is None:
+            if _active_backend() is None and not get_credentials():
+                return None
+            from googleapiclient.discovery import build_from_document
+            service = build_from_document(
+                _discovery_document(api_name, version),
+                http=_thread_http(),
+                requestBuilder=_build_request
+            )
+            _services[(api_name, version)] = service
+        return service
+
+
 def get_authenticated_service():
     """
     Retorna um serviço autenticado do Google Forms API.
     Esta função centraliza a autenticação para todos os formulários.
+
+    O cliente é construído uma única vez por processo e pode ser usado
+    por várias threads ao mesmo tempo.
     """
-    creds = None
-    
-    # Possíveis caminhos para os arquivos
-    possible_paths = ['.', '../global', '../../global']
-    
-    # Procurar token existente
-    token_path = None
-    for path in possible_paths:
-        full_path = os.path.join(path, TOKEN_FILE)
-        if os.path.exists(full_path):
-            token_path = full_path
-            break
-    
-    if token_path:
-        creds = Credentials.from_authorized_user_file(token_path, DEFAULT_SCOPES)
-    
-    # Se não há credenciais válidas, solicitar autorização
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            # Procurar arquivo de credenciais
-            credentials_path = None
-            for path in possible_paths:
-                full_path = os.path.join(path, CREDENTIALS_FILE)
-                if os.path.exists(full_path):
-                    credentials_path = full_path
-                    break
-            
-            if not credentials_path:
-                print(f"❌ Arquivo de credenciais '{CREDENTIALS_FILE}' não encontrado!")
-                return None
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                credentials_path, DEFAULT_SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-        
-        # Salvar credenciais (tentar na pasta global primeiro)
-        save_path = TOKEN_FILE
-        for path in ['../../global', '../global', '.']:
-            try:
-                test_path = os.path.join(path, TOKEN_FILE)
-                os.makedirs(os.path.dirname(os.path.abspath(test_path)), exist_ok=True)
-                save_path = test_path
-                break
-            except:
-                continue
-                
-        with open(save_path, 'w') as token:
-            token.write(creds.to_json())
-    
-    return build('forms', 'v1', credentials=creds)
+    return _get_service('forms', 'v1')
 
 def create_base_form(title, description):
     """
@@ -273,59 +439,10 @@ def print_form_summary(form_result, total_questions, topic_categories=None):
 def get_drive_service():
     """
     Retorna um serviço autenticado do Google Drive API.
+
+    Compartilha as credenciais e o cache de clientes com `get_authenticated_service`.
     """
-    creds = None
-    
-    # Possíveis caminhos para os arquivos
-    possible_paths = ['.', '../global', '../../global', 'Z:/Desenvolvimento/personal-studying/global']
-    
-    # Procurar token existente
-    token_path = None
-    for path in possible_paths:
-        full_path = os.path.join(path, TOKEN_FILE)
-        if os.path.exists(full_path):
-            token_path = full_path
-            break
-    
-    if token_path:
-        creds = Credentials.from_authorized_user_file(token_path, DEFAULT_SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            # Buscar arquivo de credenciais
-            credentials_path = None
-            for path in possible_paths:
-                full_path = os.path.join(path, CREDENTIALS_FILE)
-                if os.path.exists(full_path):
-                    credentials_path = full_path
-                    break
-            
-            if not credentials_path:
-                print(f"❌ Arquivo de credenciais '{CREDENTIALS_FILE}' não encontrado!")
-                return None
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                credentials_path, DEFAULT_SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-        
-        # Salvar credenciais
-        save_path = TOKEN_FILE
-        for path in ['../../global', '../global', '.']:
-            try:
-                test_path = os.path.join(path, TOKEN_FILE)
-                os.makedirs(os.path.dirname(os.path.abspath(test_path)), exist_ok=True)
-                save_path = test_path
-                break
-            except:
-                continue
-                
-        with open(save_path, 'w') as token:
-            token.write(creds.to_json())
-    
-    return build('drive', 'v3', credentials=creds)
+    return _get_service('drive', 'v3')
 
 
 def find_or_create_folder(folder_name):
@@ -343,15 +460,10 @@ def find_or_create_folder(folder_name):
         if not drive_service:
             return None
         
-        # Se temos o ID salvo para a pasta padrão, usar diretamente
-        if folder_name == GOOGLE_DRIVE_FOLDER_NAME and 'GOOGLE_DRIVE_FOLDER_ID' in globals():
-            try:
-                # Verificar se a pasta ainda existe
-                drive_service.files().get(fileId=GOOGLE_DRIVE_FOLDER_ID).execute()
-                print(f"📁 Pasta '{folder_name}' encontrada (ID salvo)")
-                return GOOGLE_DRIVE_FOLDER_ID
-            except:
-                print(f"⚠️ Pasta com ID salvo não encontrada, procurando...")
+        # Se temos o ID salvo para a pasta padrão, usar diretamente sem verificar
+        # (uma pasta removida aparece como erro na própria operação que a usa)
+        if folder_name == GOOGLE_DRIVE_FOLDER_NAME and GOOGLE_DRIVE_FOLDER_ID:
+            return GOOGLE_DRIVE_FOLDER_ID
         
         # Procurar pasta existente
         results = drive_service.files().list(
@@ -441,79 +553,55 @@ def find_existing_form_by_name(form_name):
     Procura um formulário existente com o nome específico na pasta configurada.
     Verifica também na lixeira e restaura se necessário.
     
+    A busca usa o índice da pasta (`drive_folder.get_folder_index`), listado
+    uma única vez por processo, em vez de uma consulta ao Drive por formulário.
+    Erros na listagem ou na restauração são propagados: tratá-los como "não
+    encontrado" faria a publicação criar um formulário duplicado.
+    
     Args:
         form_name (str): Nome do formulário (baseado no arquivo JSON)
     
     Returns:
         str or None: ID do formulário se encontrado, None se não encontrado
+    
+    Raises:
+        HttpError: Se a pasta não pôde ser listada ou o formulário da lixeira
+            não pôde ser restaurado
     """
-    try:
-        drive_service = get_drive_service()
-        if not drive_service:
-            return None
-        
-        # 1. Primeiro, procurar formulários ativos na pasta específica
-        query = f"name='{form_name}' and mimeType='application/vnd.google-apps.form' and parents in '{GOOGLE_DRIVE_FOLDER_ID}'"
-        
-        results = drive_service.files().list(
-            q=query,
-            spaces='drive',
-            fields='files(id, name)'
-        ).execute()
-        
-        items = results.get('files', [])
-        
-        if items:
-            print(f"📋 Formulário existente encontrado: {items[0]['name']} (ID: {items[0]['id']})")
-            return items[0]['id']
-        
-        # 2. Se não encontrou na pasta, verificar na lixeira
-        print(f"🗑️ Verificando se o formulário '{form_name}' está na lixeira...")
-        
-        query_trash = f"name='{form_name}' and mimeType='application/vnd.google-apps.form' and trashed=true"
-        
-        results_trash = drive_service.files().list(
-            q=query_trash,
-            spaces='drive',
-            fields='files(id, name, trashed)'
-        ).execute()
-        
-        items_trash = results_trash.get('files', [])
-        
-        if items_trash:
-            form_id = items_trash[0]['id']
-            print(f"♻️ Formulário '{form_name}' encontrado na lixeira! Restaurando...")
-            
-            # Restaurar da lixeira
-            try:
-                drive_service.files().update(
-                    fileId=form_id,
-                    body={'trashed': False}
-                ).execute()
-                
-                print(f"✅ Formulário restaurado da lixeira!")
-                
-                # Mover para a pasta correta após restaurar
-                folder_id = find_or_create_folder(GOOGLE_DRIVE_FOLDER_NAME)
-                if folder_id:
-                    move_form_to_folder(form_id, folder_id)
-                    print(f"📁 Formulário movido para a pasta '{GOOGLE_DRIVE_FOLDER_NAME}'")
-                
-                return form_id
-                
-            except Exception as e:
-                print(f"❌ Erro ao restaurar formulário da lixeira: {e}")
-                return None
-        
-        # 3. Se não encontrou nem ativo nem na lixeira
-        print(f"📋 Nenhum formulário '{form_name}' encontrado (ativo ou na lixeira)")
-        return None
-        
-    except Exception as e:
-        print(f"❌ Erro ao procurar formulário existente: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    from drive_folder import get_folder_index, remember_form, restore_request
+    
+    index = get_folder_index()
+    
+    # 1. Primeiro, procurar formulários ativos na pasta específica
+    items = index['active'].get(form_name, [])
+    
+    if items:
+        if len(items) > 1:
+            print(f"⚠️ {len(items)} formulários com o nome '{form_name}' na pasta; "
+                  f"usando o mais recente (rode reconcile.py para corrigir)")
+        print(f"📋 Formulário existente encontrado: {items[0]['name']} (ID: {items[0]['id']})")
+        return items[0]['id']
+    
+    # 2. Se não encontrou na pasta, verificar na lixeira
+    items_trash = index['trashed'].get(form_name, [])
+    
+    if items_trash:
+        form_id = items_trash[0]['id']
+        print(f"♻️ Formulário '{form_name}' encontrado na lixeira! Restaurando...")
+        
+        # Restaurar da lixeira já movendo para a pasta correta (uma única chamada)
+        try:
+            restore_request(get_drive_service(), items_trash[0]).execute()
+        except Exception as e:
+            print(f"❌ Erro ao restaurar formulário da lixeira: {e}")
+            raise
+        remember_form(items_trash[0])
+        print(f"✅ Formulário restaurado da lixeira para a pasta '{GOOGLE_DRIVE_FOLDER_NAME}'!")
+        return form_id
+    
+    # 3. Se não encontrou nem ativo nem na lixeira
+    print(f"📋 Nenhum formulário '{form_name}' encontrado (ativo ou na lixeira)")
+    return None
 
 
 def update_form_title(form_id, new_title):
@@ -0,0 +1,231 @@
+"""
+Índice de Metadados dos Quizzes
+Mantém um arquivo SQLite com os metadados de cada quiz de forms/ (matéria,
+série, tópico, versão, data), as seções de `content.sections` e, por
+questão, a seção, a dificuldade e o número de opções. Consultas sobre
+milhares de quizzes respondem em milissegundos sem reler os JSON.
+
+A atualização é incremental: arquivos com o mesmo mtime e tamanho não são
+abertos, e arquivos tocados mas com o mesmo hash não são reprocessados.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+from config import PUBLISH_STATE_DIR
+
+CORPUS_INDEX_FILE = os.path.join(PUBLISH_STATE_DIR, 'corpus.sqlite')
+
+# Incrementar quando as tabelas mudarem; o índice é recriado do zero
+INDEX_VERSION = 1
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS quizzes (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT,
+    title TEXT,
+    subject TEXT,
+    grade TEXT,
+    topic TEXT,
+    author TEXT,
+    version TEXT,
+    created_date TEXT,
+    question_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sections (
+    quiz TEXT NOT NULL REFERENCES quizzes(name) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS questions (
+    quiz TEXT NOT NULL REFERENCES quizzes(name) ON DELETE CASCADE,
+    question_id INTEGER,
+    position INTEGER NOT NULL,
+    section TEXT,
+    difficulty TEXT,
+    option_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS quizzes_subject_grade ON quizzes(subject, grade);
+CREATE INDEX IF NOT EXISTS questions_quiz ON questions(quiz);
+CREATE INDEX IF NOT EXISTS questions_section_difficulty ON questions(section, difficulty);
+CREATE INDEX IF NOT EXISTS sections_quiz ON sections(quiz);
+"""
+
+
+def connect(db_path=CORPUS_INDEX_FILE):
+    """
+    Abre (ou cria) o índice SQLite.
+
+    Args:
+        db_path (str): Caminho do arquivo do índice
+
+    Returns:
+        sqlite3.Connection: Conexão com as tabelas prontas
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+        conn.executescript('DROP TABLE IF EXISTS questions; DROP TABLE IF EXISTS sections; '
+                           'DROP TABLE IF EXISTS quizzes;')
+        conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+    conn.executescript(_TABLES)
+    return conn
+
+
+def _text(value):
+    if isinstance(value, list):
+        return '\n'.join(str(v) for v in value)
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _index_quiz(conn, name, path, st, digest, raw):
+    """
+    Substitui as linhas de um quiz pelo conteúdo atual do arquivo.
+    """
+    conn.execute('DELETE FROM quizzes WHERE name = ?', (name,))
+    try:
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError('top-level JSON value must be an object')
+    except (ValueError, UnicodeDecodeError) as e:
+        conn.execute(
+            'INSERT INTO quizzes (name, path, mtime_ns, size, hash, error) VALUES (?, ?, ?, ?, ?, ?)',
+            (name, path, st.st_mtime_ns, st.st_size, digest, str(e))
+        )
+        return
+
+    meta = data.get('metadata') if isinstance(data.get('metadata'), dict) else {}
+    content = data.get('content') if isinstance(data.get('content'), dict) else {}
+    questions = [q for q in data.get('questions') or [] if isinstance(q, dict)]
+
+    conn.execute(
+        'INSERT INTO quizzes (name, path, mtime_ns, size, hash, title, subject, grade, topic, '
+        'author, version, created_date, question_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (name, path, st.st_mtime_ns, st.st_size, digest,
+         *(_text(meta.get(k)) for k in ('title', 'subject', 'grade', 'topic', 'author', 'version', 'created_date')),
+         len(questions))
+    )
+    conn.executemany(
+        'INSERT INTO sections (quiz, name, description) VALUES (?, ?, ?)',
+        [(name, _text(s.get('name')), _text(s.get('description')))
+         for s in content.get('sections') or [] if isinstance(s, dict)]
+    )
+    conn.executemany(
+        'INSERT INTO questions (quiz, question_id, position, section, difficulty, option_count) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        [(name, q.get('id') if isinstance(q.get('id'), int) else None, position,
+          _text(q.get('section')), _text(q.get('difficulty')),
+          len(q['options']) if isinstance(q.get('options'), list) else None)
+         for position, q in enumerate(questions)]
+    )
+
+
+def update_index(conn, forms_dir):
+    """
+    Atualiza o índice com os arquivos *.json de `forms_dir`.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de `connect`
+        forms_dir (str): Pasta dos quizzes
+
+    Returns:
+        dict: Quantidade de quizzes 'added', 'updated', 'touched' (mesmo hash),
+            'unchanged' e 'removed'
+    """
+    stats = dict.fromkeys(('added', 'updated', 'touched', 'unchanged', 'removed'), 0)
+    known = {row['name']: row for row in conn.execute('SELECT name, mtime_ns, size, hash FROM quizzes')}
+    seen = set()
+
+    with conn:
+        for entry in sorted(os.scandir(forms_dir), key=lambda e: e.name):
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            name = entry.name[:-5]
+            seen.add(name)
+            st = entry.stat()
+            row = known.get(name)
+            if row and (row['mtime_ns'], row['size']) == (st.st_mtime_ns, st.st_size):
+                stats['unchanged'] += 1
+                continue
+
+            with open(entry.path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if row and row['hash'] == digest:
+                conn.execute('UPDATE quizzes SET mtime_ns = ?, size = ? WHERE name = ?',
+                             (st.st_mtime_ns, st.st_size, name))
+                stats['touched'] += 1
+                continue
+
+            _index_quiz(conn, name, entry.path, st, digest, raw)
+            stats['updated' if row else 'added'] += 1
+
+        for name in set(known) - seen:
+            conn.execute('DELETE FROM quizzes WHERE name = ?', (name,))
+            stats['removed'] += 1
+
+    return stats
+
+
+def query_quizzes(conn, subject=None, grade=None, topic=None, section=None, difficulty=None,
+                  min_options=None, max_options=None):
+    """
+    Quizzes que atendem aos filtros. Filtros de texto ignoram maiúsculas/minúsculas.
+    Filtros de questão (seção, dificuldade, opções) exigem pelo menos uma questão
+    que atenda a todos eles.
+
+    Returns:
+        list: dicts com name, title, subject, grade, topic, question_count e
+            matching_questions
+    """
+    where = ['q.error IS NULL']
+    params = []
+    for column, value in (('subject', subject), ('grade', grade), ('topic', topic)):
+        if value is not None:
+            where.append(f'q.{column} = ? COLLATE NOCASE')
+            params.append(value)
+
+    question_filters = []
+    question_params = []
+    if section is not None:
+        question_filters.append('x.section = ? COLLATE NOCASE')
+        question_params.append(section)
+    if difficulty is not None:
+        question_filters.append('x.difficulty = ? COLLATE NOCASE')
+        question_params.append(difficulty)
+    if min_options is not None:
+        question_filters.append('x.option_count >= ?')
+        question_params.append(min_options)
+    if max_options is not None:
+        question_filters.append('x.option_count <= ?')
+        question_params.append(max_options)
+
+    if question_filters:
+        sql = (
+            'SELECT q.name, q.title, q.subject, q.grade, q.topic, q.question_count, '
+            'COUNT(*) AS matching_questions FROM quizzes q JOIN questions x ON x.quiz = q.name '
+            f"WHERE {' AND '.join(where + question_filters)} GROUP BY q.name ORDER BY q.name"
+        )
+        params += question_params
+    else:
+        sql = (
+            'SELECT name, title, subject, grade, topic, question_count, '
+            'question_count AS matching_questions FROM quizzes q '
+            f"WHERE {' AND '.join(where)} ORDER BY name"
+        )
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def list_errors(conn):
+    """
+    Quizzes que não puderam ser indexados (JSON inválido), com a mensagem de erro.
+    """
+    return [dict(row) for row in conn.execute('SELECT name, error FROM quizzes WHERE error IS NOT NULL ORDER BY name')]
@@ -0,0 +1,205 @@
+"""
+Gerenciador de Credenciais
+Único ponto que lê, renova e grava o `token.json`. O caminho do token é
+resolvido uma vez (absoluto, independente da pasta de execução), a renovação
+acontece alguns minutos antes de o token expirar e não depois de uma chamada
+falhar, e cada renovação é serializada:
+
+- entre threads, por um lock do processo;
+- entre processos, por um lock de arquivo (`token.json.lock`). Quem obtém o
+  lock relê o token do disco antes de renovar, então se outro processo acabou
+  de renová-lo o token novo é reaproveitado sem uma nova chamada ao Google.
+
+O token é gravado num arquivo temporário e trocado com `os.replace`, então
+nenhum leitor vê um arquivo pela metade. Com N workers, uma renovação.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from config import CREDENTIALS_FILE, DEFAULT_SCOPES, GLOBAL_PATH, TOKEN_FILE
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Renovar quando faltar menos que isso para o token expirar
+REFRESH_MARGIN = timedelta(minutes=5)
+
+# Pastas onde o token e as credenciais são procurados (a primeira é a padrão)
+SEARCH_DIRS = [GLOBAL_PATH, os.path.dirname(GLOBAL_PATH)]
+
+
+def _find(filename):
+    for directory in SEARCH_DIRS:
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def resolve_token_path():
+    """
+    Caminho absoluto do `token.json`: a variável GOOGLE_TOKEN_FILE, senão o
+    token existente em global/ ou na raiz do projeto, senão global/token.json.
+    """
+    return os.path.abspath(
+        os.environ.get('GOOGLE_TOKEN_FILE') or _find(TOKEN_FILE) or os.path.join(SEARCH_DIRS[0], TOKEN_FILE)
+    )
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Lock exclusivo entre processos sobre `path` (criado se não existir).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _utcnow():
+    # O google-auth guarda `expiry` como datetime UTC sem fuso
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def needs_refresh(creds, margin=REFRESH_MARGIN):
+    """
+    Se as credenciais expiram (ou já expiraram) dentro da margem.
+    """
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    return creds.expiry - _utcnow() < margin
+
+
+class CredentialManager:
+    """
+    Credenciais OAuth compartilhadas pelo processo, com renovação antecipada
+    coordenada entre threads e processos.
+
+    O objeto Credentials entregue é sempre o mesmo: renovações (inclusive as
+    feitas por outro processo e lidas do disco) atualizam token e validade
+    nele, então as conexões HTTP já abertas passam a usar o token novo.
+    """
+
+    def __init__(self, token_path=None, scopes=None):
+        self.token_path = token_path or resolve_token_path()
+        self.lock_path = self.token_path + '.lock'
+        self.scopes = scopes or DEFAULT_SCOPES
+        self.refreshes = 0
+        self._creds = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """
+        Lê o token do disco (None se não existe, está corrompido ou não tem os escopos).
+        """
+        from google.oauth2.credentials import Credentials
+
+        try:
+            creds = Credentials.from_authorized_user_file(self.token_path)
+        except FileNotFoundError:
+            return None
+        except (ValueError, json.JSONDecodeError):
+            print(f"⚠️ Token inválido em {self.token_path}; nova autorização necessária")
+            return None
+        if not creds.has_scopes(self.scopes):
+            # Token antigo, autorizado antes de um novo escopo: pedir autorização de novo
+            print("🔑 O token salvo não tem todos os escopos necessários; nova autorização necessária")
+            return None
+        return creds
+
+    def _save(self, creds):
+        tmp_path = f"{self.token_path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
+    def _authorize(self):
+        """
+        Autorização interativa no navegador (primeiro uso ou token sem os escopos).
+        """
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        credentials_path = _find(CREDENTIALS_FILE)
+        if not credentials_path:
+            print(f"❌ Arquivo de credenciais '{CREDENTIALS_FILE}' não encontrado!")
+            return None
+        flow = InstalledAppFlow.from_client_secrets_file(credentials_path, self.scopes)
+        return flow.run_local_server(port=0)
+
+    def _adopt(self, creds):
+        """
+        Passa a usar `creds`, mantendo o mesmo objeto entregue anteriormente.
+        """
+        if self._creds is None:
+            self._creds = creds
+        else:
+            self._creds.token = creds.token
+            self._creds.expiry = creds.expiry
+        return self._creds
+
+    def get_credentials(self):
+        """
+        Credenciais válidas por pelo menos REFRESH_MARGIN.
+
+        Returns:
+            Credentials or None: None se não há token nem arquivo de
+            credenciais para autorizar
+        """
+        with self._lock:
+            if self._creds is not None and not needs_refresh(self._creds):
+                return self._creds
+
+            with file_lock(self.lock_path):
+                # Outro processo pode ter renovado o token enquanto esperávamos o lock
+                stored = self._load()
+                if stored is not None and not needs_refresh(stored):
+                    return self._adopt(stored)
+
+                creds = stored or self._creds
+                if creds is not None and creds.refresh_token:
+                    from google.auth.transport.requests import Request
+                    creds.refresh(Request())
+                    self.refreshes += 1
+                else:
+                    creds = self._authorize()
+                    if creds is None:
+                        return None
+                self._save(creds)
+                return self._adopt(creds)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_credential_manager():
+    """
+    Gerenciador do processo, criado na primeira chamada.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CredentialManager()
+        return _manager
@@ -0,0 +1,204 @@
+"""
+Detecção de Questões Quase Duplicadas
+Compara o texto de cada questão (enunciado + opções) com o resto do banco
+sem comparar todos os pares: cada questão vira um conjunto de shingles de
+palavras, resumido numa assinatura MinHash (calculada em bloco com NumPy);
+o LSH (bandas da assinatura) só junta como candidatas as questões que colidem em alguma banda. Os pares
+candidatos são confirmados pela similaridade de Jaccard exata e agrupados
+em clusters (union-find).
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from question_bank import iter_questions
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_SHINGLE_SIZE = 2
+# 16 bandas de 4 linhas: pares com Jaccard a partir de ~0.5 viram candidatos
+DEFAULT_BANDS = 16
+DEFAULT_ROWS = 4
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_text(text):
+    """
+    Minúsculas, sem acentos e sem pontuação, para que variações de escrita
+    não afetem a comparação (caracteres fora do ASCII, como emojis, são descartados).
+    """
+    text = unicodedata.normalize('NFKD', str(text).lower()).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_WORD_RE.findall(text))
+
+
+def question_text(question):
+    """
+    Texto comparado de uma questão: enunciado e opções em ordem alfabética
+    (reordenar as alternativas não muda o resultado).
+    """
+    options = question.get('options') if isinstance(question.get('options'), list) else []
+    return ' '.join([str(question.get('question', ''))] + sorted(str(o) for o in options))
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """
+    Conjunto de hashes (32 bits, estáveis entre execuções) das sequências de
+    `size` palavras do texto normalizado.
+    """
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def make_hash_params(count, seed=1):
+    """
+    Parâmetros das `count` funções de hash multiply-shift ((a * x + b) >> 32).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=count, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=count, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(shingle_sets, hash_params, chunk_size=2048):
+    """
+    Assinaturas MinHash de vários conjuntos de shingles de uma vez.
+
+    Os shingles de um bloco de questões são concatenados num único vetor;
+    todas as funções de hash são aplicadas numa operação matricial e o
+    mínimo de cada questão sai de um `np.minimum.reduceat`.
+
+    Args:
+        shingle_sets (list): Conjuntos não vazios de hashes de shingles
+        hash_params (tuple): Resultado de `make_hash_params`
+        chunk_size (int): Questões por bloco (limita a memória usada)
+
+    Returns:
+        numpy.ndarray: Matriz questões x funções de hash (uint32)
+    """
+    a, b = hash_params
+    signatures = np.empty((len(shingle_sets), len(a)), dtype=np.uint32)
+    for start in range(0, len(shingle_sets), chunk_size):
+        chunk = shingle_sets[start:start + chunk_size]
+        lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        values = np.fromiter((v for s in chunk for v in s), dtype=np.uint64, count=int(lengths.sum()))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        # Aritmética uint64 com overflow intencional (módulo 2^64)
+        hashed = (values[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)
+        signatures[start:start + len(chunk)] = np.minimum.reduceat(hashed, offsets, axis=0)
+    return signatures
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = self.parent.setdefault(x, x)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def _band_collisions(band):
+    """
+    Grupos de questões (índices em ordem crescente) com a mesma banda da assinatura.
+    Cada banda vira uma chave de 64 bits; a ordenação encontra as chaves repetidas
+    sem montar um dicionário com uma entrada por questão.
+    """
+    keys = np.zeros(len(band), dtype=np.uint64)
+    for column in band.T.astype(np.uint64):
+        keys = keys * np.uint64(0x9E3779B97F4A7C15) + column
+    order = np.argsort(keys, kind='stable')
+    boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(keys)]))
+    for group in np.flatnonzero(ends - starts > 1):
+        yield sorted(order[starts[group]:ends[group]].tolist())
+
+
+def find_near_duplicates(questions, threshold=DEFAULT_THRESHOLD, bands=DEFAULT_BANDS,
+                         rows=DEFAULT_ROWS, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """
+    Agrupa questões quase duplicadas.
+
+    Args:
+        questions (iterable): dicts com 'quiz', 'id' e 'text'
+        threshold (float): Jaccard mínimo entre os shingles de um par
+        bands (int): Bandas do LSH
+        rows (int): Valores da assinatura por banda
+        shingle_size (int): Palavras por shingle
+
+    Returns:
+        dict: 'clusters' (listas de questões, maiores primeiro, cada questão com
+            a maior similaridade a outra do cluster em 'similarity'),
+            'questions' (total analisado) e 'candidate_pairs' (pares verificados)
+    """
+    entries = []
+    shingle_sets = []
+    for entry in questions:
+        shingle_set = shingles(entry['text'], shingle_size)
+        if shingle_set:
+            entries.append(entry)
+            shingle_sets.append(shingle_set)
+
+    candidates = set()
+    if entries:
+        signatures = minhash_signatures(shingle_sets, make_hash_params(bands * rows))
+        for band in range(bands):
+            for members in _band_collisions(signatures[:, band * rows:(band + 1) * rows]):
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        candidates.add((first, second))
+
+    groups = _UnionFind()
+    best = defaultdict(float)
+    for a, b in candidates:
+        similarity = jaccard(shingle_sets[a], shingle_sets[b])
+        if similarity >= threshold:
+            groups.union(a, b)
+            best[a] = max(best[a], similarity)
+            best[b] = max(best[b], similarity)
+
+    clusters = defaultdict(list)
+    for index in best:
+        clusters[groups.find(index)].append(index)
+
+    result = [
+        [{**entries[i], 'similarity': round(best[i], 3)} for i in sorted(members)]
+        for members in clusters.values()
+    ]
+    result.sort(key=lambda c: (-len(c), c[0]['quiz'], str(c[0]['id'])))
+    return {'clusters': result, 'questions': len(entries), 'candidate_pairs': len(candidates)}
+
+
+def iter_bank_entries(forms_dir):
+    """
+    Questões do banco no formato esperado por `find_near_duplicates`.
+    """
+    for quiz, _, question in iter_questions(forms_dir):
+        yield {
+            'quiz': quiz,
+            'id': question.get('id'),
+            'question': question.get('question'),
+            'text': question_text(question),
+        }
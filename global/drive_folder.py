@@ -0,0 +1,360 @@
+"""
+Índice da Pasta de Formulários no Google Drive
+Lista a pasta GOOGLE_DRIVE_FOLDER_ID e a lixeira uma única vez (com paginação)
+e monta um mapa nome -> arquivos. O índice é compartilhado pelo processo:
+`find_existing_form_by_name` consulta o mapa em vez de fazer uma busca por
+formulário, e o `reconcile.py` o usa para relatar e corrigir duplicados,
+órfãos e formulários na lixeira com requisições em lote do Drive.
+Formulários novos são renomeados e colocados na pasta com um único
+`files.update`, e o ID salvo da pasta é usado sem ser verificado.
+"""
+
+import threading
+
+from config import (
+    API_RETRY_ATTEMPTS,
+    DRIVE_BATCH_MAX_REQUESTS,
+    GOOGLE_DRIVE_FOLDER_ID,
+    get_drive_service,
+)
+from ratelimit import execute_with_policy, is_retryable, wait_before_retry
+
+FORM_MIME_TYPE = 'application/vnd.google-apps.form'
+
+# Campos lidos de cada arquivo na listagem
+FILE_FIELDS = 'id, name, parents, modifiedTime, trashed'
+
+LIST_PAGE_SIZE = 1000
+
+_index = None
+_index_lock = threading.Lock()
+
+# ID real da pasta raiz ("Meu Drive"), consultado uma vez por processo
+_root_folder_id = None
+
+
+def list_files(drive_service, query):
+    """
+    Lista todos os arquivos de uma consulta, seguindo a paginação.
+
+    Args:
+        drive_service: Serviço do Google Drive
+        query (str): Consulta `q` do Drive
+
+    Returns:
+        list: Arquivos com os campos de FILE_FIELDS
+    """
+    files = []
+    page_token = None
+    while True:
+        response = drive_service.files().list(
+            q=query,
+            spaces='drive',
+            pageSize=LIST_PAGE_SIZE,
+            pageToken=page_token,
+            fields=f'nextPageToken, files({FILE_FIELDS})'
+        ).execute()
+        files.extend(response.get('files', []))
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+def _group_by_name(files):
+    groups = {}
+    for file in files:
+        groups.setdefault(file['name'], []).append(file)
+    # Mais recente primeiro: é a cópia mantida quando há duplicados
+    for copies in groups.values():
+        copies.sort(key=lambda f: f.get('modifiedTime', ''), reverse=True)
+    return groups
+
+
+def folder_queries():
+    """
+    Consultas `q` usadas por `scan_folder`: formulários da pasta e os dela
+    que estão na lixeira. Formulários de mesmo nome na lixeira de outras
+    pastas do Drive não pertencem ao acervo e nunca são restaurados.
+    """
+    return (
+        f"'{GOOGLE_DRIVE_FOLDER_ID}' in parents and mimeType='{FORM_MIME_TYPE}' and trashed=false",
+        f"'{GOOGLE_DRIVE_FOLDER_ID}' in parents and mimeType='{FORM_MIME_TYPE}' and trashed=true",
+    )
+
+
+def scan_folder(drive_service=None):
+    """
+    Lista os formulários da pasta configurada e os dela na lixeira (duas consultas paginadas).
+
+    Returns:
+        dict: {'active': {nome: [arquivos]}, 'trashed': {nome: [arquivos]}}
+    """
+    drive_service = drive_service or get_drive_service()
+    active_query, trashed_query = folder_queries()
+    active = list_files(drive_service, active_query)
+    trashed = list_files(drive_service, trashed_query)
+    return {'active': _group_by_name(active), 'trashed': _group_by_name(trashed)}
+
+
+def get_folder_index(refresh=False):
+    """
+    Índice da pasta, listado na primeira chamada e reaproveitado pelo processo.
+
+    Args:
+        refresh (bool): Se deve listar a pasta novamente
+
+    Returns:
+        dict: Mesmo formato de `scan_folder`
+    """
+    global _index
+    with _index_lock:
+        if _index is None or refresh:
+            _index = scan_folder()
+        return _index
+
+
+def invalidate_folder_index():
+    """
+    Descarta o índice e o ID da raiz em cache (a próxima consulta lista a pasta de novo).
+    """
+    global _index, _root_folder_id
+    with _index_lock:
+        _index = None
+        _root_folder_id = None
+
+
+def remember_form(file):
+    """
+    Registra no índice em cache um formulário criado ou restaurado na pasta.
+
+    Args:
+        file (dict): Arquivo com pelo menos 'id' e 'name'
+    """
+    with _index_lock:
+        if _index is None:
+            return
+        for group in ('active', 'trashed'):
+            copies = _index[group].get(file['name'], [])
+            copies[:] = [f for f in copies if f['id'] != file['id']]
+            if not copies:
+                _index[group].pop(file['name'], None)
+        file = {**file, 'parents': [GOOGLE_DRIVE_FOLDER_ID], 'trashed': False}
+        _index['active'].setdefault(file['name'], []).insert(0, file)
+
+
+def forget_form(file):
+    """
+    Remove um formulário enviado para a lixeira do grupo de ativos do índice.
+    """
+    with _index_lock:
+        if _index is None:
+            return
+        copies = _index['active'].get(file['name'], [])
+        copies[:] = [f for f in copies if f['id'] != file['id']]
+        if not copies:
+            _index['active'].pop(file['name'], None)
+        _index['trashed'].setdefault(file['name'], []).append({**file, 'trashed': True})
+
+
+def get_root_folder_id(drive_service=None):
+    """
+    ID da pasta raiz do Drive, onde o Forms cria os formulários novos.
+    Consultado uma vez por processo, mesmo com vários workers publicando.
+
+    Sem acesso aos metadados da raiz (403/404, ex: escopo drive.file), o
+    alias 'root' é usado. Outros erros (cota, 5xx, rede) são propagados e
+    nada fica em cache.
+    """
+    global _root_folder_id
+    if _root_folder_id is not None:
+        return _root_folder_id
+    with _index_lock:
+        if _root_folder_id is None:
+            drive_service = drive_service or get_drive_service()
+            try:
+                _root_folder_id = drive_service.files().get(fileId='root', fields='id').execute()['id']
+            except Exception as e:
+                status = getattr(getattr(e, 'resp', None), 'status', None)
+                if status is None or int(status) not in (403, 404):
+                    raise
+                _root_folder_id = 'root'
+        return _root_folder_id
+
+
+def place_new_form(form_id, name, drive_service=None):
+    """
+    Define o nome de um formulário recém-criado e o move da raiz para a pasta
+    configurada com um único `files.update`. O ID da pasta é usado sem ser
+    verificado; se ela não existir mais, o formulário é apenas renomeado.
+
+    Args:
+        form_id (str): ID do formulário
+        name (str): Nome do arquivo no Drive
+        drive_service: Serviço do Google Drive (opcional)
+
+    Returns:
+        bool: True se o formulário foi colocado na pasta
+    """
+    drive_service = drive_service or get_drive_service()
+    try:
+        file = drive_service.files().update(
+            fileId=form_id,
+            body={'name': name},
+            addParents=GOOGLE_DRIVE_FOLDER_ID,
+            removeParents=get_root_folder_id(drive_service),
+            fields='id, name, parents'
+        ).execute()
+    except Exception as e:
+        print(f"⚠️ Não foi possível mover para a pasta {GOOGLE_DRIVE_FOLDER_ID}: {e}")
+        drive_service.files().update(fileId=form_id, body={'name': name}, fields='id').execute()
+        return False
+    remember_form(file)
+    return True
+
+
+def restore_request(drive_service, file):
+    """
+    Requisição única que tira o formulário da lixeira e o coloca na pasta configurada.
+    """
+    previous_parents = [p for p in file.get('parents', []) if p != GOOGLE_DRIVE_FOLDER_ID]
+    kwargs = {'removeParents': ','.join(previous_parents)} if previous_parents else {}
+    return drive_service.files().update(
+        fileId=file['id'],
+        body={'trashed': False},
+        addParents=GOOGLE_DRIVE_FOLDER_ID,
+        fields='id, name, parents',
+        **kwargs
+    )
+
+
+def trash_request(drive_service, file):
+    """
+    Requisição que envia o formulário para a lixeira (reversível pelo Drive).
+    """
+    return drive_service.files().update(
+        fileId=file['id'],
+        body={'trashed': True},
+        fields='id'
+    )
+
+
+def execute_drive_batch(drive_service, requests):
+    """
+    Envia requisições do Drive em lotes HTTP de até DRIVE_BATCH_MAX_REQUESTS.
+
+    Só as partes que falharam com erro temporário (429/5xx na própria parte,
+    ou o lote inteiro por erro de rede ou 5xx) são reenviadas, num novo lote,
+    até API_RETRY_ATTEMPTS tentativas; as partes já respondidas não se repetem.
+
+    Args:
+        drive_service: Serviço do Google Drive
+        requests (list): Requisições já montadas (HttpRequest)
+
+    Returns:
+        list: (resposta, erro) para cada requisição, na mesma ordem
+    """
+    results = [None] * len(requests)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), DRIVE_BATCH_MAX_REQUESTS):
+        pending = list(range(start, min(start + DRIVE_BATCH_MAX_REQUESTS, len(requests))))
+        attempt = 0
+        while pending:
+            batch = drive_service.new_batch_http_request(callback=callback)
+            for index in pending:
+                batch.add(requests[index], request_id=str(index))
+            try:
+                execute_with_policy('drive', 'write', batch.execute, retry=False, cost=len(pending))
+            except Exception as e:
+                if attempt + 1 >= API_RETRY_ATTEMPTS or not is_retryable(e):
+                    raise
+                wait_before_retry(e, attempt)
+                attempt += 1
+                continue
+
+            failed = [
+                index for index in pending
+                if results[index][1] is not None and is_retryable(results[index][1])
+            ]
+            if not failed or attempt + 1 >= API_RETRY_ATTEMPTS:
+                break
+            wait_before_retry(results[failed[0]][1], attempt)
+            attempt += 1
+            pending = failed
+
+    return results
+
+
+def build_reconcile_report(index, quiz_names, keep_ids=()):
+    """
+    Compara o índice da pasta com os quizzes locais.
+
+    Args:
+        index (dict): Resultado de `scan_folder`
+        quiz_names (iterable): Nomes dos JSON em forms/ (sem extensão)
+        keep_ids (iterable): IDs que devem ser mantidos entre duplicados
+            (ex: os registrados no manifesto de publicação)
+
+    Returns:
+        dict: 'duplicates' (nome, mantido, extras), 'orphans' (formulários sem
+            JSON) e 'trashed' (formulários na lixeira cujo JSON ainda existe e
+            que não têm cópia ativa)
+    """
+    quiz_names = set(quiz_names)
+    keep_ids = set(keep_ids)
+    report = {'duplicates': [], 'orphans': [], 'trashed': []}
+
+    for name, copies in sorted(index['active'].items()):
+        if name not in quiz_names:
+            report['orphans'].extend(copies)
+            continue
+        if len(copies) > 1:
+            keep = next((f for f in copies if f['id'] in keep_ids), copies[0])
+            report['duplicates'].append({
+                'name': name,
+                'keep': keep,
+                'extra': [f for f in copies if f['id'] != keep['id']]
+            })
+
+    for name, copies in sorted(index['trashed'].items()):
+        if name in quiz_names and name not in index['active']:
+            report['trashed'].append(copies[0])
+
+    return report
+
+
+def apply_reconcile(report, trash_orphans=False, drive_service=None):
+    """
+    Corrige o relatório: duplicados extras vão para a lixeira, formulários com
+    JSON são restaurados da lixeira e, se pedido, órfãos vão para a lixeira.
+
+    Returns:
+        dict: Quantidade de 'trashed', 'restored' e 'failed'
+    """
+    drive_service = drive_service or get_drive_service()
+
+    actions = []
+    for duplicate in report['duplicates']:
+        actions.extend(('trash', f) for f in duplicate['extra'])
+    if trash_orphans:
+        actions.extend(('trash', f) for f in report['orphans'])
+    actions.extend(('restore', f) for f in report['trashed'])
+
+    requests = [
+        restore_request(drive_service, file) if action == 'restore' else trash_request(drive_service, file)
+        for action, file in actions
+    ]
+    counts = {'trashed': 0, 'restored': 0, 'failed': 0}
+    for (action, file), (response, error) in zip(actions, execute_drive_batch(drive_service, requests)):
+        if error is not None:
+            print(f"❌ Falha ao corrigir '{file['name']}' ({file['id']}): {error}")
+            counts['failed'] += 1
+        elif action == 'restore':
+            remember_form(file)
+            counts['restored'] += 1
+        else:
+            forget_form(file)
+            counts['trashed'] += 1
+    return counts
@@ -0,0 +1,644 @@
+"""
+Backend Falso do Google Forms/Drive
+Substitui as APIs do Google por um estado em memória para medir e testar o
+pipeline de publicação sem credenciais nem rede. O backend atua na camada
+HTTP: os clientes continuam sendo criados pelo `build()` da biblioteca
+(a partir do documento de descoberta local), então o limitador de taxa, as
+retentativas e a contabilização de chamadas funcionam como em produção.
+
+Uso:
+    from fake_backend import FakeGoogleBackend
+    from config import use_backend
+
+    backend = FakeGoogleBackend(latency=0.05, error_rate=0.01, seed=42)
+    use_backend(backend)
+    ...  # criar_formulario_do_json, find_existing_form_by_name, etc.
+    print(backend.calls)
+
+Ou, para rodar o `form.py` inteiro offline:
+    FAKE_GOOGLE_BACKEND="latency=0.05,error_rate=0.01" python form.py pronomes
+"""
+
+import copy
+import json
+from email.parser import Parser
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+
+from config import GOOGLE_DRIVE_FOLDER_ID, GOOGLE_DRIVE_FOLDER_NAME
+
+FORM_MIME_TYPE = 'application/vnd.google-apps.form'
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+_FORMS_PREFIX = '/v1/forms'
+_DRIVE_PREFIX = '/drive/v3/files'
+_BATCH_PREFIX = '/batch/'
+
+
+class FakeApiError(Exception):
+    """
+    Erro que o backend devolve como resposta HTTP (status + mensagem).
+    """
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+def _new_id(prefix):
+    return f"{prefix}{uuid.uuid4().hex[:20]}"
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _parse_fields(fields):
+    """
+    Converte uma máscara `fields` ("a,b(c,d)") em árvore {campo: subárvore ou None}.
+    """
+    tree = {}
+    depth = 0
+    token = ''
+    parts = []
+    for char in fields:
+        if char == ',' and depth == 0:
+            parts.append(token)
+            token = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        token += char
+    parts.append(token)
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        if '(' in part:
+            name, sub = part.split('(', 1)
+            tree[name.strip()] = _parse_fields(sub[:-1])
+        else:
+            tree[part] = None
+    return tree
+
+
+def _project(value, tree):
+    """
+    Aplica a árvore de campos a um objeto (ou lista de objetos) da resposta.
+    """
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project(element, tree) for element in value]
+    if not isinstance(value, dict):
+        return value
+    if '*' in tree:
+        return value
+    return {key: _project(value[key], sub) for key, sub in tree.items() if key in value}
+
+
+def _set_path(target, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def _get_path(source, path):
+    for key in path.split('.'):
+        if not isinstance(source, dict) or key not in source:
+            return None
+        source = source[key]
+    return source
+
+
+class FakeHttp:
+    """
+    Objeto compatível com `httplib2.Http` que encaminha as requisições ao backend.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        return self.backend.handle(uri, method, body, headers or {})
+
+
+class FakeGoogleBackend:
+    """
+    Estado em memória dos formulários e arquivos do Drive.
+
+    Args:
+        latency (float or dict): Segundos de atraso por chamada. Um dict
+            permite valores por método (ex: {'forms.batchUpdate': 0.3}),
+            com a chave 'default' para os demais.
+        error_rate (float): Probabilidade de uma chamada falhar com `error_status`
+        error_status (int): Status HTTP dos erros aleatórios (padrão 503)
+        seed (int): Semente para tornar os erros aleatórios reproduzíveis
+        create_folder (bool): Se cria a pasta configurada em GOOGLE_DRIVE_FOLDER_ID
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=503, seed=None, create_folder=True):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.forms = {}
+        self.files = {}
+        self.scheduled_errors = []
+        self.calls = Counter()
+        self.batched_calls = Counter()
+        self.request_log = []
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._revision = 0
+        self.files['root'] = {
+            'id': 'root', 'name': 'My Drive', 'mimeType': FOLDER_MIME_TYPE,
+            'parents': [], 'trashed': False, 'modifiedTime': _now()
+        }
+        if create_folder:
+            self.add_folder(GOOGLE_DRIVE_FOLDER_NAME, GOOGLE_DRIVE_FOLDER_ID)
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Cria o backend a partir de um texto "latency=0.1,error_rate=0.02,seed=1".
+        """
+        kwargs = {}
+        for part in filter(None, (p.strip() for p in spec.split(','))):
+            if '=' not in part:
+                continue
+            key, value = part.split('=', 1)
+            kwargs[key.strip()] = int(value) if key.strip() in ('seed', 'error_status') else float(value)
+        return cls(**kwargs)
+
+    # ------------------------------------------------------------------
+    # Configuração e inspeção
+    # ------------------------------------------------------------------
+
+    def http(self):
+        """
+        Objeto HTTP a ser usado pelos clientes da biblioteca.
+        """
+        return FakeHttp(self)
+
+    def fail_next(self, status=503, count=1, method=None, retry_after=None):
+        """
+        Agenda falhas para as próximas chamadas (opcionalmente de um método).
+
+        Args:
+            status (int): Status HTTP da falha
+            count (int): Quantas chamadas devem falhar
+            method (str): Método afetado (ex: 'forms.batchUpdate'); None = qualquer
+            retry_after (float): Valor do cabeçalho Retry-After
+        """
+        with self.lock:
+            for _ in range(count):
+                self.scheduled_errors.append((method, status, retry_after))
+
+    def reset_stats(self):
+        """
+        Zera os contadores de chamadas e bytes (o estado dos formulários é mantido).
+        """
+        with self.lock:
+            self.calls = Counter()
+            self.batched_calls = Counter()
+            self.request_log = []
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def add_folder(self, name, folder_id=None):
+        """
+        Cria uma pasta no Drive falso e retorna seu ID.
+        """
+        folder_id = folder_id or _new_id('fld')
+        self.files[folder_id] = {
+            'id': folder_id, 'name': name, 'mimeType': FOLDER_MIME_TYPE,
+            'parents': ['root'], 'trashed': False, 'modifiedTime': _now()
+        }
+        return folder_id
+
+    def add_response(self, form_id, answers, respondent_email=None, submitted_at=None):
+        """
+        Registra uma resposta de aluno.
+
+        Args:
+            form_id (str): ID do formulário
+            answers (dict): Título da questão (ou questionId) -> texto escolhido
+            respondent_email (str): Email do aluno, se coletado
+            submitted_at (datetime): Momento do envio (padrão: agora)
+
+        Returns:
+            dict: Resposta registrada
+        """
+        with self.lock:
+            form = self.forms[form_id]
+            question_ids = {}
+            for item in form['items']:
+                question = item.get('questionItem', {}).get('question')
+                if question:
+                    question_ids[item.get('title')] = question['questionId']
+                    question_ids[question['questionId']] = question['questionId']
+            timestamp = (submitted_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+            timestamp = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            response = {
+                'formId': form_id,
+                'responseId': _new_id('resp'),
+                'createTime': timestamp,
+                'lastSubmittedTime': timestamp,
+                'answers': {
+                    question_ids[key]: {
+                        'questionId': question_ids[key],
+                        'textAnswers': {'answers': [{'value': value}]}
+                    }
+                    for key, value in answers.items()
+                }
+            }
+            if respondent_email:
+                response['respondentEmail'] = respondent_email
+            form.setdefault('_responses', []).append(response)
+            return response
+
+    # ------------------------------------------------------------------
+    # Camada HTTP
+    # ------------------------------------------------------------------
+
+    def _latency_for(self, method_key):
+        if isinstance(self.latency, dict):
+            return self.latency.get(method_key, self.latency.get('default', 0.0))
+        return self.latency
+
+    def _injected_error(self, method_key):
+        for i, (method, status, retry_after) in enumerate(self.scheduled_errors):
+            if method is None or method == method_key:
+                del self.scheduled_errors[i]
+                return FakeApiError(status, 'Injected error', retry_after)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return FakeApiError(self.error_status, 'Injected random error')
+        return None
+
+    def handle(self, uri, method, body, headers):
+        """
+        Processa uma requisição HTTP e devolve (httplib2.Response, conteúdo).
+
+        Um POST em /batch/... é uma requisição em lote do Drive: conta como uma
+        única chamada em `calls` e cada parte é contada em `batched_calls`.
+        """
+        parsed = urlparse(uri)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        path = unquote(parsed.path)
+        is_batch = path.startswith(_BATCH_PREFIX) and method == 'POST'
+        if is_batch:
+            method_key = 'drive.batch'
+        else:
+            method_key, handler, args = self._route(method, path)
+
+        delay = self._latency_for(method_key)
+        if delay:
+            time.sleep(delay)
+
+        with self.lock:
+            self.calls[method_key] += 1
+            error = self._injected_error(method_key)
+            if error:
+                status, content, response_headers = self._error_response(error)
+            elif is_batch:
+                status, content, response_headers = self._batch(body, headers)
+            else:
+                query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                status, content, response_headers = self._dispatch(handler, args, body, query)
+            self.bytes_sent += len(body or b'') + len(uri)
+            self.bytes_received += len(content)
+            self.request_log.append({
+                'method': method_key,
+                'http_method': method,
+                'status': status,
+                'request_bytes': len(body or b''),
+                'response_bytes': len(content),
+            })
+
+        response = httplib2.Response({'status': status, **response_headers})
+        response.reason = 'OK' if status == 200 else 'Error'
+        return response, content
+
+    @staticmethod
+    def _error_response(error):
+        content = json.dumps({'error': {'code': error.status, 'message': error.message}}).encode('utf-8')
+        headers = {'content-type': 'application/json'}
+        if error.retry_after is not None:
+            headers['retry-after'] = str(error.retry_after)
+        return error.status, content, headers
+
+    def _dispatch(self, handler, args, body, query):
+        try:
+            result = handler(*args, json.loads(body) if body else {}, query)
+        except FakeApiError as e:
+            return self._error_response(e)
+        if 'fields' in query:
+            result = _project(result, _parse_fields(query['fields']))
+        return 200, json.dumps(result).encode('utf-8'), {'content-type': 'application/json'}
+
+    def _batch(self, body, headers):
+        """
+        Executa as partes de um multipart/mixed e monta a resposta no mesmo formato.
+        """
+        content_type = {key.lower(): value for key, value in headers.items()}.get('content-type', '')
+        message = Parser().parsestr(f"Content-Type: {content_type}\r\n\r\n" + body.decode('utf-8'))
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in message.get_payload():
+            request_line, rest = part.get_payload().split('\n', 1)
+            http_method, target, _ = request_line.split(' ', 2)
+            inner_body = Parser().parsestr(rest).get_payload().encode('utf-8') or None
+            parsed = urlparse(target)
+            method_key, handler, args = self._route(http_method, unquote(parsed.path))
+            self.batched_calls[method_key] += 1
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            error = self._injected_error(method_key)
+            if error:
+                status, content, _ = self._error_response(error)
+            else:
+                status, content, _ = self._dispatch(handler, args, inner_body, query)
+            content_id = part['Content-ID'].replace('<', '<response-', 1)
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: {content_id}\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json\r\n\r\n{content.decode('utf-8')}\r\n"
+            )
+        content = (''.join(parts) + f"--{boundary}--\r\n").encode('utf-8')
+        return 200, content, {'content-type': f'multipart/mixed; boundary={boundary}'}
+
+    def _route(self, method, path):
+        if path.startswith(_FORMS_PREFIX):
+            rest = path[len(_FORMS_PREFIX):].strip('/')
+            if not rest and method == 'POST':
+                return 'forms.create', self._forms_create, ()
+            if rest.endswith(':batchUpdate') and method == 'POST':
+                return 'forms.batchUpdate', self._forms_batch_update, (rest[:-len(':batchUpdate')],)
+            match = re.fullmatch(r'([^/]+)/responses', rest)
+            if match and method == 'GET':
+                return 'forms.responses.list', self._responses_list, (match.group(1),)
+            if '/' not in rest and method == 'GET':
+                return 'forms.get', self._forms_get, (rest,)
+        elif path.startswith(_DRIVE_PREFIX):
+            rest = path[len(_DRIVE_PREFIX):].strip('/')
+            if not rest:
+                if method == 'GET':
+                    return 'drive.files.list', self._files_list, ()
+                if method == 'POST':
+                    return 'drive.files.create', self._files_create, ()
+            elif rest.endswith('/copy') and method == 'POST':
+                return 'drive.files.copy', self._files_copy, (rest[:-len('/copy')],)
+            elif '/' not in rest:
+                if method == 'GET':
+                    return 'drive.files.get', self._files_get, (rest,)
+                if method == 'PATCH':
+                    return 'drive.files.update', self._files_update, (rest,)
+
+        def not_found(*args):
+            raise FakeApiError(404, f'Unsupported fake endpoint: {method} {path}')
+        return 'unknown', not_found, ()
+
+    # ------------------------------------------------------------------
+    # Forms API
+    # ------------------------------------------------------------------
+
+    def _next_revision(self):
+        self._revision += 1
+        return f"rev{self._revision:08d}"
+
+    def _form(self, form_id):
+        form = self.forms.get(form_id)
+        if form is None:
+            raise FakeApiError(404, f'Requested entity was not found: {form_id}')
+        return form
+
+    @staticmethod
+    def _public_form(form):
+        return {key: copy.deepcopy(value) for key, value in form.items() if not key.startswith('_')}
+
+    def _forms_create(self, payload, query):
+        form_id = _new_id('form')
+        title = payload.get('info', {}).get('title', 'Untitled form')
+        form = {
+            'formId': form_id,
+            'info': {'title': title, 'documentTitle': title},
+            'settings': {},
+            'revisionId': self._next_revision(),
+            'responderUri': f"https://docs.google.com/forms/d/e/{form_id}/viewform",
+            'items': []
+        }
+        self.forms[form_id] = form
+        self.files[form_id] = {
+            'id': form_id, 'name': title, 'mimeType': FORM_MIME_TYPE,
+            'parents': ['root'], 'trashed': False, 'modifiedTime': _now()
+        }
+        return self._public_form(form)
+
+    def _forms_get(self, form_id, payload, query):
+        return self._public_form(self._form(form_id))
+
+    def _forms_batch_update(self, form_id, payload, query):
+        form = self._form(form_id)
+        required = payload.get('writeControl', {}).get('requiredRevisionId')
+        if required and required != form['revisionId']:
+            raise FakeApiError(400, 'The revision ID does not match the latest revision')
+
+        # Lotes são atômicos: tudo é aplicado numa cópia e só então publicado
+        draft = copy.deepcopy(form)
+        replies = [self._apply_request(draft, request) for request in payload.get('requests', [])]
+        if payload.get('requests'):
+            draft['revisionId'] = self._next_revision()
+        self.forms[form_id] = draft
+
+        response = {
+            'replies': replies,
+            'writeControl': {'requiredRevisionId': draft['revisionId']}
+        }
+        if payload.get('includeFormInResponse'):
+            response['form'] = self._public_form(draft)
+        return response
+
+    def _check_index(self, form, index, allow_end=False):
+        limit = len(form['items']) + (1 if allow_end else 0)
+        if not isinstance(index, int) or not 0 <= index < limit:
+            raise FakeApiError(400, f'Invalid location index: {index}')
+
+    def _validate_item(self, form, item):
+        question = item.get('questionItem', {}).get('question')
+        if not question:
+            return
+        if 'grading' in question and not form['settings'].get('quizSettings', {}).get('isQuiz'):
+            raise FakeApiError(400, 'Grading can only be set on quiz forms')
+        options = question.get('choiceQuestion', {}).get('options')
+        if options is not None:
+            values = [option.get('value') for option in options]
+            if len(set(values)) != len(values):
+                raise FakeApiError(400, 'Duplicate option values')
+            for answer in question.get('grading', {}).get('correctAnswers', {}).get('answers', []):
+                if answer.get('value') not in values:
+                    raise FakeApiError(400, 'Correct answer is not one of the options')
+
+    def _apply_request(self, form, request):
+        kind, body = next(iter(request.items()))
+        if kind == 'updateFormInfo':
+            for path in body['updateMask'].split(','):
+                _set_path(form['info'], path.strip(), _get_path(body['info'], path.strip()))
+            return {}
+        if kind == 'updateSettings':
+            for path in body['updateMask'].split(','):
+                _set_path(form['settings'], path.strip(), _get_path(body['settings'], path.strip()))
+            return {}
+        if kind == 'createItem':
+            index = body['location']['index']
+            self._check_index(form, index, allow_end=True)
+            item = copy.deepcopy(body['item'])
+            self._validate_item(form, item)
+            item['itemId'] = _new_id('item')
+            reply = {'itemId': item['itemId']}
+            question = item.get('questionItem', {}).get('question')
+            if question is not None:
+                question['questionId'] = _new_id('q')
+                reply['questionId'] = [question['questionId']]
+            form['items'].insert(index, item)
+            return {'createItem': reply}
+        if kind == 'deleteItem':
+            index = body['location']['index']
+            self._check_index(form, index)
+            form['items'].pop(index)
+            return {}
+        if kind == 'moveItem':
+            original = body['originalLocation']['index']
+            self._check_index(form, original)
+            item = form['items'].pop(original)
+            new_index = body['newLocation']['index']
+            self._check_index(form, new_index, allow_end=True)
+            form['items'].insert(new_index, item)
+            return {}
+        if kind == 'updateItem':
+            index = body['location']['index']
+            self._check_index(form, index)
+            if body.get('updateMask') != '*':
+                raise FakeApiError(400, 'The fake backend only supports updateMask "*"')
+            current = form['items'][index]
+            item = copy.deepcopy(body['item'])
+            self._validate_item(form, item)
+            item['itemId'] = current['itemId']
+            question = item.get('questionItem', {}).get('question')
+            if question is not None and 'questionId' not in question:
+                current_question = current.get('questionItem', {}).get('question', {})
+                question['questionId'] = current_question.get('questionId', _new_id('q'))
+            form['items'][index] = item
+            return {}
+        raise FakeApiError(400, f'Unsupported request: {kind}')
+
+    def _responses_list(self, form_id, payload, query):
+        responses = self._form(form_id).get('_responses', [])
+        match = re.fullmatch(r'\s*timestamp\s*(>=|>)\s*(\S+)\s*', query.get('filter', '')) if 'filter' in query else None
+        if match:
+            operator, value = match.groups()
+            if operator == '>':
+                responses = [r for r in responses if r['lastSubmittedTime'] > value]
+            else:
+                responses = [r for r in responses if r['lastSubmittedTime'] >= value]
+        start = int(query.get('pageToken', 0))
+        page_size = int(query.get('pageSize', 5000))
+        page = responses[start:start + page_size]
+        result = {'responses': copy.deepcopy(page)} if page else {}
+        if start + page_size < len(responses):
+            result['nextPageToken'] = str(start + page_size)
+        return result
+
+    # ------------------------------------------------------------------
+    # Drive API
+    # ------------------------------------------------------------------
+
+    def _file(self, file_id):
+        if file_id not in self.files:
+            raise FakeApiError(404, f'File not found: {file_id}')
+        return self.files[file_id]
+
+    @staticmethod
+    def _matches(file, clause):
+        clause = clause.strip()
+        match = re.fullmatch(r"(name|mimeType)\s*=\s*'(.*)'", clause)
+        if match:
+            return file.get(match.group(1)) == match.group(2).replace("\\'", "'")
+        match = re.fullmatch(r"'([^']*)'\s+in\s+parents|parents\s+in\s+'([^']*)'", clause)
+        if match:
+            return (match.group(1) or match.group(2)) in file.get('parents', [])
+        match = re.fullmatch(r"trashed\s*=\s*(true|false)", clause)
+        if match:
+            return file.get('trashed', False) == (match.group(1) == 'true')
+        raise FakeApiError(400, f'Unsupported query clause: {clause}')
+
+    def _files_list(self, payload, query):
+        clauses = [c for c in re.split(r'\s+and\s+', query.get('q', '')) if c.strip()]
+        files = [f for f in self.files.values() if all(self._matches(f, c) for c in clauses)]
+        start = int(query.get('pageToken', 0))
+        page_size = int(query.get('pageSize', 100))
+        result = {'files': copy.deepcopy(files[start:start + page_size])}
+        if start + page_size < len(files):
+            result['nextPageToken'] = str(start + page_size)
+        return result
+
+    def _files_get(self, file_id, payload, query):
+        return copy.deepcopy(self._file(file_id))
+
+    def _files_create(self, payload, query):
+        file_id = _new_id('file')
+        self.files[file_id] = {
+            'id': file_id,
+            'name': payload.get('name', 'Untitled'),
+            'mimeType': payload.get('mimeType', 'application/octet-stream'),
+            'parents': payload.get('parents', ['root']),
+            'trashed': False,
+            'modifiedTime': _now()
+        }
+        return copy.deepcopy(self.files[file_id])
+
+    def _files_update(self, file_id, payload, query):
+        file = self._file(file_id)
+        for parent in filter(None, query.get('addParents', '').split(',')):
+            self._file(parent)
+        for key in ('name', 'trashed'):
+            if key in payload:
+                file[key] = payload[key]
+        parents = [p for p in file.get('parents', []) if p not in query.get('removeParents', '').split(',')]
+        for parent in filter(None, query.get('addParents', '').split(',')):
+            if parent not in parents:
+                parents.append(parent)
+        file['parents'] = parents
+        file['modifiedTime'] = _now()
+        return copy.deepcopy(file)
+
+    def _files_copy(self, file_id, payload, query):
+        source = self._file(file_id)
+        new_id = _new_id('form' if source['mimeType'] == FORM_MIME_TYPE else 'file')
+        self.files[new_id] = {
+            **copy.deepcopy(source),
+            'id': new_id,
+            'name': payload.get('name', f"Cópia de {source['name']}"),
+            'parents': payload.get('parents', source.get('parents', ['root'])),
+            'trashed': False,
+            'modifiedTime': _now()
+        }
+        if file_id in self.forms:
+            form = copy.deepcopy(self.forms[file_id])
+            form.pop('_responses', None)
+            form['formId'] = new_id
+            form['revisionId'] = self._next_revision()
+            self.forms[new_id] = form
+        return copy.deepcopy(self.files[new_id])
@@ -0,0 +1,259 @@
+"""
+Construção das Requisições do Google Forms
+Monta, sem nenhuma chamada de rede, os corpos de requisição usados pelo gerador.
+Cada item recebe o índice calculado localmente, o que permite enviar o
+formulário inteiro em poucos `batchUpdate`.
+"""
+
+import copy
+
+# Questões de avaliação usadas quando o JSON habilita a avaliação sem defini-las
+DEFAULT_EVALUATION_QUESTIONS = [
+    {
+        "question": "Como você avalia a dificuldade deste quiz?",
+        "options": ["Muito fácil", "Fácil", "Médio", "Difícil", "Muito difícil"]
+    },
+    {
+        "question": "O que você achou das questões?",
+        "options": ["Muito interessantes", "Interessantes", "Normais", "Chatas", "Muito chatas"]
+    },
+    {
+        "question": "Você recomendaria este quiz para seus colegas?",
+        "options": ["Sim, com certeza", "Sim", "Talvez", "Não", "Definitivamente não"]
+    }
+]
+
+
+def join_text(value, separator):
+    """
+    Converte um campo que pode ser string ou array de strings em texto.
+
+    Args:
+        value (str or list): Valor do JSON
+        separator (str): Separador usado quando o valor é um array
+
+    Returns:
+        str: Texto pronto para a API
+    """
+    if isinstance(value, list):
+        return separator.join(value)
+    return value
+
+
+def build_form_info_requests(config):
+    """
+    Requisições que definem título, descrição e ativam o modo Quiz.
+
+    Args:
+        config (dict): Configuração do quiz
+
+    Returns:
+        list: Requisições `updateFormInfo` e `updateSettings`
+    """
+    return [{
+        "updateFormInfo": {
+            "info": {
+                "title": config['metadata']['title'],
+                "description": join_text(config['metadata']['description'], "\n")
+            },
+            "updateMask": "title,description"
+        }
+    }, {
+        "updateSettings": {
+            "settings": {
+                "quizSettings": {
+                    "isQuiz": True
+                }
+            },
+            "updateMask": "quizSettings.isQuiz"
+        }
+    }]
+
+
+def build_instructions_item(config):
+    """
+    Item de texto com as instruções do quiz.
+
+    Returns:
+        dict or None: Item da API ou None se o JSON não tem instruções
+    """
+    instructions = config.get('content', {}).get('instructions', [])
+    if not instructions:
+        return None
+    # Espaço ao invés de \n: o título de um item de texto não aceita quebras de linha
+    return {
+        "title": join_text(instructions, " "),
+        "textItem": {}
+    }
+
+
+def build_question_item(question_data, with_grading=True):
+    """
+    Item de múltipla escolha de uma questão do JSON.
+
+    Args:
+        question_data (dict): Questão do JSON
+        with_grading (bool): Se inclui a resposta correta (modo Quiz)
+
+    Returns:
+        dict: Item da API
+    """
+    question = {
+        "required": True,
+        "choiceQuestion": {
+            "type": "RADIO",
+            "options": [{"value": opcao} for opcao in question_data['options']],
+            "shuffle": False
+        }
+    }
+    if with_grading:
+        question["grading"] = {
+            "pointValue": 1,
+            "correctAnswers": {
+                "answers": [{"value": question_data['options'][question_data['correct_answer']]}]
+            }
+        }
+    return {
+        "title": f"{question_data['id']}: {question_data['question']}",
+        "description": f"Seção: {question_data['section']}",
+        "questionItem": {
+            "question": question
+        }
+    }
+
+
+def get_evaluation_questions(config):
+    """
+    Questões de avaliação do quiz (lista vazia se a avaliação está desabilitada).
+    """
+    evaluation = config.get('evaluation', {})
+    if not evaluation.get('include_evaluation', False):
+        return []
+    return evaluation.get('evaluation_questions', DEFAULT_EVALUATION_QUESTIONS)
+
+
+def build_evaluation_item(position, eval_q):
+    """
+    Item de múltipla escolha de uma questão de avaliação.
+
+    Args:
+        position (int): Número da avaliação (1-based)
+        eval_q (dict): Questão de avaliação com 'question' e 'options'
+
+    Returns:
+        dict: Item da API
+    """
+    return {
+        "title": f"Avaliação {position}: {eval_q['question']}",
+        "questionItem": {
+            "question": {
+                "choiceQuestion": {
+                    "type": "RADIO",
+                    "options": [{"value": opcao} for opcao in eval_q['options']]
+                }
+            }
+        }
+    }
+
+
+def build_settings_request(config):
+    """
+    Requisição `updateSettings` derivada do bloco `settings` do JSON.
+
+    Returns:
+        dict or None: Requisição ou None se não há configuração a aplicar
+    """
+    form_settings = config.get('settings', {})
+    if not form_settings:
+        return None
+
+    # Se require_login for True, automaticamente ativar collect_email
+    collect_email = form_settings.get('collect_email', False)
+    if form_settings.get('require_login', False):
+        collect_email = True
+
+    return {
+        "updateSettings": {
+            "settings": {"collectEmail": collect_email},
+            "updateMask": "collectEmail"
+        }
+    }
+
+
+def create_item_request(item, index):
+    """
+    Envolve um item em uma requisição `createItem` na posição indicada.
+    """
+    return {
+        "createItem": {
+            "item": item,
+            "location": {"index": index}
+        }
+    }
+
+
+def build_item_plan(config, start_index=0):
+    """
+    Lista ordenada de todos os itens do formulário com índices locais.
+
+    Cada entrada contém:
+        - 'kind': sempre 'item' (mesmo formato usado pelo executor do gerador)
+        - 'label': descrição curta para as mensagens de progresso
+        - 'request': requisição `createItem` completa
+        - 'fallback': requisição alternativa (questão sem grading) ou None
+
+    Args:
+        config (dict): Configuração do quiz
+        start_index (int): Índice do primeiro item a ser criado
+
+    Returns:
+        list: Entradas do plano, na ordem em que devem ser enviadas
+    """
+    entries = []
+    index = start_index
+
+    instructions_item = build_instructions_item(config)
+    if instructions_item:
+        entries.append({
+            'kind': 'item',
+            'label': "Instruções",
+            'request': create_item_request(instructions_item, index),
+            'fallback': None
+        })
+        index += 1
+
+    for i, question_data in enumerate(config['questions']):
+        entries.append({
+            'kind': 'item',
+            'label': f"Questão {i+1}",
+            'request': create_item_request(build_question_item(question_data), index),
+            'fallback': create_item_request(build_question_item(question_data, with_grading=False), index)
+        })
+        index += 1
+
+    for i, eval_q in enumerate(get_evaluation_questions(config)):
+        entries.append({
+            'kind': 'item',
+            'label': f"Avaliação {i+1}",
+            'request': create_item_request(build_evaluation_item(i + 1, eval_q), index),
+            'fallback': None
+        })
+        index += 1
+
+    return entries
+
+
+def with_index(request, index):
+    """
+    Cópia de uma requisição `createItem` apontando para outro índice.
+    """
+    adjusted = copy.deepcopy(request)
+    adjusted['createItem']['location']['index'] = index
+    return adjusted
+
+
+def chunk_requests(requests, max_size):
+    """
+    Divide uma lista de requisições em lotes de no máximo `max_size`.
+    """
+    return [requests[i:i + max_size] for i in range(0, len(requests), max_size)]
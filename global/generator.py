@@ -5,75 +5,249 @@ Sistema universal para gerar formulários educacionais a partir de arquivos JSON
 
 import sys
 import os
-import json
 
 # Adicionar pasta global ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'global'))
 
-from config import get_authenticated_service, get_drive_service
+from config import get_authenticated_service, FORMS_BATCH_MAX_REQUESTS, GOOGLE_DRIVE_FOLDER_NAME
+from drive_folder import place_new_form
+from form_requests import chunk_requests, get_evaluation_questions, with_index
+from manifest import compute_quiz_hash, fetch_revision_id, find_unchanged_entry, record_publish
+from publish_journal import finish_journal, item_delta, load_journal, record_progress, start_journal
+from publish_plan import build_publish_entries
+from ratelimit import is_retryable
+from sync import SyncDiffError, sync_form
+from tracing import span
+from validation import load_quiz, validate_quiz_data
 
 
 def validar_json_schema(data):
     """
     Valida se o JSON está no formato correto.
+    Usa o `schema.json` mais as regras do projeto, como o `validate.py` (ver `validation.py`).
     """
-    required_fields = ['metadata', 'content', 'questions']
-    for field in required_fields:
-        if field not in data:
-            raise ValueError(f"Campo obrigatório '{field}' não encontrado no JSON")
-    
-    # Validar metadata
-    metadata_required = ['title', 'description', 'subject', 'grade', 'topic']
-    for field in metadata_required:
-        if field not in data['metadata']:
-            raise ValueError(f"Campo obrigatório 'metadata.{field}' não encontrado")
-    
-    # Validar questões
-    if not isinstance(data['questions'], list) or len(data['questions']) == 0:
-        raise ValueError("O campo 'questions' deve ser uma lista não vazia")
-    
-    for i, question in enumerate(data['questions']):
-        required_q_fields = ['id', 'section', 'question', 'options', 'correct_answer']
-        for field in required_q_fields:
-            if field not in question:
-                raise ValueError(f"Campo obrigatório '{field}' não encontrado na questão {i+1}")
-    
+    errors = validate_quiz_data(data)
+    if errors:
+        raise ValueError("; ".join(errors))
     return True
 
 
 def carregar_configuracao_quiz(caminho_json):
     """
     Carrega e valida a configuração do quiz a partir do arquivo JSON.
+
+    O resultado fica em cache por arquivo: se o `form.py` já validou o
+    mesmo arquivo, ele não é lido nem validado de novo.
     """
-    try:
-        with open(caminho_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        validar_json_schema(data)
-        print(f"✅ Configuração carregada: {data['metadata']['title']}")
-        return data
-    
-    except FileNotFoundError:
-        print(f"❌ Arquivo JSON não encontrado: {caminho_json}")
+    data, errors = load_quiz(caminho_json)
+    if data is None:
+        print(f"❌ Erro ao carregar JSON: {errors[0]}")
         return None
-    except json.JSONDecodeError as e:
-        print(f"❌ Erro ao decodificar JSON: {e}")
+    if errors:
+        print(f"❌ Erro de validação: {'; '.join(errors)}")
         return None
-    except ValueError as e:
-        print(f"❌ Erro de validação: {e}")
+
+    print(f"✅ Configuração carregada: {data['metadata']['title']}")
+    return data
+
+
+def _revisao(resposta):
+    """
+    Revisão do formulário depois de um batchUpdate (devolvida na própria resposta).
+    """
+    return resposta.get('writeControl', {}).get('requiredRevisionId')
+
+
+def _lote_aplicado(service, form_id, diario, variacao):
+    """
+    Confere se um lote cuja resposta se perdeu (ou cuja repetição foi
+    recusada pela revisão) foi aplicado, comparando o número de itens do
+    formulário com o registrado no diário.
+
+    Lotes que não mudam o número de itens não podem ser conferidos assim e
+    são tratados como não aplicados.
+
+    Returns:
+        str or None: Revisão atual do formulário se o lote foi aplicado
+    """
+    if not diario or not variacao:
+        return None
+    try:
+        form = service.forms().get(formId=form_id, fields='revisionId,items(itemId)').execute()
+    except Exception:
         return None
+    if len(form.get('items', [])) != diario['remote_items'] + variacao:
+        return None
+    return form.get('revisionId') or ''
+
+
+
+def executar_requisicoes(service, form_id, entradas, em_lote=True, diario=None, revisao=None):
+    """
+    Envia as requisições do formulário, em lote sempre que possível.
+
+    Cada entrada é um dict com 'kind' ('setup', 'item' ou 'settings'),
+    'label', 'request' e 'fallback'. No modo em lote as entradas seguem em
+    poucos `batchUpdate` (cada um é atômico na API). Se um lote for rejeitado,
+    as entradas restantes são enviadas uma a uma, usando o fallback sem
+    grading para as questões recusadas e recalculando os índices localmente.
+
+    Com um diário (`publish_journal.py`), cada lote ou requisição confirmada
+    é registrada, e as entradas que o diário já marca como aplicadas são
+    puladas.
+
+    Cada lote exige a revisão deixada pelo anterior (`writeControl`), o que o
+    torna idempotente: a camada de retentativas pode repeti-lo em 5xx e erros
+    de rede, e se a primeira tentativa tinha sido aplicada a repetição é
+    recusada pela revisão em vez de duplicar os itens. Nesse caso, ou quando
+    a revisão não é conhecida e o lote não pôde ser repetido, o número de
+    itens do formulário indica se ele foi aplicado. Erros temporários que
+    não se resolvem assim interrompem o envio e mantêm o diário para a
+    próxima execução, que confere o formulário antes de retomar.
+
+    Args:
+        service: Serviço autenticado do Google Forms
+        form_id (str): ID do formulário
+        entradas (list): Entradas na ordem de envio
+        em_lote (bool): Se False, envia diretamente uma requisição por vez
+        diario (dict): Diário da publicação (opcional)
+        revisao (str): Revisão atual do formulário, exigida pelo primeiro lote
+
+    Returns:
+        dict: 'calls' (chamadas batchUpdate realizadas), 'skipped' (entradas
+            recusadas pela API mesmo no fallback: o formulário ficou incompleto)
+            e 'revision_id' (revisão devolvida pelo último batchUpdate, ou
+            None se ela não é conhecida)
+    """
+    chamadas = 0
+    aplicadas = diario['applied'] if diario else 0
+
+    def registrar(quantidade, variacao=0, ignorado=False):
+        if diario:
+            record_progress(diario, quantidade, variacao, ignorado)
 
+    if em_lote:
+        try:
+            for lote in chunk_requests(entradas[aplicadas:], FORMS_BATCH_MAX_REQUESTS):
+                variacao = sum(item_delta(entrada['request']) for entrada in lote)
+                corpo = {"requests": [entrada['request'] for entrada in lote]}
+                if revisao:
+                    corpo["writeControl"] = {"requiredRevisionId": revisao}
+                with span('batch', requests=len(lote)):
+                    try:
+                        resposta = service.forms().batchUpdate(formId=form_id, body=corpo).execute()
+                        revisao = _revisao(resposta)
+                    except Exception as e:
+                        # Resposta perdida de um lote sem revisão (não repetido) ou
+                        # repetição recusada pela revisão: conferir no formulário
+                        conferir = is_retryable(e) or 'writeControl' in corpo
+                        revisao_atual = _lote_aplicado(service, form_id, diario, variacao) if conferir else None
+                        if revisao_atual is None:
+                            raise
+                        print("   ♻️ Resposta do lote perdida, mas o formulário confirma que ele foi aplicado")
+                        revisao = revisao_atual or None
+                chamadas += 1
+                aplicadas += len(lote)
+                registrar(len(lote), variacao)
+                print(f"   ✅ Lote com {len(lote)} requisições aplicado")
+            return {'calls': chamadas, 'skipped': diario['skipped_items'] if diario else 0,
+                    'revision_id': revisao}
+        except Exception as e:
+            chamadas += 1
+            if is_retryable(e):
+                raise
+            print(f"   ⚠️ Lote rejeitado pela API: {e}")
+            print("   🔁 Enviando as requisições restantes individualmente...")
 
-def criar_formulario_do_json(caminho_json):
+    # Itens que não puderam ser criados deslocam os índices dos seguintes
+    itens_ignorados = diario['skipped_items'] if diario else 0
+    outras_ignoradas = 0
+    for entrada in entradas[aplicadas:]:
+        request = entrada['request']
+        fallback = entrada['fallback']
+        if entrada['kind'] == 'item' and itens_ignorados:
+            index = request['createItem']['location']['index'] - itens_ignorados
+            request = with_index(request, index)
+            if fallback:
+                fallback = with_index(fallback, index)
+
+        try:
+            resposta = service.forms().batchUpdate(formId=form_id, body={"requests": [request]}).execute()
+            revisao = _revisao(resposta)
+            chamadas += 1
+            registrar(1, item_delta(request))
+            if entrada['kind'] == 'item':
+                print(f"   ✅ {entrada['label']}: item criado!")
+            continue
+        except Exception as e:
+            chamadas += 1
+            if entrada['kind'] == 'setup' or is_retryable(e):
+                raise
+            print(f"   ⚠️ Erro em {entrada['label']}: {e}")
+
+        if fallback:
+            try:
+                resposta = service.forms().batchUpdate(formId=form_id, body={"requests": [fallback]}).execute()
+                revisao = _revisao(resposta)
+                chamadas += 1
+                registrar(1, item_delta(fallback))
+                print(f"   ✅ {entrada['label']}: item criado (sem grading)")
+                continue
+            except Exception as e:
+                chamadas += 1
+                if is_retryable(e):
+                    raise
+                print(f"   ⚠️ Fallback também falhou em {entrada['label']}: {e}")
+
+        if entrada['kind'] == 'item':
+            itens_ignorados += 1
+            registrar(1, ignorado=True)
+        else:
+            outras_ignoradas += 1
+            registrar(1)
+
+    return {'calls': chamadas, 'skipped': itens_ignorados + outras_ignoradas, 'revision_id': revisao}
+
+
+def criar_formulario_do_json(caminho_json, em_lote=True, forcar=False, verificar_remoto=True, recriar=False):
     """
     Cria ou atualiza um formulário do Google Forms baseado no arquivo JSON.
     Se um formulário com o mesmo nome já existir, ele será atualizado.
+
+    Os índices de todos os itens são calculados localmente, então
+    instruções, questões, avaliação e settings seguem juntos em poucos
+    `batchUpdate`. Com `em_lote=False` cada requisição é enviada
+    individualmente (comportamento antigo, útil para diagnosticar erros).
+
+    Se o hash do JSON for igual ao da última publicação registrada no
+    manifesto, nada é enviado. `verificar_remoto` confere antes se o
+    `revisionId` remoto não mudou (uma leitura); `forcar` ignora o manifesto.
+
+    Um formulário existente é sincronizado (só as diferenças, preservando os
+    IDs dos itens). Se a sincronização falhar, o formulário é relido e as
+    diferenças recalculadas; se falhar de novo, a publicação falha. Todos os
+    itens só são apagados e recriados com `recriar=True` ou quando as
+    diferenças não podem ser calculadas.
+
+    Cada fase (carga, verificação do manifesto, busca no Drive, autenticação,
+    criação, sincronização, itens, ...) é medida por um span (`tracing.py`)
+    dentro do span 'publish' do formulário.
+    """
+    nome = os.path.splitext(os.path.basename(caminho_json))[0]
+    with span('publish', form=nome):
+        return _publicar(caminho_json, em_lote, forcar, verificar_remoto, recriar)
+
+
+def _publicar(caminho_json, em_lote, forcar, verificar_remoto, recriar):
+    """
+    Corpo de `criar_formulario_do_json`.
     """
     try:
         print("🚀 Iniciando criação/atualização de formulário baseado em JSON...")
         
         # 1. Carregar configuração
-        config = carregar_configuracao_quiz(caminho_json)
+        with span('load'):
+            config = carregar_configuracao_quiz(caminho_json)
         if not config:
             return None
         
@@ -84,84 +258,135 @@ def criar_formulario_do_json(caminho_json):
         print(f"📄 Nome do formulário: {form_name}")
         print(f"📋 Título: {config['metadata']['title']}")
         
+        # Pular a publicação se o JSON não mudou desde a última publicação
+        quiz_hash = compute_quiz_hash(config)
+        if not forcar:
+            try:
+                with span('manifest_check'):
+                    entry = find_unchanged_entry(
+                        form_name, quiz_hash,
+                        get_service=get_authenticated_service if verificar_remoto else None
+                    )
+            except Exception as e:
+                print(f"⚠️ Não foi possível verificar a revisão remota: {e}")
+                entry = None
+            if entry:
+                print(f"⏭️ Sem alterações desde {entry['published_at']}. Publicação ignorada.")
+                return {
+                    'form_id': entry['form_id'],
+                    'edit_url': f"https://docs.google.com/forms/d/{entry['form_id']}/edit",
+                    'public_url': f"https://docs.google.com/forms/d/{entry['form_id']}/viewform",
+                    'total_questions': entry['total_questions'],
+                    'sections': entry['sections'],
+                    'config': config,
+                    'skipped': True
+                }
+        
         # 3. Verificar se já existe um formulário com esse nome
-        from config import find_existing_form_by_name, update_form_title, get_drive_service
+        from config import find_existing_form_by_name
         
-        existing_form_id = find_existing_form_by_name(form_name)
+        with span('drive_lookup'):
+            existing_form_id = find_existing_form_by_name(form_name)
+        
+        # Requisições que precisam rodar antes da criação dos itens
+        requisicoes_iniciais = []
+        sincronizado = False
+        ignoradas = 0
+        revision_id = None
+        revisao_atual = None  # exigida pelo primeiro lote de itens
+        diario = None
         
         if existing_form_id:
             print("🔄 Formulário existente encontrado! Preparando para atualização...")
             
-            # Atualizar formulário existente
+            # Atualizar formulário existente (o nome no Drive já é o do JSON,
+            # e o título é definido pela própria sincronização)
             form_id = existing_form_id
             
-            # Atualizar título no Drive e no Forms
-            update_form_title(form_id, form_name)
-            
-            # Limpar todas as questões existentes
-            print("🗑️ Removendo questões existentes...")
-            service = get_authenticated_service()
+            with span('auth'):
+                service = get_authenticated_service()
             if not service:
                 print("❌ Erro na autenticação!")
                 return None
             
-            # Obter formulário atual para ver itens existentes
-            form_info = service.forms().get(formId=form_id).execute()
-            
-            # Remover todos os itens existentes
-            if 'items' in form_info and len(form_info['items']) > 0:
-                delete_requests = []
-                for item in form_info['items']:
-                    delete_requests.append({
-                        "deleteItem": {
-                            "location": {"index": 0}  # Sempre remover o primeiro (a lista se reorganiza)
-                        }
-                    })
+            # Publicação anterior interrompida com este mesmo JSON: retomar
+            diario = load_journal(form_id, quiz_hash)
+            if diario:
+                with span('fetch_form'):
+                    form_remoto = service.forms().get(
+                        formId=form_id, fields='revisionId,items(itemId)'
+                    ).execute()
+                revisao_atual = form_remoto.get('revisionId')
+                if len(form_remoto.get('items', [])) == diario['remote_items']:
+                    print(f"⏯️ Retomando publicação interrompida: {diario['applied']}/"
+                          f"{diario['total']} requisições já confirmadas")
+                    requisicoes_iniciais = [
+                        {"deleteItem": {"location": {"index": 0}}}
+                        for _ in range(diario['initial_deletes'])
+                    ]
+                else:
+                    print("⚠️ O formulário mudou desde a publicação interrompida; "
+                          "o diário foi descartado")
+                    finish_journal(form_id)
+                    diario = None
+            
+            if not diario:
+                # Obter formulário atual uma única vez
+                with span('fetch_form'):
+                    form_info = service.forms().get(formId=form_id).execute()
+            
+                # Enviar apenas as diferenças entre o formulário e o JSON
+                resumo_sync = None
+                erro_sync = None
+                if not recriar:
+                    try:
+                        with span('sync'):
+                            resumo_sync = sync_form(service, form_id, config, form=form_info)
+                    except SyncDiffError as e:
+                        erro_sync = e
+                    except Exception as e:
+                        # Um lote aplicado cuja resposta se perdeu (a retentativa é recusada
+                        # pela revisão) ou uma edição simultânea: reler o formulário e
+                        # recalcular as diferenças, que ficam vazias se tudo já foi aplicado
+                        print(f"⚠️ Sincronização incremental falhou: {e}")
+                        print("🔁 Relendo o formulário e recalculando as diferenças...")
+                        try:
+                            with span('sync'):
+                                resumo_sync = sync_form(service, form_id, config)
+                        except SyncDiffError as e2:
+                            erro_sync = e2
                 
-                # Executar remoções em lotes
-                if delete_requests:
-                    service.forms().batchUpdate(formId=form_id, body={
-                        "requests": delete_requests
-                    }).execute()
-            
-            # Atualizar descrição e ATIVAR MODO QUIZ
-            print("📝 Atualizando descrição e ativando modo Quiz...")
-            
-            # Processar description (pode ser string ou array)
-            description = config['metadata']['description']
-            if isinstance(description, list):
-                description_text = "\n".join(description)
-            else:
-                description_text = description
-            
-            service.forms().batchUpdate(formId=form_id, body={
-                "requests": [{
-                    "updateFormInfo": {
-                        "info": {
-                            "title": config['metadata']['title'],
-                            "description": description_text
-                        },
-                        "updateMask": "title,description"
-                    }
-                }, {
-                    "updateSettings": {
-                        "settings": {
-                            "quizSettings": {
-                                "isQuiz": True
+                if resumo_sync:
+                    sincronizado = True
+                    revision_id = resumo_sync['revision_id']
+                    print(f"✅ Sincronização incremental: {resumo_sync['requests']} requisições "
+                          f"em {resumo_sync['calls']} chamada(s)")
+                else:
+                    # Recriar apaga os itens e seus IDs (a ligação com as respostas
+                    # já coletadas): só a pedido ou quando não há como comparar
+                    if erro_sync:
+                        print(f"⚠️ {erro_sync}")
+                    print("🔁 Recriando todos os itens do formulário...")
+                    form_info = service.forms().get(formId=form_id).execute()
+                    revisao_atual = form_info.get('revisionId')
+                
+                    # Remover todos os itens existentes no mesmo lote da recriação
+                    existing_items = form_info.get('items', [])
+                    if existing_items:
+                        print(f"🗑️ Removendo {len(existing_items)} questões existentes...")
+                    for _ in existing_items:
+                        requisicoes_iniciais.append({
+                            "deleteItem": {
+                                "location": {"index": 0}  # Sempre remover o primeiro (a lista se reorganiza)
                             }
-                        },
-                        "updateMask": "quizSettings.isQuiz"
-                    }
-                }]
-            }).execute()
-            
-            print("✅ Formulário existente atualizado com nova configuração!")
+                        })
             
         else:
             print("📋 Criando novo formulário...")
             
             # 4. Obter serviço autenticado
-            service = get_authenticated_service()
+            with span('auth'):
+                service = get_authenticated_service()
             if not service:
                 print("❌ Erro na autenticação!")
                 return None
@@ -169,278 +394,86 @@ def criar_formulario_do_json(caminho_json):
             print("✅ Autenticado com sucesso!")
             
             # 5. Criar formulário básico (apenas título)
-            form_result = service.forms().create(body={
-                "info": {
-                    "title": config['metadata']['title']
-                }
-            }).execute()
+            with span('create_form'):
+                form_result = service.forms().create(body={
+                    "info": {
+                        "title": config['metadata']['title']
+                    }
+                }).execute()
             
             form_id = form_result.get('formId')
+            revisao_atual = form_result.get('revisionId')
             print(f"✅ Formulário criado! ID: {form_id}")
             
-            # 6. Adicionar descrição e ATIVAR MODO QUIZ
-            print("📝 Adicionando descrição e ativando modo Quiz...")
-            
-            # Processar description (pode ser string ou array)
-            description = config['metadata']['description']
-            if isinstance(description, list):
-                description_text = "\n".join(description)
-            else:
-                description_text = description
-            
-            service.forms().batchUpdate(formId=form_id, body={
-                "requests": [{
-                    "updateFormInfo": {
-                        "info": {
-                            "title": config['metadata']['title'],
-                            "description": description_text
-                        },
-                        "updateMask": "title,description"
-                    }
-                }, {
-                    "updateSettings": {
-                        "settings": {
-                            "quizSettings": {
-                                "isQuiz": True
-                            }
-                        },
-                        "updateMask": "quizSettings.isQuiz"
-                    }
-                }]
-            }).execute()
-            
-            # 7. Definir nome do arquivo no Google Drive
-            drive_service = get_drive_service()
-            if drive_service:
-                drive_service.files().update(
-                    fileId=form_id,
-                    body={'name': form_name}
-                ).execute()
+            # 6. Definir nome e pasta do arquivo no Google Drive numa única chamada
+            with span('drive_move'):
+                colocado = place_new_form(form_id, form_name)
+            if colocado:
                 print(f"📝 Nome do arquivo definido: {form_name}")
-            
-            # 8. Remover item padrão que é criado automaticamente
-            print("🗑️ Removendo item padrão...")
-            try:
-                # Obter informações do formulário para ver os itens
-                form_info = service.forms().get(formId=form_id).execute()
-                if 'items' in form_info and len(form_info['items']) > 0:
-                    # Remover o primeiro item padrão
-                    first_item_id = form_info['items'][0]['itemId']
-                    service.forms().batchUpdate(formId=form_id, body={
-                        "requests": [{
-                            "deleteItem": {
-                                "location": {"index": 0}
-                            }
-                        }]
-                    }).execute()
-            except Exception as e:
-                print(f"⚠️ Não foi possível remover item padrão: {e}")
-        
-        # 8. Adicionar seção de instruções
-        instructions = config.get('content', {}).get('instructions', [])
-        if instructions:
-            print("Adicionando seção de instruções...")
-            
-            # Converter array de instruções em texto formatado (sem quebras de linha)
-            if isinstance(instructions, list):
-                instructions_text = " ".join(instructions)  # Usar espaço ao invés de \n
+                print(f"📁 Formulário organizado na pasta '{GOOGLE_DRIVE_FOLDER_NAME}'")
             else:
-                instructions_text = instructions
-            
-            instructions_request = {
-                "createItem": {
-                    "item": {
-                        "title": instructions_text,
-                        "textItem": {}
-                    },
-                    "location": {"index": 0}
-                }
-            }
-            
-            try:
-                service.forms().batchUpdate(formId=form_id, body={"requests": [instructions_request]}).execute()
-                print("Instruções adicionadas!")
-            except Exception as e:
-                print(f"Erro ao adicionar instruções: {e}")
-        
-        # 9. Adicionar questões COM respostas corretas (modo Quiz simplificado)
-        print(f"📝 Adicionando {len(config['questions'])} questões em modo Quiz...")
-        
-        for i, question_data in enumerate(config['questions']):
-            print(f"   Questão {i+1}/{len(config['questions'])}...")
+                print("⚠️ Formulário criado mas não foi possível mover para a pasta")
             
-            # Preparar opções
-            options_clean = question_data['options'].copy()
-            correct_answer_index = question_data['correct_answer']
-            
-            # Obter o número atual de itens no formulário para calcular o índice correto
-            form_info = service.forms().get(formId=form_id).execute()
-            current_items_count = len(form_info.get('items', []))
-            
-            # Criar questão com configuração de Quiz diretamente
-            create_request = {
-                "createItem": {
-                    "item": {
-                        "title": f"{question_data['id']}: {question_data['question']}",
-                        "description": f"Seção: {question_data['section']}",
-                        "questionItem": {
-                            "question": {
-                                "required": True,
-                                "choiceQuestion": {
-                                    "type": "RADIO",
-                                    "options": [{"value": opcao} for opcao in options_clean],
-                                    "shuffle": False
-                                },
-                                "grading": {
-                                    "pointValue": 1,
-                                    "correctAnswers": {
-                                        "answers": [{"value": question_data['options'][correct_answer_index]}]
-                                    }
-                                }
-                            }
-                        }
-                    },
-                    "location": {"index": current_items_count}
-                }
-            }
-            
-            try:
-                service.forms().batchUpdate(formId=form_id, body={"requests": [create_request]}).execute()
-                print(f"   ✅ Questão {i+1} criada com resposta correta!")
-            except Exception as e:
-                print(f"   ⚠️ Erro na questão {i+1}: {e}")
-                # Fallback: criar sem grading
-                fallback_request = {
-                    "createItem": {
-                        "item": {
-                            "title": f"{question_data['id']}: {question_data['question']}",
-                            "description": f"Seção: {question_data['section']}",
-                            "questionItem": {
-                                "question": {
-                                    "required": True,
-                                    "choiceQuestion": {
-                                        "type": "RADIO",
-                                        "options": [{"value": opcao} for opcao in options_clean],
-                                        "shuffle": False
-                                    }
-                                }
-                            }
-                        },
-                        "location": {"index": i}
+            # 7. Remover item padrão, se a API tiver criado algum (a resposta já traz os itens)
+            for _ in form_result.get('items', []):
+                requisicoes_iniciais.append({
+                    "deleteItem": {
+                        "location": {"index": 0}
                     }
-                }
-                service.forms().batchUpdate(formId=form_id, body={"requests": [fallback_request]}).execute()
-                print(f"   ✅ Questão {i+1} criada (sem grading)")
+                })
         
-        print("✅ Todas as questões foram criadas!")
+        # URLs do formulário
+        edit_url = f"https://docs.google.com/forms/d/{form_id}/edit"
+        public_url = f"https://docs.google.com/forms/d/{form_id}/viewform"
         
-        # 6. Adicionar questões de avaliação (se habilitado)
-        if config.get('evaluation', {}).get('include_evaluation', False):
-            print("📊 Adicionando seção de avaliação...")
-            
-            eval_questions = config.get('evaluation', {}).get('evaluation_questions', [
-                {
-                    "question": "Como você avalia a dificuldade deste quiz?",
-                    "options": ["Muito fácil", "Fácil", "Médio", "Difícil", "Muito difícil"]
-                },
-                {
-                    "question": "O que você achou das questões?",
-                    "options": ["Muito interessantes", "Interessantes", "Normais", "Chatas", "Muito chatas"]
-                },
-                {
-                    "question": "Você recomendaria este quiz para seus colegas?",
-                    "options": ["Sim, com certeza", "Sim", "Talvez", "Não", "Definitivamente não"]
-                }
-            ])
-            
-            for i, eval_q in enumerate(eval_questions):
-                print(f"   Avaliação {i+1}/{len(eval_questions)}...")
-                
-                # Obter índice atual atualizado
-                form_info = service.forms().get(formId=form_id).execute()
-                current_items_count = len(form_info.get('items', []))
-                
-                request = {
-                    "createItem": {
-                        "item": {
-                            "title": f"Avaliação {i+1}: {eval_q['question']}",
-                            "questionItem": {
-                                "question": {
-                                    "choiceQuestion": {
-                                        "type": "RADIO",
-                                        "options": [{"value": opcao} for opcao in eval_q['options']]
-                                    }
-                                }
-                            }
-                        },
-                        "location": {"index": current_items_count}
-                    }
-                }
-                
-                service.forms().batchUpdate(formId=form_id, body={"requests": [request]}).execute()
+        # 8. Montar todas as requisições com índices calculados localmente
+        if not sincronizado:
+            print("📝 Definindo descrição e ativando modo Quiz...")
+            # Mesmas entradas do plano offline (`form.py --plan`)
+            entradas = build_publish_entries(config, requisicoes_iniciais)
+            if diario is None:
+                # Cada requisição confirmada fica registrada para uma eventual retomada
+                diario = start_journal(form_id, quiz_hash, len(entradas),
+                                       len(requisicoes_iniciais), len(requisicoes_iniciais))
+        
+            total_itens = sum(1 for entrada in entradas if entrada['kind'] == 'item')
+            print(f"📝 Enviando {total_itens} itens ({len(config['questions'])} questões) em modo Quiz...")
+            with span('items', requests=len(entradas), items=total_itens):
+                envio = executar_requisicoes(service, form_id, entradas, em_lote=em_lote,
+                                             diario=diario, revisao=revisao_atual)
+            finish_journal(form_id)
+            # A resposta do último lote já traz a revisão registrada no manifesto
+            revision_id = envio['revision_id']
+            ignoradas = envio['skipped']
+            if ignoradas:
+                print(f"⚠️ {ignoradas} requisição(ões) recusada(s) pela API; o formulário está incompleto "
+                      f"({envio['calls']} chamadas batchUpdate)")
+            else:
+                print(f"✅ Todas as questões foram criadas! ({envio['calls']} chamadas batchUpdate)")
         
-        # 7. Aplicar configurações de settings do JSON
+        # 9. Avisos sobre configurações de settings
         form_settings = config.get('settings', {})
         if form_settings:
-            print("⚙️ Aplicando configurações de settings...")
-            
-            settings_updates = {}
-            update_mask_parts = []
-            
-            # Configurar se deve coletar email e limitar respostas
             require_login = form_settings.get('require_login', False)
-            collect_email = form_settings.get('collect_email', False) 
             allow_multiple_responses = form_settings.get('allow_multiple_responses', True)
             
-            # Se require_login for True, automaticamente ativar collect_email
             if require_login:
-                collect_email = True
                 print("🔐 Login obrigatório ativado - coleta de email habilitada")
             
-            # Se allow_multiple_responses for False, limitar a uma resposta
-            if not allow_multiple_responses:
+            # Informar sobre limitações da API
+            if not allow_multiple_responses or require_login:
                 print("📊 Limitando a uma resposta por usuário")
-            
-            # Aplicar configurações
-            if collect_email is not None:
-                settings_updates["collectEmail"] = collect_email
-                update_mask_parts.append("collectEmail")
-            
-            # Aplicar as configurações se houver alguma
-            if settings_updates and update_mask_parts:
-                try:
-                    service.forms().batchUpdate(formId=form_id, body={
-                        "requests": [{
-                            "updateSettings": {
-                                "settings": settings_updates,
-                                "updateMask": ",".join(update_mask_parts)
-                            }
-                        }]
-                    }).execute()
-                    print("✅ Configurações de settings aplicadas!")
-                    
-                    # Informar sobre limitações da API
-                    if not allow_multiple_responses or require_login:
-                        print("📝 IMPORTANTE: Para garantir uma resposta por usuário, você precisa:")
-                        print("   1. Acessar o formulário no Google Forms")
-                        print("   2. Ir em Configurações (ícone de engrenagem)")
-                        print("   3. Marcar 'Limitar a uma resposta'")
-                        print("   4. Verificar se 'Coletar endereços de email' está ativado")
-                        print(f"   🔗 Acesse: {edit_url}")
-                    
-                except Exception as e:
-                    print(f"⚠️ Erro ao aplicar configurações de settings: {e}")
-            else:
-                print("📝 Nenhuma configuração de settings para aplicar")
+                print("📝 IMPORTANTE: Para garantir uma resposta por usuário, você precisa:")
+                print("   1. Acessar o formulário no Google Forms")
+                print("   2. Ir em Configurações (ícone de engrenagem)")
+                print("   3. Marcar 'Limitar a uma resposta'")
+                print("   4. Verificar se 'Coletar endereços de email' está ativado")
+                print(f"   🔗 Acesse: {edit_url}")
         
         # Sistema Quiz Google - não precisamos de arquivo gabarito separado
         print("Formulário criado em MODO QUIZ com respostas corretas configuradas!")
         print("O Google Forms calculará automaticamente as pontuações")
         
-        # URLs do formulário
-        edit_url = f"https://docs.google.com/forms/d/{form_id}/edit"
-        public_url = f"https://docs.google.com/forms/d/{form_id}/viewform"
-        
         # Estatísticas por seção
         secoes_stats = {}
         for q in config['questions']:
@@ -480,36 +513,27 @@ def criar_formulario_do_json(caminho_json):
             print(f"   • {secao}: {quantidade} questões")
         
         if config.get('evaluation', {}).get('include_evaluation', False):
-            eval_count = len(config.get('evaluation', {}).get('evaluation_questions', []))
+            eval_count = len(get_evaluation_questions(config))
             print(f"   • Avaliação: {eval_count} questões")
         
         print("\n✅ Formulário Quiz criado/atualizado e pronto para uso!")
         print("🎓 Os alunos receberão pontuação automática após responder!")
         
-        # 10. Organizar formulário na pasta específica no Google Drive
-        print("📁 Organizando formulário na pasta do Google Drive...")
-        from config import find_or_create_folder, move_form_to_folder, GOOGLE_DRIVE_FOLDER_NAME
+        print("="*60)
         
-        folder_id = find_or_create_folder(GOOGLE_DRIVE_FOLDER_NAME)
-        if folder_id:
-            # Verificar se já está na pasta correta
-            drive_service = get_drive_service()
-            if drive_service:
-                file_info = drive_service.files().get(fileId=form_id, fields='parents').execute()
-                current_parents = file_info.get('parents', [])
-                
-                if folder_id not in current_parents:
-                    print(f"📦 Movendo para pasta '{GOOGLE_DRIVE_FOLDER_NAME}'...")
-                    if move_form_to_folder(form_id, folder_id):
-                        print(f"✅ Formulário organizado na pasta '{GOOGLE_DRIVE_FOLDER_NAME}'")
-                    else:
-                        print("⚠️ Formulário criado mas não foi possível mover para a pasta")
-                else:
-                    print(f"✅ Formulário já está na pasta '{GOOGLE_DRIVE_FOLDER_NAME}'")
+        # Registrar a publicação para que execuções sem alterações sejam ignoradas.
+        # Um formulário incompleto não é registrado: a próxima execução tenta de novo
+        if ignoradas:
+            print("⚠️ Manifesto não atualizado: a próxima execução vai republicar este quiz")
         else:
-            print("⚠️ Formulário criado mas não foi possível encontrar/criar a pasta")
-        
-        print("="*60)
+            try:
+                with span('manifest_record'):
+                    if revision_id is None:
+                        revision_id = fetch_revision_id(service, form_id)
+                    record_publish(form_name, quiz_hash, form_id, revision_id,
+                                   len(config['questions']), secoes_stats)
+            except Exception as e:
+                print(f"⚠️ Não foi possível atualizar o manifesto de publicação: {e}")
         
         return {
             'form_id': form_id,
@@ -517,7 +541,9 @@ def criar_formulario_do_json(caminho_json):
             'public_url': public_url,
             'total_questions': len(config['questions']),
             'sections': secoes_stats,
-            'config': config
+            'config': config,
+            'skipped': False,
+            'skipped_requests': ignoradas
         }
         
     except Exception as e:
@@ -0,0 +1,205 @@
+"""
+Análise de Itens (Teoria Clássica)
+Calcula, para cada questão de um quiz, a dificuldade (p-valor), a
+discriminação (ponto-bisserial corrigida e diferença entre os grupos
+superior e inferior de 27%) e a proporção de alunos em cada alternativa.
+
+As respostas gravadas por `responses.py` viram uma matriz alunos x questões
+com o índice da opção escolhida; todas as estatísticas saem de operações
+vetorizadas do NumPy sobre essa matriz, sem laços por resposta.
+"""
+
+import numpy as np
+
+# Limites usados para marcar questões que merecem revisão
+TOO_HARD = 0.2            # p-valor abaixo disso: quase ninguém acerta
+TOO_EASY = 0.9            # p-valor acima disso: quase todos acertam
+WEAK_DISCRIMINATION = 0.2 # ponto-bisserial abaixo disso: não separa quem sabe de quem não sabe
+WEAK_DISTRACTOR = 0.05    # alternativa errada escolhida por menos de 5% não funciona
+
+GROUP_FRACTION = 0.27
+
+# Espaço reservado para o índice da opção no inteiro que empacota (questão, opção)
+_OPTION_SLOTS = 1 << 16
+
+
+def load_answer_matrix(conn, quiz, question_ids):
+    """
+    Monta a matriz alunos x questões a partir do banco de respostas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de `responses.connect`
+        quiz (str): Nome do quiz
+        question_ids (list): IDs das questões do JSON, na ordem das colunas
+
+    Returns:
+        numpy.ndarray: Matriz int16 com o índice da opção escolhida
+            (-1 = sem resposta ou texto fora das opções)
+    """
+    # O índice de cobertura entrega as respostas já ordenadas por aluno: uma
+    # consulta conta as respostas de cada aluno e a outra traz cada par
+    # (questão, opção) empacotado num único inteiro (questão * 2^16 + opção + 1),
+    # lido direto para um vetor do NumPy sem criar uma tupla por resposta.
+    # As duas rodam na mesma transação para enxergarem os mesmos dados
+    cursor = conn.cursor()
+    cursor.row_factory = None  # tuplas simples, sem o sqlite3.Row da conexão
+    in_transaction = conn.in_transaction
+    if not in_transaction:
+        cursor.execute('BEGIN')
+    try:
+        counts = np.fromiter(
+            (row[0] for row in cursor.execute(
+                'SELECT count(*) FROM answers WHERE quiz = ? GROUP BY response_id ORDER BY response_id',
+                (quiz,)
+            )),
+            dtype=np.int64
+        )
+        packed = np.fromiter(
+            (row[0] for row in cursor.execute(
+                f'SELECT question_id * {_OPTION_SLOTS} + ifnull(option_index, -1) + 1 FROM answers '
+                'WHERE quiz = ? ORDER BY response_id', (quiz,)
+            )),
+            dtype=np.int64
+        )
+    finally:
+        if not in_transaction:
+            conn.commit()
+    if not len(counts):
+        return np.empty((0, len(question_ids)), dtype=np.int16)
+
+    student = np.repeat(np.arange(len(counts)), counts)
+    answer_qids = packed // _OPTION_SLOTS
+    options = (packed % _OPTION_SLOTS - 1).astype(np.int16)
+
+    columns = np.asarray(question_ids, dtype=np.int64)
+    order = np.argsort(columns)
+    position = np.searchsorted(columns[order], answer_qids)
+    position = np.clip(position, 0, len(columns) - 1)
+    known = columns[order][position] == answer_qids
+
+    matrix = np.full((len(counts), len(columns)), -1, dtype=np.int16)
+    matrix[student[known], order[position[known]]] = options[known]
+    return matrix
+
+
+def analyze_matrix(matrix, answer_key, option_counts):
+    """
+    Estatísticas de todas as questões de uma vez.
+
+    Args:
+        matrix (numpy.ndarray): Alunos x questões (índice da opção, -1 = em branco)
+        answer_key (list): `correct_answer` de cada questão
+        option_counts (list): Número de opções de cada questão
+
+    Returns:
+        dict: Vetores por questão: 'answered', 'p_value', 'point_biserial',
+            'discrimination' (grupo superior - inferior) e 'option_shares'
+            (questões x opções; NaN onde a questão tem menos opções),
+            mais 'students' e 'mean_score'
+    """
+    students, questions = matrix.shape
+    key = np.asarray(answer_key, dtype=np.int16)
+    answered = (matrix >= 0).sum(axis=0)
+    correct = (matrix == key[None, :]).astype(np.float64)
+    total = correct.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p_value = correct.sum(axis=0) / answered
+
+        # Ponto-bisserial corrigida: correlação entre acertar a questão e a nota
+        # nas demais questões (sem a própria questão inflando a correlação)
+        rest = total[:, None] - correct
+        item_centered = correct - correct.sum(axis=0) / students
+        rest_centered = rest - rest.sum(axis=0) / students
+        covariance = (item_centered * rest_centered).sum(axis=0)
+        point_biserial = covariance / np.sqrt(
+            (item_centered ** 2).sum(axis=0) * (rest_centered ** 2).sum(axis=0)
+        )
+
+        # Grupos superior e inferior (27% das notas totais)
+        group = max(1, int(round(students * GROUP_FRACTION))) if students else 0
+        ranking = np.argsort(total, kind='stable')
+        lower, upper = ranking[:group], ranking[students - group:]
+        discrimination = (correct[upper].sum(axis=0) - correct[lower].sum(axis=0)) / group
+
+        # Proporção de cada opção entre quem respondeu: contagem por (questão, opção)
+        # Opções além das do JSON (formulário desatualizado, com mais alternativas
+        # que o JSON) ficam de fora, para não cair na contagem da questão seguinte
+        option_counts = np.asarray(option_counts, dtype=np.int64)
+        width = int(option_counts.max()) if len(option_counts) else 0
+        valid = (matrix >= 0) & (matrix < option_counts[None, :])
+        columns = np.broadcast_to(np.arange(questions), matrix.shape)[valid]
+        counts = np.bincount(columns * width + matrix[valid], minlength=questions * width)
+        option_shares = counts.reshape(questions, width) / answered[:, None]
+        option_shares[np.arange(width)[None, :] >= option_counts[:, None]] = np.nan
+
+    return {
+        'students': students,
+        'mean_score': float(total.mean()) if students else float('nan'),
+        'answered': answered,
+        'p_value': p_value,
+        'point_biserial': point_biserial,
+        'discrimination': discrimination,
+        'option_shares': option_shares,
+    }
+
+
+def flag_item(p_value, point_biserial, shares, correct_answer):
+    """
+    Motivos para revisar uma questão (lista vazia se ela parece saudável).
+    """
+    flags = []
+    if p_value < TOO_HARD:
+        flags.append('too hard')
+    elif p_value > TOO_EASY:
+        flags.append('too easy')
+    if point_biserial < 0:
+        flags.append('negative discrimination (check the answer key)')
+    elif point_biserial < WEAK_DISCRIMINATION:
+        flags.append('weak discrimination')
+    for option, share in enumerate(shares):
+        if option == correct_answer or np.isnan(share):
+            continue
+        if share > shares[correct_answer]:
+            flags.append(f'distractor {option} chosen more than the key')
+        elif share < WEAK_DISTRACTOR:
+            flags.append(f'distractor {option} rarely chosen')
+    return flags
+
+
+def analyze_quiz(conn, quiz, config):
+    """
+    Análise completa de um quiz: uma linha por questão.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de `responses.connect`
+        quiz (str): Nome do quiz
+        config (dict): JSON do quiz (chaves de resposta e opções)
+
+    Returns:
+        dict: 'quiz', 'students', 'mean_score' e 'items' (dicts com id,
+            section, answered, p_value, point_biserial, discrimination,
+            option_shares e flags)
+    """
+    questions = config['questions']
+    ids = [q['id'] for q in questions]
+    matrix = load_answer_matrix(conn, quiz, ids)
+    stats = analyze_matrix(matrix, [q['correct_answer'] for q in questions],
+                           [len(q['options']) for q in questions])
+
+    items = []
+    for i, q in enumerate(questions):
+        shares = stats['option_shares'][i]
+        items.append({
+            'id': q['id'],
+            'section': q.get('section'),
+            'answered': int(stats['answered'][i]),
+            'p_value': float(stats['p_value'][i]),
+            'point_biserial': float(stats['point_biserial'][i]),
+            'discrimination': float(stats['discrimination'][i]),
+            'option_shares': [round(float(s), 4) for s in shares[:len(q['options'])]],
+            'flags': flag_item(stats['p_value'][i], stats['point_biserial'][i],
+                               shares[:len(q['options'])], q['correct_answer'])
+                     if stats['answered'][i] else [],
+        })
+    return {'quiz': quiz, 'students': stats['students'], 'mean_score': stats['mean_score'], 'items': items}
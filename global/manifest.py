@@ -0,0 +1,116 @@
+"""
+Manifesto de Publicação
+Registra, para cada quiz, o hash normalizado do JSON publicado, o ID do
+formulário, o `revisionId` remoto e a data da publicação. Um quiz cujo hash
+não mudou (e cujo formulário não foi alterado remotamente) não precisa ser
+publicado de novo.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from config import PUBLISH_STATE_DIR
+
+MANIFEST_FILE = os.path.join(PUBLISH_STATE_DIR, 'manifest.json')
+
+# Incrementar quando a forma de montar as requisições mudar, invalidando o manifesto
+MANIFEST_VERSION = 1
+
+_manifest_lock = threading.Lock()
+
+
+def compute_quiz_hash(config):
+    """
+    Hash SHA-256 do JSON normalizado (chaves ordenadas, sem espaços).
+    Reformatar o arquivo ou reordenar chaves não altera o hash.
+
+    Args:
+        config (dict): Configuração do quiz já carregada
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    normalized = json.dumps(
+        {'version': MANIFEST_VERSION, 'quiz': config},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def get_entry(form_name):
+    """
+    Entrada do manifesto de um quiz.
+
+    Returns:
+        dict or None: Entrada registrada na última publicação bem-sucedida
+    """
+    with _manifest_lock:
+        return _read_manifest().get(form_name)
+
+
+def record_publish(form_name, quiz_hash, form_id, revision_id, total_questions, sections):
+    """
+    Registra uma publicação bem-sucedida no manifesto.
+    """
+    with _manifest_lock:
+        manifest = _read_manifest()
+        manifest[form_name] = {
+            'hash': quiz_hash,
+            'form_id': form_id,
+            'revision_id': revision_id,
+            'published_at': datetime.now().isoformat(timespec='seconds'),
+            'total_questions': total_questions,
+            'sections': sections
+        }
+        os.makedirs(PUBLISH_STATE_DIR, exist_ok=True)
+        tmp_path = MANIFEST_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, MANIFEST_FILE)
+
+
+def fetch_revision_id(service, form_id):
+    """
+    Lê apenas o `revisionId` atual do formulário (resposta mínima).
+    """
+    return service.forms().get(formId=form_id, fields='revisionId').execute().get('revisionId')
+
+
+def find_unchanged_entry(form_name, quiz_hash, get_service=None):
+    """
+    Verifica se o quiz já foi publicado exatamente com este conteúdo.
+
+    Args:
+        form_name (str): Nome do formulário (arquivo JSON sem extensão)
+        quiz_hash (str): Hash atual do JSON
+        get_service (callable): Retorna o serviço do Google Forms para conferir
+            o `revisionId` remoto; só é chamado se o hash coincidir.
+            Se None, confia apenas no manifesto (nenhuma chamada de API).
+
+    Returns:
+        dict or None: Entrada do manifesto se a publicação pode ser pulada
+    """
+    entry = get_entry(form_name)
+    if not entry or entry.get('hash') != quiz_hash:
+        return None
+
+    if get_service is not None:
+        remote_revision = fetch_revision_id(get_service(), entry['form_id'])
+        if remote_revision != entry.get('revision_id'):
+            print(f"⚠️ Formulário '{form_name}' foi alterado remotamente (revisão {remote_revision})")
+            return None
+
+    return entry
@@ -0,0 +1,120 @@
+"""
+Diário de Publicação
+Registra, para cada formulário em construção, quantas requisições do plano já
+foram confirmadas pela API, junto com o hash do JSON publicado. Se a
+publicação for interrompida (queda de rede, cota esgotada), a próxima execução
+com o mesmo JSON retoma a partir da última requisição confirmada, em vez de
+apagar o formulário e recriar todos os itens.
+
+Cada formulário tem seu arquivo em `.publish/journal/<form_id>.json`, regravado
+de forma atômica a cada confirmação e removido quando a publicação termina.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from config import PUBLISH_STATE_DIR
+
+JOURNAL_DIR = os.path.join(PUBLISH_STATE_DIR, 'journal')
+
+
+def _journal_path(form_id):
+    return os.path.join(JOURNAL_DIR, f'{form_id}.json')
+
+
+def _write(journal):
+    journal['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    path = _journal_path(journal['form_id'])
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(journal, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def start_journal(form_id, quiz_hash, total, initial_deletes, remote_items):
+    """
+    Abre o diário de uma publicação que vai enviar o plano completo de itens.
+
+    Args:
+        form_id (str): ID do formulário
+        quiz_hash (str): Hash do JSON publicado (`manifest.compute_quiz_hash`)
+        total (int): Número de entradas do plano
+        initial_deletes (int): `deleteItem` no início do plano (itens a remover)
+        remote_items (int): Itens que o formulário tem antes da primeira requisição
+
+    Returns:
+        dict: Diário, passado ao executor de requisições
+    """
+    journal = {
+        'form_id': form_id,
+        'quiz_hash': quiz_hash,
+        'total': total,
+        'initial_deletes': initial_deletes,
+        'applied': 0,
+        'skipped_items': 0,
+        'remote_items': remote_items,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    _write(journal)
+    return journal
+
+
+def load_journal(form_id, quiz_hash):
+    """
+    Diário pendente de um formulário para este mesmo JSON.
+
+    Um diário de outro conteúdo (o JSON mudou desde a interrupção) é
+    descartado: a publicação segue pelo caminho normal.
+
+    Returns:
+        dict or None: Diário a retomar
+    """
+    try:
+        with open(_journal_path(form_id), 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if journal.get('quiz_hash') != quiz_hash:
+        finish_journal(form_id)
+        return None
+    return journal
+
+
+def item_delta(request):
+    """
+    Variação no número de itens do formulário causada por uma requisição.
+    """
+    if 'createItem' in request:
+        return 1
+    if 'deleteItem' in request:
+        return -1
+    return 0
+
+
+def record_progress(journal, applied, item_change=0, skipped_item=False):
+    """
+    Registra entradas confirmadas pela API.
+
+    Args:
+        journal (dict): Diário aberto por `start_journal` ou `load_journal`
+        applied (int): Quantas entradas do plano acabaram de ser confirmadas
+        item_change (int): Itens criados menos itens removidos por elas
+        skipped_item (bool): Se a entrada era um item recusado pela API
+    """
+    journal['applied'] += applied
+    journal['remote_items'] += item_change
+    if skipped_item:
+        journal['skipped_items'] += 1
+    _write(journal)
+
+
+def finish_journal(form_id):
+    """
+    Remove o diário de uma publicação concluída (ou descartada).
+    """
+    try:
+        os.remove(_journal_path(form_id))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,136 @@
+"""
+Plano de Publicação (sem rede)
+Compila um quiz na sequência exata de chamadas que o gerador faz ao publicá-lo
+num formulário novo: a listagem da pasta do Drive, o `forms.create`, o
+`files.update` que nomeia e move o arquivo e os `batchUpdate` com todos os
+itens (a revisão gravada no manifesto vem da resposta do último lote). Nada
+é autenticado nem enviado; os IDs que só existem depois da criação aparecem
+como marcadores.
+
+O gerador monta as entradas dos `batchUpdate` com `build_publish_entries`,
+então o plano e a publicação real usam exatamente os mesmos corpos.
+"""
+
+import json
+from collections import Counter
+
+from config import FORMS_BATCH_MAX_REQUESTS, GOOGLE_DRIVE_FOLDER_ID
+from drive_folder import FILE_FIELDS, LIST_PAGE_SIZE, folder_queries
+from form_requests import (
+    build_form_info_requests,
+    build_item_plan,
+    build_settings_request,
+    chunk_requests,
+)
+from manifest import compute_quiz_hash, get_entry
+
+# Valores conhecidos apenas durante a publicação
+NEW_FORM_ID = '<formId>'
+ROOT_FOLDER_ID = '<rootFolderId>'
+
+
+def build_publish_entries(config, initial_requests=()):
+    """
+    Entradas enviadas em `batchUpdate` ao construir o formulário inteiro.
+
+    Args:
+        config (dict): Configuração do quiz
+        initial_requests (list): Requisições anteriores aos itens (ex: `deleteItem`
+            dos itens existentes ou do item padrão da API)
+
+    Returns:
+        list: Entradas no formato de `build_item_plan` ('kind', 'label',
+            'request', 'fallback'), com setup, itens e settings nesta ordem
+    """
+    entries = [
+        {'kind': 'setup', 'label': 'Configuração inicial', 'request': request, 'fallback': None}
+        for request in list(initial_requests) + build_form_info_requests(config)
+    ]
+    entries.extend(build_item_plan(config))
+
+    settings_request = build_settings_request(config)
+    if settings_request:
+        entries.append({
+            'kind': 'settings',
+            'label': 'configurações de settings',
+            'request': settings_request,
+            'fallback': None
+        })
+    return entries
+
+
+def _payload_bytes(body):
+    """
+    Tamanho do corpo como o cliente da API o serializa (json.dumps padrão).
+    """
+    return len(json.dumps(body).encode('utf-8')) if body is not None else 0
+
+
+def _call(step, api, method, params, body=None):
+    return {
+        'step': step,
+        'api': api,
+        'method': method,
+        'params': params,
+        'body': body,
+        'bytes': _payload_bytes(body),
+    }
+
+
+def build_publish_plan(config, form_name, batch_size=FORMS_BATCH_MAX_REQUESTS):
+    """
+    Sequência de chamadas da publicação de um quiz como formulário novo.
+
+    Args:
+        config (dict): Configuração do quiz (já validada)
+        form_name (str): Nome do formulário no Drive (arquivo JSON sem extensão)
+        batch_size (int): Máximo de requisições por `batchUpdate`
+
+    Returns:
+        dict: 'form_name', 'title', 'quiz_hash', 'unchanged' (o manifesto
+            indica que a publicação seria ignorada), 'calls' (lista ordenada
+            com step, api, method, params, body e bytes) e 'summary'
+            (total de chamadas, por método, requisições e bytes enviados)
+    """
+    active_query, trashed_query = folder_queries()
+    calls = [
+        _call('lookup', 'drive', 'files.list', {
+            'q': query,
+            'spaces': 'drive',
+            'pageSize': LIST_PAGE_SIZE,
+            'fields': f'nextPageToken, files({FILE_FIELDS})'
+        })
+        for query in (active_query, trashed_query)
+    ]
+
+    calls.append(_call('create', 'forms', 'forms.create', {},
+                       {'info': {'title': config['metadata']['title']}}))
+    calls.append(_call('place', 'drive', 'files.get', {'fileId': 'root', 'fields': 'id'}))
+    calls.append(_call('place', 'drive', 'files.update', {
+        'fileId': NEW_FORM_ID,
+        'addParents': GOOGLE_DRIVE_FOLDER_ID,
+        'removeParents': ROOT_FOLDER_ID,
+        'fields': 'id, name, parents'
+    }, {'name': form_name}))
+
+    entries = build_publish_entries(config)
+    for batch in chunk_requests(entries, batch_size):
+        calls.append(_call('items', 'forms', 'forms.batchUpdate', {'formId': NEW_FORM_ID},
+                           {'requests': [entry['request'] for entry in batch]}))
+
+    quiz_hash = compute_quiz_hash(config)
+    entry = get_entry(form_name)
+    return {
+        'form_name': form_name,
+        'title': config['metadata']['title'],
+        'quiz_hash': quiz_hash,
+        'unchanged': bool(entry and entry.get('hash') == quiz_hash),
+        'calls': calls,
+        'summary': {
+            'calls': len(calls),
+            'by_method': dict(Counter(c['method'] for c in calls)),
+            'batch_requests': len(entries),
+            'items': sum(1 for entry in entries if entry['kind'] == 'item'),
+            'request_bytes': sum(c['bytes'] for c in calls),
+        }
+    }
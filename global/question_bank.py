@@ -0,0 +1,52 @@
+"""
+Banco de Questões
+Trata as questões de todos os forms/*.json como um único banco, lido em
+fluxo: um arquivo é aberto por vez e suas questões são entregues uma a uma,
+então a memória usada não cresce com o tamanho do banco.
+"""
+
+import json
+import os
+
+
+def iter_quiz_files(forms_dir):
+    """
+    Caminhos dos arquivos *.json de `forms_dir`, em ordem alfabética.
+    """
+    for entry in sorted(os.scandir(forms_dir), key=lambda e: e.name):
+        if entry.name.endswith('.json') and entry.is_file():
+            yield entry.path
+
+
+def iter_quizzes(forms_dir):
+    """
+    Percorre os quizzes do banco, um arquivo por vez.
+
+    Arquivos vazios, com JSON inválido ou sem a lista de questões são ignorados
+    (o `validate.py` é quem os relata).
+
+    Yields:
+        tuple: (nome do quiz, dados do JSON)
+    """
+    for path in iter_quiz_files(forms_dir):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (ValueError, UnicodeDecodeError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get('questions'), list):
+            yield os.path.basename(path)[:-5], data
+
+
+def iter_questions(forms_dir):
+    """
+    Percorre todas as questões do banco.
+
+    Yields:
+        tuple: (nome do quiz, metadata do quiz, questão)
+    """
+    for name, data in iter_quizzes(forms_dir):
+        metadata = data.get('metadata') if isinstance(data.get('metadata'), dict) else {}
+        for question in data['questions']:
+            if isinstance(question, dict):
+                yield name, metadata, question
@@ -0,0 +1,233 @@
+"""
+Limitação de Taxa e Retentativas das Chamadas às APIs do Google
+Toda requisição passa por um token bucket por API/tipo (leitura ou escrita),
+dimensionado pelas cotas por minuto. Respostas 429 são sempre repetidas, e
+requisições idempotentes também em respostas 5xx e erros de rede, com backoff
+exponencial com jitter, respeitando o `Retry-After`.
+Também contabiliza o tempo gasto esperando o limitador versus a rede.
+"""
+
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from config import API_RATE_LIMITS, API_RETRY_ATTEMPTS, API_RETRY_BASE_DELAY, API_RETRY_MAX_DELAY
+
+# Status HTTP que indicam falha temporária
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Campos acumulados pelas estatísticas
+_STAT_FIELDS = ('calls', 'retries', 'throttled_seconds', 'backoff_seconds', 'network_seconds')
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe com reposição contínua.
+
+    Args:
+        rate_per_minute (int): Requisições permitidas por minuto
+        capacity (int): Rajada máxima (padrão: 1/10 da cota, no mínimo 1)
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 10)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Reserva tokens, esperando se necessário.
+
+        Args:
+            tokens (int): Quantidade a reservar (ex: partes de um lote HTTP)
+
+        Returns:
+            float: Segundos esperados
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Os tokens são reservados já; a espera acontece fora do lock
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_buckets = {key: TokenBucket(limit) for key, limit in API_RATE_LIMITS.items()}
+
+
+def set_rate_limits(limits):
+    """
+    Substitui as cotas em uso (ex: {} desativa a limitação em benchmarks offline).
+
+    Args:
+        limits (dict): (api, 'read'/'write') -> requisições por minuto
+    """
+    global _buckets
+    _buckets = {key: TokenBucket(limit) for key, limit in limits.items()}
+
+_thread_stats = threading.local()
+_global_stats = dict.fromkeys(_STAT_FIELDS, 0)
+_stats_lock = threading.Lock()
+
+
+def _record(field, value):
+    stats = getattr(_thread_stats, 'values', None)
+    if stats is None:
+        stats = _thread_stats.values = dict.fromkeys(_STAT_FIELDS, 0)
+    stats[field] += value
+    with _stats_lock:
+        _global_stats[field] += value
+
+
+def reset_thread_stats():
+    """
+    Zera as estatísticas da thread atual (ex: no início de cada publicação).
+    """
+    _thread_stats.values = dict.fromkeys(_STAT_FIELDS, 0)
+
+
+def get_thread_stats():
+    """
+    Estatísticas da thread atual: chamadas, retentativas e tempos em segundos.
+    """
+    return dict(getattr(_thread_stats, 'values', None) or dict.fromkeys(_STAT_FIELDS, 0))
+
+
+def get_global_stats():
+    """
+    Estatísticas acumuladas de todas as threads do processo.
+    """
+    with _stats_lock:
+        return dict(_global_stats)
+
+
+def _retry_after_seconds(error):
+    """
+    Lê o cabeçalho `Retry-After` (segundos ou data HTTP) de um HttpError.
+    """
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    """
+    Se o erro é temporário (429, 5xx ou falha de rede), e não uma recusa da requisição.
+    """
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is not None:
+        return int(status) in RETRYABLE_STATUS
+    # Erros de rede (conexão recusada, timeout, DNS)
+    return isinstance(error, OSError)
+
+
+def is_rate_limited(error):
+    """
+    Se o erro é um 429: a API recusou a requisição sem processá-la, então
+    repeti-la é seguro mesmo quando ela não é idempotente.
+    """
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    return status is not None and int(status) == 429
+
+
+def is_idempotent(http_method, method_id=None, body=None):
+    """
+    Se repetir a requisição não pode duplicar o efeito de uma tentativa
+    anterior que foi aplicada mas cuja resposta se perdeu.
+
+    Leituras, PATCH/PUT/DELETE (ex: `files.update` do Drive) e
+    `batchUpdate` com `writeControl.requiredRevisionId` são idempotentes: a
+    repetição de um lote já aplicado falha pela revisão, sem reaplicá-lo.
+    `forms.create`, `files.create` e `batchUpdate` sem revisão não são.
+
+    Args:
+        http_method (str): Método HTTP
+        method_id (str): `methodId` do documento de descoberta
+        body (str): Corpo JSON da requisição
+    """
+    if http_method in ('GET', 'PATCH', 'PUT', 'DELETE'):
+        return True
+    if method_id and method_id.endswith('.batchUpdate') and body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return False
+        return bool(payload.get('writeControl', {}).get('requiredRevisionId'))
+    return False
+
+
+def backoff_delay(attempt):
+    """
+    Atraso com "full jitter" para a retentativa `attempt` (0-based).
+    """
+    return random.uniform(0, min(API_RETRY_MAX_DELAY, API_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def wait_before_retry(error, attempt):
+    """
+    Espera antes da retentativa `attempt` (0-based) de um erro temporário:
+    o `Retry-After` da resposta, se houver, senão o backoff com jitter.
+    """
+    delay = _retry_after_seconds(error)
+    if delay is None:
+        delay = backoff_delay(attempt)
+    _record('retries', 1)
+    _record('backoff_seconds', delay)
+    time.sleep(delay)
+
+
+def execute_with_policy(api_name, kind, call, retry=True, cost=1):
+    """
+    Executa uma chamada respeitando a cota da API e repetindo falhas temporárias.
+
+    Args:
+        api_name (str): 'forms' ou 'drive'
+        kind (str): 'read' ou 'write'
+        call (callable): Função sem argumentos que faz a requisição HTTP
+        retry (bool): Se falhas temporárias (5xx, rede) são repetidas. Deve
+            ser False para requisições não idempotentes: se a primeira
+            tentativa foi aplicada e só a resposta se perdeu, repeti-la
+            duplicaria o efeito. Respostas 429 são sempre repetidas
+        cost (int): Tokens da cota consumidos por tentativa. Um lote HTTP
+            conta cada parte, pois a API cobra cada uma como uma requisição
+
+    Returns:
+        Resultado de `call()`
+    """
+    bucket = _buckets.get((api_name, kind))
+    attempt = 0
+    while True:
+        if bucket:
+            _record('throttled_seconds', bucket.acquire(cost))
+        _record('calls', 1)
+        started = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            _record('network_seconds', time.perf_counter() - started)
+            if attempt + 1 >= API_RETRY_ATTEMPTS or not is_retryable(e):
+                raise
+            if not retry and not is_rate_limited(e):
+                raise
+            wait_before_retry(e, attempt)
+            attempt += 1
+            continue
+        _record('network_seconds', time.perf_counter() - started)
+        return result
@@ -0,0 +1,230 @@
+"""
+Coleta Incremental de Respostas
+Lê as respostas dos formulários publicados (`forms.responses.list`) e as
+grava num SQLite local, associando cada resposta aos `id`s das questões do
+JSON e ao índice da opção escolhida.
+
+Cada formulário guarda uma marca d'água (o maior `lastSubmittedTime` já
+gravado): as execuções seguintes pedem apenas respostas a partir dela, então
+o custo é proporcional às respostas novas e não ao histórico inteiro. O mapa
+questionId -> id do JSON também fica no banco e só é relido do formulário
+quando aparece uma questão desconhecida ou uma resposta fora das opções
+salvas (texto de opção editado depois do mapa).
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from config import PUBLISH_STATE_DIR
+from sync import load_item_map, match_existing_items
+
+RESPONSES_DB_FILE = os.path.join(PUBLISH_STATE_DIR, 'responses.sqlite')
+
+# Máximo aceito pela API por página
+RESPONSES_PAGE_SIZE = 5000
+
+# Versão do esquema (PRAGMA user_version). As respostas não podem ser
+# recoletadas de graça, então mudanças são migrações em _MIGRATIONS, e não
+# uma recriação do banco como no índice do acervo
+SCHEMA_VERSION = 1
+
+# Migração que leva o banco da versão N-1 para a N (índice N-1 da lista)
+_MIGRATIONS = [
+    # 1: o índice de cobertura answers_quiz_response substitui answers_quiz_question
+    'DROP INDEX IF EXISTS answers_quiz_question;',
+]
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS forms (
+    form_id TEXT PRIMARY KEY,
+    quiz TEXT NOT NULL,
+    watermark TEXT,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS question_map (
+    form_id TEXT NOT NULL,
+    remote_question_id TEXT NOT NULL,
+    question_id INTEGER,
+    options TEXT NOT NULL,
+    PRIMARY KEY (form_id, remote_question_id)
+);
+CREATE TABLE IF NOT EXISTS responses (
+    response_id TEXT PRIMARY KEY,
+    form_id TEXT NOT NULL,
+    quiz TEXT NOT NULL,
+    respondent_email TEXT,
+    submitted_at TEXT NOT NULL,
+    total_score REAL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    response_id TEXT NOT NULL REFERENCES responses(response_id) ON DELETE CASCADE,
+    quiz TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    option_index INTEGER,
+    value TEXT,
+    PRIMARY KEY (response_id, question_id)
+);
+CREATE INDEX IF NOT EXISTS responses_quiz ON responses(quiz);
+-- Índice de cobertura da análise de itens (item_analysis.py): lê as respostas de
+-- um quiz já agrupadas por aluno, sem tocar na tabela
+CREATE INDEX IF NOT EXISTS answers_quiz_response ON answers(quiz, response_id, question_id, option_index);
+"""
+
+
+def connect(db_path=RESPONSES_DB_FILE):
+    """
+    Abre (ou cria) o banco de respostas.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for migration in _MIGRATIONS[version:SCHEMA_VERSION]:
+        conn.executescript(migration)
+    if version < SCHEMA_VERSION:
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.executescript(_TABLES)
+    return conn
+
+
+def load_question_map(conn, form_id):
+    """
+    Mapa salvo de um formulário: questionId remoto -> (id do JSON, opções).
+    Questões que não vêm do JSON (ex: avaliação) têm id None.
+    """
+    return {
+        row['remote_question_id']: (row['question_id'], json.loads(row['options']))
+        for row in conn.execute(
+            'SELECT remote_question_id, question_id, options FROM question_map WHERE form_id = ?',
+            (form_id,)
+        )
+    }
+
+
+def refresh_question_map(conn, service, form_id):
+    """
+    Relê os itens do formulário e regrava o mapa de questões (uma leitura).
+    Questões que não são do JSON (ex: avaliação) são registradas com id None,
+    para que suas respostas não provoquem uma nova leitura. Quem chama
+    confirma a transação.
+    """
+    form = service.forms().get(formId=form_id, fields='items').execute()
+    items = form.get('items', [])
+    rows = []
+    for item, key in zip(items, match_existing_items(items, load_item_map(form_id))):
+        question = item.get('questionItem', {}).get('question')
+        if not question:
+            continue
+        question_id = int(key[2:]) if key and key.startswith('q:') else None
+        options = [o.get('value') for o in question.get('choiceQuestion', {}).get('options', [])]
+        rows.append((form_id, question['questionId'], question_id, json.dumps(options, ensure_ascii=False)))
+    conn.execute('DELETE FROM question_map WHERE form_id = ?', (form_id,))
+    conn.executemany('INSERT INTO question_map VALUES (?, ?, ?, ?)', rows)
+    return load_question_map(conn, form_id)
+
+
+def iter_responses(service, form_id, since=None):
+    """
+    Percorre as respostas de um formulário, página por página.
+
+    Args:
+        since (str): Marca d'água (RFC 3339); só respostas enviadas a partir dela
+
+    Yields:
+        dict: Resposta da API
+    """
+    page_token = None
+    while True:
+        kwargs = {'formId': form_id, 'pageSize': RESPONSES_PAGE_SIZE}
+        if since:
+            # ">=" para não perder respostas no mesmo instante da marca; as repetidas
+            # são regravadas pela chave primária
+            kwargs['filter'] = f"timestamp >= {since}"
+        if page_token:
+            kwargs['pageToken'] = page_token
+        page = service.forms().responses().list(**kwargs).execute()
+        yield from page.get('responses', [])
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return
+
+
+def _answer_rows(response, quiz, question_map):
+    """
+    Linhas de `answers` de uma resposta e se o mapa parece desatualizado:
+    questões fora do mapa (ignoradas) ou respostas de múltipla escolha que não
+    estão entre as opções salvas (gravadas com option_index None).
+
+    Returns:
+        tuple: (linhas, mapa desatualizado)
+    """
+    rows = []
+    stale = False
+    for remote_id, answer in response.get('answers', {}).items():
+        if remote_id not in question_map:
+            stale = True
+            continue
+        question_id, options = question_map[remote_id]
+        if question_id is None:
+            continue
+        values = [a.get('value') for a in answer.get('textAnswers', {}).get('answers', [])]
+        value = values[0] if values else None
+        option_index = options.index(value) if value in options else None
+        if option_index is None and options and value is not None:
+            stale = True
+        rows.append((response['responseId'], quiz, question_id, option_index, value))
+    return rows, stale
+
+
+def ingest_form(conn, service, quiz, form_id):
+    """
+    Grava as respostas novas de um formulário e avança sua marca d'água.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de `connect`
+        service: Serviço do Google Forms
+        quiz (str): Nome do quiz (arquivo JSON sem extensão)
+        form_id (str): ID do formulário
+
+    Returns:
+        int: Respostas gravadas (novas ou reenviadas desde a última coleta)
+    """
+    row = conn.execute('SELECT watermark FROM forms WHERE form_id = ?', (form_id,)).fetchone()
+    watermark = row['watermark'] if row else None
+    question_map = load_question_map(conn, form_id)
+    refreshed = False
+    count = 0
+
+    with conn:
+        for response in iter_responses(service, form_id, since=watermark):
+            submitted_at = response.get('lastSubmittedTime') or response.get('createTime')
+            stored = conn.execute('SELECT submitted_at FROM responses WHERE response_id = ?',
+                                  (response['responseId'],)).fetchone()
+            if stored and stored['submitted_at'] == submitted_at:
+                # Resposta no limite da marca d'água, já gravada
+                continue
+            rows, stale = _answer_rows(response, quiz, question_map)
+            if stale and not refreshed:
+                # Questão nova ou opção editada desde o último mapa: reler uma vez por execução
+                question_map = refresh_question_map(conn, service, form_id)
+                refreshed = True
+                rows, _ = _answer_rows(response, quiz, question_map)
+            conn.execute('DELETE FROM responses WHERE response_id = ?', (response['responseId'],))
+            conn.execute(
+                'INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (response['responseId'], form_id, quiz, response.get('respondentEmail'),
+                 submitted_at, response.get('totalScore'))
+            )
+            conn.executemany('INSERT INTO answers VALUES (?, ?, ?, ?, ?)', rows)
+            if watermark is None or submitted_at > watermark:
+                watermark = submitted_at
+            count += 1
+
+        conn.execute(
+            'INSERT OR REPLACE INTO forms VALUES (?, ?, ?, ?)',
+            (form_id, quiz, watermark, datetime.now().isoformat(timespec='seconds'))
+        )
+    return count
@@ -0,0 +1,299 @@
+"""
+Sincronização Incremental de Formulários
+Compara um formulário existente com o JSON e envia apenas as diferenças
+(`updateItem`, `createItem`, `deleteItem`, `moveItem`) em poucos
+`batchUpdate` encadeados pela revisão, preservando os IDs dos itens que
+ligam as respostas antigas.
+"""
+
+import json
+import os
+import re
+import threading
+
+from config import FORMS_BATCH_MAX_REQUESTS, PUBLISH_STATE_DIR
+from form_requests import (
+    build_evaluation_item,
+    build_form_info_requests,
+    build_instructions_item,
+    build_question_item,
+    build_settings_request,
+    chunk_requests,
+    create_item_request,
+    get_evaluation_questions,
+    join_text,
+)
+
+ITEM_MAP_FILE = os.path.join(PUBLISH_STATE_DIR, 'item_maps.json')
+
+# Títulos gerados pelo form_requests: "<id>: pergunta" e "Avaliação <n>: pergunta"
+QUESTION_TITLE_PATTERN = re.compile(r'^(\d+): ')
+EVALUATION_TITLE_PATTERN = re.compile(r'^Avaliação (\d+): ')
+
+_item_map_lock = threading.Lock()
+
+
+def load_item_map(form_id):
+    """
+    Lê o mapa chave -> itemId salvo para um formulário.
+
+    Returns:
+        dict: Mapa salvo (vazio se não existir)
+    """
+    with _item_map_lock:
+        try:
+            with open(ITEM_MAP_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get(form_id, {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+
+def save_item_map(form_id, item_map):
+    """
+    Grava o mapa chave -> itemId de um formulário.
+    """
+    with _item_map_lock:
+        try:
+            with open(ITEM_MAP_FILE, 'r', encoding='utf-8') as f:
+                all_maps = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            all_maps = {}
+        all_maps[form_id] = item_map
+        os.makedirs(PUBLISH_STATE_DIR, exist_ok=True)
+        with open(ITEM_MAP_FILE, 'w', encoding='utf-8') as f:
+            json.dump(all_maps, f, ensure_ascii=False, indent=2)
+
+
+def desired_items(config):
+    """
+    Itens que o formulário deve ter, na ordem final, com suas chaves.
+
+    As chaves são 'instructions', 'q:<id da questão>' e 'eval:<n>'.
+
+    Returns:
+        list: Pares (chave, item)
+    """
+    items = []
+    instructions_item = build_instructions_item(config)
+    if instructions_item:
+        items.append(('instructions', instructions_item))
+    for question_data in config['questions']:
+        items.append((f"q:{question_data['id']}", build_question_item(question_data)))
+    for i, eval_q in enumerate(get_evaluation_questions(config)):
+        items.append((f"eval:{i + 1}", build_evaluation_item(i + 1, eval_q)))
+    return items
+
+
+def key_from_title(item):
+    """
+    Deduz a chave de um item remoto a partir do seu tipo e título.
+
+    Returns:
+        str or None: Chave do item ou None se não for reconhecido
+    """
+    if 'textItem' in item:
+        return 'instructions'
+    title = item.get('title', '')
+    match = QUESTION_TITLE_PATTERN.match(title)
+    if match:
+        return f"q:{int(match.group(1))}"
+    match = EVALUATION_TITLE_PATTERN.match(title)
+    if match:
+        return f"eval:{int(match.group(1))}"
+    return None
+
+
+def match_existing_items(form_items, stored_map):
+    """
+    Associa cada item remoto a uma chave, usando primeiro o mapa salvo e
+    depois o prefixo do título. Itens duplicados ou desconhecidos ficam sem chave.
+
+    Returns:
+        list: Chave (ou None) para cada item remoto, na ordem do formulário
+    """
+    keys_by_item_id = {item_id: key for key, item_id in stored_map.items()}
+    claimed = set()
+    keys = []
+    for item in form_items:
+        key = keys_by_item_id.get(item.get('itemId')) or key_from_title(item)
+        if key in claimed:
+            key = None
+        if key:
+            claimed.add(key)
+        keys.append(key)
+    return keys
+
+
+def _comparable(item):
+    """
+    Reduz um item às propriedades controladas pelo JSON.
+    """
+    question = item.get('questionItem', {}).get('question', {})
+    choice = question.get('choiceQuestion', {})
+    grading = question.get('grading', {})
+    return {
+        'title': item.get('title', ''),
+        'description': item.get('description', ''),
+        'text': 'textItem' in item,
+        'required': question.get('required', False),
+        'type': choice.get('type'),
+        'shuffle': choice.get('shuffle', False),
+        'options': [option.get('value') for option in choice.get('options', [])],
+        'points': grading.get('pointValue', 0),
+        'answers': [a.get('value') for a in grading.get('correctAnswers', {}).get('answers', [])],
+    }
+
+
+def _update_item_request(existing, desired, index):
+    """
+    Requisição `updateItem` que substitui o conteúdo preservando os IDs.
+    """
+    item = json.loads(json.dumps(desired))
+    item['itemId'] = existing['itemId']
+    question_id = existing.get('questionItem', {}).get('question', {}).get('questionId')
+    if question_id and 'questionItem' in item:
+        item['questionItem']['question']['questionId'] = question_id
+    return {
+        "updateItem": {
+            "item": item,
+            "location": {"index": index},
+            "updateMask": "*"
+        }
+    }
+
+
+def _form_info_changed(form, config):
+    info = form.get('info', {})
+    return (
+        info.get('title') != config['metadata']['title']
+        or info.get('description', '') != join_text(config['metadata']['description'], "\n")
+        or not form.get('settings', {}).get('quizSettings', {}).get('isQuiz', False)
+    )
+
+
+def build_sync_requests(form, config, stored_map=None):
+    """
+    Calcula as requisições mínimas para levar o formulário ao estado do JSON.
+
+    A ordem é: remoções (do maior para o menor índice), movimentações e
+    criações na ordem final, e por fim atualizações já com os índices finais.
+
+    Args:
+        form (dict): Formulário retornado por `forms().get`
+        config (dict): Configuração do quiz
+        stored_map (dict): Mapa chave -> itemId salvo anteriormente
+
+    Returns:
+        tuple: (requisições, chaves criadas na ordem, mapa chave -> itemId dos itens mantidos)
+    """
+    form_items = form.get('items', [])
+    existing_keys = match_existing_items(form_items, stored_map or {})
+    wanted = desired_items(config)
+    wanted_keys = {key for key, _ in wanted}
+
+    requests = []
+    if _form_info_changed(form, config):
+        requests.extend(build_form_info_requests(config))
+
+    # 1. Remover itens sem correspondência no JSON
+    existing_by_key = {}
+    for index in reversed(range(len(form_items))):
+        key = existing_keys[index]
+        if key in wanted_keys:
+            existing_by_key[key] = form_items[index]
+        else:
+            requests.append({"deleteItem": {"location": {"index": index}}})
+    current = [key for key in existing_keys if key in wanted_keys]
+
+    # 2. Mover e criar itens até a ordem final
+    created_keys = []
+    for target, (key, item) in enumerate(wanted):
+        if key in existing_by_key:
+            position = current.index(key)
+            if position != target:
+                requests.append({
+                    "moveItem": {
+                        "originalLocation": {"index": position},
+                        "newLocation": {"index": target}
+                    }
+                })
+                current.insert(target, current.pop(position))
+        else:
+            requests.append(create_item_request(item, target))
+            current.insert(target, key)
+            created_keys.append(key)
+
+    # 3. Atualizar o conteúdo dos itens que mudaram
+    for target, (key, item) in enumerate(wanted):
+        existing = existing_by_key.get(key)
+        if existing and _comparable(existing) != _comparable(item):
+            requests.append(_update_item_request(existing, item, target))
+
+    settings_request = build_settings_request(config)
+    if settings_request:
+        collect_email = settings_request['updateSettings']['settings']['collectEmail']
+        if form.get('settings', {}).get('collectEmail', False) != collect_email:
+            requests.append(settings_request)
+
+    kept = {key: existing['itemId'] for key, existing in existing_by_key.items()}
+    return requests, created_keys, kept
+
+
+class SyncDiffError(Exception):
+    """
+    As diferenças entre o formulário e o JSON não puderam ser calculadas
+    (ex: itens remotos num formato inesperado).
+    """
+
+
+def sync_form(service, form_id, config, form=None):
+    """
+    Sincroniza um formulário existente com o JSON.
+
+    As requisições seguem em lotes de até FORMS_BATCH_MAX_REQUESTS, aplicados
+    em ordem; cada lote exige a revisão deixada pelo anterior, então falha
+    (sem reaplicar nada) se o formulário mudou no meio ou se uma retentativa
+    repete um lote já aplicado. Os itemIds criados pelos lotes confirmados
+    são salvos mesmo se um lote seguinte falhar: uma nova sincronização
+    parte do formulário relido e envia apenas o que falta.
+
+    Args:
+        service: Serviço autenticado do Google Forms
+        form_id (str): ID do formulário
+        config (dict): Configuração do quiz
+        form (dict): Formulário já obtido com `forms().get` (evita nova leitura)
+
+    Returns:
+        dict: Resumo com 'requests' (quantidade enviada), 'calls' e 'revision_id'
+
+    Raises:
+        SyncDiffError: Se as diferenças não puderam ser calculadas
+    """
+    calls = 0
+    if form is None:
+        form = service.forms().get(formId=form_id).execute()
+        calls += 1
+
+    try:
+        requests, created_keys, item_map = build_sync_requests(form, config, load_item_map(form_id))
+    except Exception as e:
+        raise SyncDiffError(f"não foi possível comparar o formulário com o JSON: {e}") from e
+    revision_id = form.get('revisionId')
+
+    pending_keys = iter(created_keys)
+    try:
+        for batch in chunk_requests(requests, FORMS_BATCH_MAX_REQUESTS):
+            body = {"requests": batch}
+            if revision_id:
+                # Falha se o formulário mudou entre a leitura e a escrita
+                body["writeControl"] = {"requiredRevisionId": revision_id}
+            response = service.forms().batchUpdate(formId=form_id, body=body).execute()
+            calls += 1
+            revision_id = response.get('writeControl', {}).get('requiredRevisionId', revision_id)
+
+            for reply in response.get('replies', []):
+                if 'createItem' in reply:
+                    item_map[next(pending_keys)] = reply['createItem']['itemId']
+    finally:
+        save_item_map(form_id, item_map)
+    return {'requests': len(requests), 'calls': calls, 'revision_id': revision_id}
@@ -0,0 +1,178 @@
+"""
+Medição por Fases da Publicação
+`span("nome")` mede um trecho do pipeline (autenticação, busca no Drive,
+criação de itens, ...). Cada thread acumula o tempo por fase, usado no resumo
+da publicação em massa para apontar a fase mais lenta de cada formulário.
+
+Com o perfilamento ligado (`enable()`, `form.py --profile`), cada span também
+vira um evento com início, duração, thread e requisições HTTP feitas dentro
+dele (contadas por `api_metrics.py`), exportado em JSON Lines e no formato de
+trace do Chrome (chrome://tracing ou https://ui.perfetto.dev). Desligado, um
+span custa apenas duas leituras de relógio.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Importação do módulo (e não dos nomes): api_metrics também importa tracing
+import api_metrics
+
+_enabled = False
+_events = []
+_events_lock = threading.Lock()
+_local = threading.local()
+
+# Origem dos tempos exportados (microssegundos desde o início do processo)
+_origin = time.perf_counter()
+
+
+def enable():
+    """
+    Liga o registro dos eventos (spans individuais) para exportação.
+    """
+    global _enabled
+    _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def _thread_state():
+    state = getattr(_local, 'state', None)
+    if state is None:
+        state = _local.state = {'depth': 0, 'phases': {}}
+    return state
+
+
+def _thread_call_count():
+    # Requisições HTTP da thread, a mesma contagem do resumo de api_metrics
+    # (cada retentativa conta como uma requisição)
+    return sum(api_metrics.get_thread_calls().values())
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Mede um trecho nomeado do pipeline.
+
+    Args:
+        name (str): Nome da fase (ex: 'auth', 'drive_lookup', 'items')
+        **attrs: Atributos gravados no evento quando o perfilamento está ligado
+    """
+    state = _thread_state()
+    state['depth'] += 1
+    calls_before = None
+    if _enabled:
+        calls_before = _thread_call_count()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        state['depth'] -= 1
+        phases = state['phases']
+        phases[name] = phases.get(name, 0.0) + duration
+        if _enabled:
+            _record_event(name, started, duration, state['depth'],
+                          _thread_call_count() - calls_before, attrs)
+
+
+def _record_event(name, started, duration, depth, api_calls, attrs):
+    event = {
+        'name': name,
+        'start_us': round((started - _origin) * 1e6),
+        'duration_us': round(duration * 1e6),
+        'thread': threading.current_thread().name,
+        'tid': threading.get_ident(),
+        'depth': depth,
+        'api_calls': api_calls,
+    }
+    if attrs:
+        event['attrs'] = attrs
+    with _events_lock:
+        _events.append(event)
+
+
+def add_event(name, started, duration, **attrs):
+    """
+    Registra um trecho já medido (ex: uma requisição HTTP) como evento, sem
+    somá-lo aos tempos por fase. Não faz nada com o perfilamento desligado.
+
+    Args:
+        name (str): Nome do evento
+        started (float): Início, em `time.perf_counter()`
+        duration (float): Duração em segundos
+        **attrs: Atributos gravados no evento
+    """
+    if _enabled:
+        _record_event(name, started, duration, _thread_state()['depth'], 1, attrs)
+
+
+def reset_thread_phases():
+    """
+    Zera os tempos por fase da thread atual (início de cada formulário).
+    """
+    _thread_state()['phases'] = {}
+
+
+def get_thread_phases():
+    """
+    Segundos acumulados por fase na thread atual.
+    """
+    return dict(_thread_state()['phases'])
+
+
+def slowest_phase(phases, exclude=('publish',)):
+    """
+    Fase mais demorada, ignorando as que englobam as demais.
+
+    Returns:
+        tuple or None: (nome, segundos)
+    """
+    candidates = [(name, seconds) for name, seconds in phases.items() if name not in exclude]
+    return max(candidates, key=lambda item: item[1]) if candidates else None
+
+
+def get_events():
+    with _events_lock:
+        return list(_events)
+
+
+def export_jsonl(path):
+    """
+    Grava um evento por linha, na ordem de término dos spans.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in get_events():
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+def export_chrome_trace(path):
+    """
+    Grava os eventos no formato "Trace Event" (eventos completos, ph='X').
+    """
+    trace_events = []
+    thread_names = {}
+    for event in get_events():
+        thread_names[event['tid']] = event['thread']
+        trace_events.append({
+            'name': event['name'],
+            'cat': 'publish',
+            'ph': 'X',
+            'ts': event['start_us'],
+            'dur': event['duration_us'],
+            'pid': os.getpid(),
+            'tid': event['tid'],
+            'args': {'api_calls': event['api_calls'], **event.get('attrs', {})},
+        })
+    for tid, thread_name in thread_names.items():
+        trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                             'args': {'name': thread_name}})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
@@ -0,0 +1,307 @@
+"""Shared quiz validation and loading.
+
+Quizzes are validated against `global/schema.json` itself. The schema is
+compiled once into a tree of closures and cached by the hash of the file,
+so validating hundreds of quizzes in a loop does not re-interpret it.
+The project rules the schema cannot express (unique ids, `correct_answer`
+within the options, unique option texts, non-blank metadata) run on top.
+
+`load_quiz` parses a quiz JSON file and validates it once per process:
+the result is cached by path, modification time and size, so `form.py`,
+`validate.py` and the generator can all call it without re-reading or
+re-validating the same file.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.json')
+
+REQUIRED_METADATA = ["title", "description", "subject", "grade", "topic"]
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+# Compiled validators by schema hash, and the hash of each schema file by (mtime, size)
+_validators = {}
+_schema_files = {}
+_schema_lock = threading.Lock()
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+_JSON_TYPE_NAMES = {dict: "object", list: "array", str: "string", int: "integer",
+                    float: "number", bool: "boolean", type(None): "null"}
+
+
+def _is_date(value):
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+_FORMAT_CHECKS = {"date": _is_date}
+
+
+def _join(path, key):
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+
+def _compile(node):
+    """Turn one schema node into a `check(value, path, errors)` closure.
+
+    Supported keywords: type, enum, required, properties, additionalProperties,
+    items, minItems, maxItems, minLength, minimum, maximum, format (date) and
+    oneOf/anyOf/allOf. Annotations such as description and default are ignored.
+    """
+    checks = []
+
+    if "enum" in node:
+        allowed = node["enum"]
+        message = "must be one of " + ", ".join(json.dumps(v, ensure_ascii=False) for v in allowed)
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path or '$'}: {message} (got {json.dumps(value, ensure_ascii=False)})")
+        checks.append(check_enum)
+
+    if "required" in node:
+        required = tuple(node["required"])
+
+        def check_required(value, path, errors):
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path or '$'}: missing required field '{key}'")
+        checks.append(check_required)
+
+    if "properties" in node:
+        properties = [(key, _compile(sub)) for key, sub in node["properties"].items()]
+
+        def check_properties(value, path, errors):
+            for key, check in properties:
+                if key in value:
+                    check(value[key], _join(path, key), errors)
+        checks.append(check_properties)
+
+    additional = node.get("additionalProperties", True)
+    if additional is not True:
+        known = set(node.get("properties", {}))
+        check_extra = _compile(additional) if isinstance(additional, dict) else None
+
+        def check_additional(value, path, errors):
+            for key in value:
+                if key in known:
+                    continue
+                if check_extra is None:
+                    errors.append(f"{path or '$'}: unexpected field '{key}'")
+                else:
+                    check_extra(value[key], _join(path, key), errors)
+        checks.append(check_additional)
+
+    if "items" in node:
+        check_item = _compile(node["items"])
+
+        def check_items(value, path, errors):
+            for i, item in enumerate(value):
+                check_item(item, _join(path, i), errors)
+        checks.append(check_items)
+
+    if "minItems" in node or "maxItems" in node:
+        low, high = node.get("minItems", 0), node.get("maxItems")
+
+        def check_length(value, path, errors):
+            if len(value) < low or (high is not None and len(value) > high):
+                bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+                errors.append(f"{path or '$'}: must have {bounds} items (got {len(value)})")
+        checks.append(check_length)
+
+    if "minLength" in node:
+        min_length = node["minLength"]
+
+        def check_min_length(value, path, errors):
+            if len(value) < min_length:
+                errors.append(f"{path or '$'}: must have at least {min_length} characters")
+        checks.append(check_min_length)
+
+    if "minimum" in node or "maximum" in node:
+        minimum, maximum = node.get("minimum"), node.get("maximum")
+
+        def check_range(value, path, errors):
+            if minimum is not None and value < minimum:
+                errors.append(f"{path or '$'}: must be >= {minimum} (got {value})")
+            if maximum is not None and value > maximum:
+                errors.append(f"{path or '$'}: must be <= {maximum} (got {value})")
+        checks.append(check_range)
+
+    if node.get("format") in _FORMAT_CHECKS:
+        name, is_valid = node["format"], _FORMAT_CHECKS[node["format"]]
+
+        def check_format(value, path, errors):
+            if not is_valid(value):
+                errors.append(f"{path or '$'}: not a valid {name} ({value!r})")
+        checks.append(check_format)
+
+    for keyword in ("oneOf", "anyOf"):
+        if keyword in node:
+            branches = [_compile(sub) for sub in node[keyword]]
+            exactly_one = keyword == "oneOf"
+
+            def check_branches(value, path, errors, branches=branches, exactly_one=exactly_one):
+                matched = 0
+                for branch in branches:
+                    branch_errors = []
+                    branch(value, path, branch_errors)
+                    matched += not branch_errors
+                if matched == 0 or (exactly_one and matched > 1):
+                    errors.append(f"{path or '$'}: does not match any of the allowed shapes")
+            checks.append(check_branches)
+
+    for sub in node.get("allOf", ()):
+        checks.append(_compile(sub))
+
+    types = node.get("type")
+    if types is None:
+        def check(value, path, errors):
+            for c in checks:
+                c(value, path, errors)
+        return check
+
+    types = [types] if isinstance(types, str) else list(types)
+    type_checks = [_TYPE_CHECKS[t] for t in types]
+    expected = " or ".join(types)
+
+    def check(value, path, errors):
+        # Wrong type: the remaining keywords do not apply to this value
+        if not any(t(value) for t in type_checks):
+            got = _JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+            errors.append(f"{path or '$'}: expected {expected}, got {got}")
+            return
+        for c in checks:
+            c(value, path, errors)
+    return check
+
+
+def compile_schema(schema):
+    """Compile a JSON schema (dict) into a function returning the list of errors."""
+    check = _compile(schema)
+
+    def validate(data):
+        errors = []
+        check(data, "", errors)
+        return errors
+    return validate
+
+
+def get_schema_validator(schema_path=SCHEMA_FILE):
+    """Return ``(schema_hash, validate)`` for a schema file.
+
+    The file is only re-read when its modification time or size changes, and
+    compiled only once per distinct content hash.
+    """
+    schema_path = os.path.abspath(schema_path)
+    st = os.stat(schema_path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _schema_lock:
+        cached = _schema_files.get(schema_path)
+        if cached and cached[0] == key:
+            return cached[1], _validators[cached[1]]
+
+        with open(schema_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest not in _validators:
+            _validators[digest] = compile_schema(json.loads(raw))
+        _schema_files[schema_path] = (key, digest)
+        return digest, _validators[digest]
+
+
+def project_rule_errors(data):
+    """Checks the schema cannot express: unique ids, unique options, answer in range,
+    non-blank metadata and at least one question. Values of the wrong type are
+    skipped here because the schema already reports them."""
+    errors = []
+    if not isinstance(data, dict):
+        return errors
+
+    meta = data.get("metadata")
+    if isinstance(meta, dict):
+        for k in REQUIRED_METADATA:
+            if isinstance(meta.get(k), str) and not meta[k].strip():
+                errors.append(f"metadata.{k}: must not be empty")
+
+    questions = data.get("questions")
+    if not isinstance(questions, list):
+        return errors
+    if not questions:
+        errors.append("questions: must be a non-empty array")
+
+    ids = set()
+    for i, q in enumerate(questions):
+        if not isinstance(q, dict):
+            continue
+        prefix = f"questions[{i}]"
+        qid = q.get("id")
+        if isinstance(qid, int) and not isinstance(qid, bool):
+            if qid in ids:
+                errors.append(f"{prefix}.id: duplicate id {qid}")
+            ids.add(qid)
+        opts = q.get("options")
+        if isinstance(opts, list):
+            cleaned = [str(x).strip() for x in opts]
+            if len(set(cleaned)) != len(cleaned):
+                errors.append(f"{prefix}.options: duplicate option texts found")
+            ca = q.get("correct_answer")
+            if isinstance(ca, int) and not isinstance(ca, bool) and ca >= len(opts):
+                errors.append(f"{prefix}.correct_answer: index {ca} out of range for options length {len(opts)}")
+    return errors
+
+
+def validate_quiz_data(data):
+    """Return the list of problems found in an already parsed quiz."""
+    _, validate = get_schema_validator()
+    return validate(data) + project_rule_errors(data)
+
+
+def load_quiz(path):
+    """Parse and validate a quiz file, reusing the cached result when unchanged.
+
+    Returns a ``(data, errors)`` tuple. ``data`` is None when the file is
+    missing or is not valid JSON; ``errors`` is empty when the quiz is valid.
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None, [f"quiz file not found: {path}"]
+    # A schema change also invalidates the cached result
+    key = (path, st.st_mtime_ns, st.st_size, get_schema_validator()[0])
+
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        data, errors = None, [f"invalid JSON: {e}"]
+    else:
+        errors = validate_quiz_data(data)
+
+    with _cache_lock:
+        _cache[path] = (key, data, errors)
+    return data, errors
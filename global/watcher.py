@@ -0,0 +1,162 @@
+"""
+Observação da Pasta de Quizzes
+Detecta arquivos JSON criados ou alterados em forms/ e os entrega em lotes,
+depois que as gravações param por um instante (debounce): salvar várias
+vezes seguidas, ou um editor que grava em etapas, gera uma única publicação.
+
+Usa as notificações do sistema operacional via `watchdog` quando o pacote
+está instalado; sem ele, compara a data de modificação e o tamanho dos
+arquivos a cada POLL_INTERVAL segundos.
+"""
+
+import os
+import threading
+import time
+
+# Silêncio exigido depois da última gravação antes de publicar
+DEBOUNCE_SECONDS = 0.5
+
+# Intervalo entre comparações no modo sem watchdog
+POLL_INTERVAL = 1.0
+
+
+def snapshot(forms_dir):
+    """
+    Estado atual dos quizzes da pasta.
+
+    Returns:
+        dict: nome (sem .json) -> (mtime em ns, tamanho)
+    """
+    state = {}
+    try:
+        entries = os.scandir(forms_dir)
+    except FileNotFoundError:
+        return state
+    with entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.is_file():
+                st = entry.stat()
+                state[entry.name[:-5]] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def changed_names(before, after):
+    """
+    Quizzes novos ou alterados entre dois `snapshot` (remoções são ignoradas).
+    """
+    return [name for name, signature in after.items() if before.get(name) != signature]
+
+
+def _start_watchdog(forms_dir, notify):
+    """
+    Observador do watchdog que chama `notify(caminho)` quando um arquivo é
+    criado, modificado ou movido para a pasta. Aberturas, fechamentos e
+    remoções não disparam publicação.
+
+    Returns:
+        Observer or None: None se o watchdog não está instalado
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                notify(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                notify(event.src_path)
+
+        def on_moved(self, event):
+            # Editores que salvam num temporário e renomeiam geram um "moved"
+            if not event.is_directory:
+                notify(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(Handler(), forms_dir, recursive=False)
+    observer.start()
+    return observer
+
+
+def _start_polling(forms_dir, notify_name, stop, interval):
+    def poll():
+        before = snapshot(forms_dir)
+        while not stop.wait(interval):
+            after = snapshot(forms_dir)
+            for name in changed_names(before, after):
+                notify_name(name)
+            before = after
+
+    thread = threading.Thread(target=poll, name='forms-poll', daemon=True)
+    thread.start()
+    return thread
+
+
+def iter_changes(forms_dir, debounce=DEBOUNCE_SECONDS, poll_interval=POLL_INTERVAL,
+                 use_watchdog=True, stop=None):
+    """
+    Gera os nomes dos quizzes alterados, em lotes separados por `debounce`.
+
+    Args:
+        forms_dir (str): Pasta dos quizzes
+        debounce (float): Segundos sem novas gravações antes de entregar o lote
+        poll_interval (float): Intervalo da comparação no modo sem watchdog
+        use_watchdog (bool): Se tenta usar as notificações do sistema
+        stop (threading.Event): Encerra a observação quando sinalizado
+
+    Yields:
+        list: Nomes (sem .json) em ordem alfabética
+    """
+    forms_dir = os.path.abspath(forms_dir)
+    stop = stop or threading.Event()
+    pending = {}
+    changed = threading.Condition()
+
+    def notify_name(name):
+        with changed:
+            pending[name] = time.monotonic()
+            changed.notify()
+
+    def notify(path):
+        path = os.path.abspath(path)
+        if os.path.dirname(path) == forms_dir and path.endswith('.json'):
+            notify_name(os.path.basename(path)[:-5])
+
+    observer = _start_watchdog(forms_dir, notify) if use_watchdog else None
+    poller_stop = threading.Event()
+    if observer is None:
+        _start_polling(forms_dir, notify_name, poller_stop, poll_interval)
+
+    try:
+        while not stop.is_set():
+            with changed:
+                if not pending:
+                    changed.wait(timeout=0.5)
+                    continue
+                remaining = debounce - (time.monotonic() - max(pending.values()))
+                if remaining > 0:
+                    changed.wait(timeout=remaining)
+                    continue
+                batch = sorted(pending)
+                pending.clear()
+            yield batch
+    finally:
+        poller_stop.set()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def watch_mode():
+    """
+    Descrição do mecanismo usado por `iter_changes` ('watchdog' ou 'polling').
+    """
+    try:
+        import watchdog.observers  # noqa: F401
+    except ImportError:
+        return 'polling'
+    return 'watchdog'
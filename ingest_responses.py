@@ -0,0 +1,84 @@
+"""Ingest the responses of the published quizzes into a local SQLite store.
+
+Usage:
+    python ingest_responses.py [<quiz_name_or_pattern> ...] [--db PATH]
+
+Examples:
+    python ingest_responses.py                 # every form in the Drive folder
+    python ingest_responses.py pronomes "verbos_*"
+
+What this script does:
+    - Finds the published forms from one listing of the Drive folder
+      (`global/drive_folder.py`); only forms whose name matches a JSON in
+      `forms/` are read.
+    - Pages through `forms.responses.list` for each form, asking only for
+      responses submitted since the form's stored watermark
+      (`global/responses.py`), so repeated runs only pay for new responses.
+    - Stores each response in `.publish/responses.sqlite` with its answers
+      mapped to the JSON question `id` and the chosen option index.
+
+The first run after upgrading asks for a new OAuth authorization, because
+reading responses needs the `forms.responses.readonly` scope.
+
+Exit codes:
+    0 - every form ingested
+    1 - at least one form failed
+"""
+import argparse
+import fnmatch
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from config import get_authenticated_service
+from drive_folder import get_folder_index
+from responses import RESPONSES_DB_FILE, connect, ingest_form
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ingest quiz responses into a local SQLite store')
+    parser.add_argument('names', nargs='*', help='quiz names or glob patterns (default: all)')
+    parser.add_argument('--db', default=RESPONSES_DB_FILE, help='store file (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    quizzes = {p.stem for p in (ROOT / 'forms').glob('*.json')}
+    published = {
+        name: [f['id'] for f in files]
+        for name, files in get_folder_index()['active'].items() if name in quizzes
+    }
+    if args.names:
+        published = {
+            name: ids for name, ids in published.items()
+            if any(fnmatch.fnmatch(name, pattern) for pattern in args.names)
+        }
+    if not published:
+        print("No published form matches.")
+        return 0
+
+    service = get_authenticated_service()
+    conn = connect(args.db)
+    failed = 0
+    total = 0
+    started = time.perf_counter()
+    for name in sorted(published):
+        for form_id in published[name]:
+            try:
+                count = ingest_form(conn, service, name, form_id)
+            except Exception as e:
+                print(f"FAILED {name} ({form_id}): {e}")
+                failed += 1
+                continue
+            total += count
+            stored = conn.execute('SELECT COUNT(*) FROM responses WHERE form_id = ?', (form_id,)).fetchone()[0]
+            print(f"{name:<40} {count:>6} new  {stored:>7} stored")
+    conn.close()
+
+    print(f"\n{total} new response(s) from {sum(map(len, published.values()))} form(s) "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
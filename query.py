@@ -0,0 +1,74 @@
+"""Query the quiz corpus through the local SQLite metadata index.
+
+Usage:
+    python query.py [filters] [--json] [--rebuild]
+
+Examples:
+    python query.py --subject Matemática --grade "5ª série"
+    python query.py --grade "5ª série" --subject Matemática --difficulty difícil --section "Frações"
+    python query.py --min-options 5 --json
+
+What this script does:
+    - Refreshes the index (`.publish/corpus.sqlite`, see `global/corpus_index.py`)
+      from `forms/`. Only files whose mtime or size changed are read, and only
+      files whose hash changed are re-indexed.
+    - Lists the quizzes matching the metadata filters (subject, grade, topic).
+      Question filters (section, difficulty, option count) keep only quizzes
+      with at least one question matching all of them, and show how many match.
+    - Files that could not be indexed (invalid JSON) are listed at the end.
+
+Exit codes:
+    0 - at least one quiz matches
+    1 - no quiz matches
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from corpus_index import CORPUS_INDEX_FILE, connect, list_errors, query_quizzes, update_index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query quiz metadata from the local index')
+    parser.add_argument('--subject')
+    parser.add_argument('--grade')
+    parser.add_argument('--topic')
+    parser.add_argument('--section', help='questions in this section')
+    parser.add_argument('--difficulty', help='questions with this difficulty')
+    parser.add_argument('--min-options', type=int, help='questions with at least N options')
+    parser.add_argument('--max-options', type=int, help='questions with at most N options')
+    parser.add_argument('--json', action='store_true', help='print the matches as JSON')
+    parser.add_argument('--rebuild', action='store_true', help='discard the index and rebuild it')
+    parser.add_argument('--db', default=CORPUS_INDEX_FILE, help='index file (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        Path(args.db).unlink(missing_ok=True)
+    conn = connect(args.db)
+    stats = update_index(conn, ROOT / 'forms')
+    matches = query_quizzes(
+        conn, subject=args.subject, grade=args.grade, topic=args.topic, section=args.section,
+        difficulty=args.difficulty, min_options=args.min_options, max_options=args.max_options
+    )
+
+    if args.json:
+        print(json.dumps(matches, indent=2, ensure_ascii=False))
+    else:
+        changed = {k: v for k, v in stats.items() if v and k != 'unchanged'}
+        if changed:
+            print("Index updated:", ", ".join(f"{k} {v}" for k, v in changed.items()))
+        for m in matches:
+            print(f"{m['name']:<40} {m['subject'] or '':<12} {m['grade'] or '':<10} "
+                  f"{m['matching_questions']:>4}/{m['question_count']:<4} {m['title'] or ''}")
+        print(f"\n{len(matches)} quiz(zes) match.")
+        for e in list_errors(conn):
+            print(f"Not indexed: {e['name']} ({e['error']})")
+    conn.close()
+    return 0 if matches else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
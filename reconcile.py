@@ -0,0 +1,86 @@
+"""Reconcile the Google Drive forms folder with the quizzes in `forms/`.
+
+Usage:
+    python reconcile.py                  # report only
+    python reconcile.py --fix            # trash extra duplicates, restore trashed forms
+    python reconcile.py --fix --trash-orphans
+    python reconcile.py --json report.json
+
+What this script does:
+    - Lists the configured Drive folder (GOOGLE_DRIVE_FOLDER_ID) and the trash
+      once each, following pagination, and groups the forms by name.
+    - Reports:
+        duplicates - several active forms with the same name. The one recorded in
+                     `.publish/manifest.json` is kept, otherwise the most recent.
+        orphans    - active forms with no matching JSON file in `forms/`.
+        trashed    - forms in the trash whose JSON still exists and that have no
+                     active copy (the next publish would restore them anyway).
+    - With --fix, sends the corrections as batched Drive requests. Orphans are
+      only trashed with --trash-orphans, since they may be forms made by hand.
+      Trashed files stay recoverable from the Drive trash.
+
+Exit codes:
+    0 - nothing to fix, or every fix applied
+    1 - problems found and left in place (report only, or some fixes failed)
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / 'global'))
+from drive_folder import apply_reconcile, build_reconcile_report, get_folder_index
+from manifest import get_entry
+
+
+def quiz_names():
+    return sorted(p.stem for p in (ROOT / 'forms').glob('*.json'))
+
+
+def print_report(report):
+    print(f"Duplicates: {len(report['duplicates'])}")
+    for duplicate in report['duplicates']:
+        print(f" - {duplicate['name']}: keeping {duplicate['keep']['id']}, "
+              f"extra {', '.join(f['id'] for f in duplicate['extra'])}")
+    print(f"Orphans (no JSON in forms/): {len(report['orphans'])}")
+    for file in report['orphans']:
+        print(f" - {file['name']} ({file['id']})")
+    print(f"Trashed forms that still have a JSON: {len(report['trashed'])}")
+    for file in report['trashed']:
+        print(f" - {file['name']} ({file['id']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reconcile the Drive forms folder with forms/')
+    parser.add_argument('--fix', action='store_true',
+                        help='trash extra duplicates and restore trashed forms that still have a JSON')
+    parser.add_argument('--trash-orphans', action='store_true',
+                        help='with --fix, also trash forms that have no JSON')
+    parser.add_argument('--json', metavar='PATH', help='also write the report as JSON')
+    args = parser.parse_args(argv)
+
+    names = quiz_names()
+    keep_ids = [entry['form_id'] for entry in map(get_entry, names) if entry]
+    report = build_reconcile_report(get_folder_index(), names, keep_ids)
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    pending = len(report['duplicates']) + len(report['trashed'])
+    pending += len(report['orphans']) if args.trash_orphans or not args.fix else 0
+    if not pending:
+        print("\nOK: folder matches forms/")
+        return 0
+    if not args.fix:
+        print("\nRun with --fix to apply the corrections.")
+        return 1
+
+    counts = apply_reconcile(report, trash_orphans=args.trash_orphans)
+    print(f"\nTrashed: {counts['trashed']}, restored: {counts['restored']}, failed: {counts['failed']}")
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
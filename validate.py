@@ -1,119 +1,153 @@
 """Validate quiz JSON files in the project's `forms/` directory.
 
 Usage:
-    python validate.py <form_name>
+    python validate.py <form_name> [<form_name> ...]
+    python validate.py --all [--workers N] [--json report.json]
 
 Examples:
     python validate.py energia_renovavel_nao_renovavel
     python validate.py other_quiz.json
+    python validate.py "ingles_*" pronomes
+    python validate.py --all --json validation_report.json
 
 What this script does:
-    - Loads a JSON file from the `forms/` folder (accepts name with or without .json).
-    - Checks required top-level keys: metadata, content, questions.
-    - Validates metadata fields: title, description, subject, grade, topic.
-    - Validates each question: unique integer id, section, question text, options (2-6 unique strings), correct_answer index in range.
-    - Checks optional difficulty values against allowed set ("fácil", "médio", "difícil").
+    - Loads JSON files from the `forms/` folder (accepts names with or without .json,
+      and glob patterns; `--all` selects every file).
+    - Validates the file against `global/schema.json` (required keys, types, the
+      description/instructions shapes, content.sections, evaluation and settings,
+      option counts, difficulty values, date formats).
+    - Adds the rules the schema cannot express: unique question ids, unique option
+      texts, correct_answer index within the options, non-blank metadata.
+    - Several files are validated in parallel across processes. Every error of every
+      file is collected into one report (text, and JSON with `--json`; use `-` for stdout).
     - Prints validation errors and exits with a non-zero code on failure.
 
 Exit codes:
-    0 - validation passed
-    2 - validation failed or file not found / invalid JSON
+    0 - validation passed for every selected file
+    2 - at least one file failed validation, was not found or is invalid JSON
+        (also returned when no file matches)
 
 Notes:
     - The script is intended to be run before publishing a form to ensure the JSON meets the project's schema constraints.
-    - Keep this file in the project root so `form.py` can call it before publishing.
+    - The checks live in `global/validation.py`; `form.py` and the generator run the
+      same in-process validation before publishing, so there is no need to call this
+      script from them.
 """
+import argparse
+import fnmatch
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Reuse validation logic from previous script (embedded for simplicity)
+ROOT = Path(__file__).resolve().parent
+FORMS_DIR = ROOT / 'forms'
 
-def validate_quiz(path: Path) -> int:
-    required_metadata = ["title", "description", "subject", "grade", "topic"]
-    allowed_difficulties = {"fácil", "médio", "difícil"}
+# Validation logic lives in global/validation.py, shared with form.py and the generator
+sys.path.insert(0, str(ROOT / 'global'))
+from validation import load_quiz
 
-    errors = []
 
-    if not path.exists():
-        print(f"ERROR: quiz file not found: {path}")
+def report(errors) -> int:
+    """Print the validation outcome and return the exit code."""
+    if errors:
+        print("VALIDATION FAILED. Issues found:")
+        for e in errors:
+            print(" -", e)
         return 2
 
-    try:
-        import json
-        data = json.loads(path.read_text(encoding='utf-8'))
-    except Exception as e:
-        print("ERROR: invalid JSON:", e)
+    print("VALIDATION PASSED: quiz matches the schema and project rules.")
+    return 0
+
+
+def validate_quiz(path: Path) -> int:
+    data, errors = load_quiz(path)
+    if data is None:
+        print("ERROR:", errors[0])
         return 2
+    return report(errors)
 
-    for key in ("metadata", "content", "questions"):
-        if key not in data:
-            errors.append(f"Missing top-level key: {key}")
 
-    meta = data.get("metadata", {})
-    for k in required_metadata:
-        if k not in meta or (isinstance(meta.get(k), str) and not meta.get(k).strip()):
-            errors.append(f"Missing or empty metadata field: {k}")
+def check_file(path):
+    """Validate one file and return a report entry (runs in a worker process)."""
+    _, errors = load_quiz(path)
+    return {'file': os.path.relpath(path, ROOT), 'valid': not errors, 'errors': errors}
 
-    questions = data.get("questions")
-    if not isinstance(questions, list) or len(questions) == 0:
-        errors.append("'questions' must be a non-empty array")
-    else:
-        ids = set()
-        for i, q in enumerate(questions, start=1):
-            prefix = f"question[{i}]"
-            qid = q.get("id")
-            if not isinstance(qid, int):
-                errors.append(f"{prefix}: 'id' missing or not integer")
-            else:
-                if qid in ids:
-                    errors.append(f"Duplicate id: {qid}")
-                ids.add(qid)
-            for rk in ("section", "question", "options", "correct_answer"):
-                if rk not in q:
-                    errors.append(f"{prefix}: missing field '{rk}'")
-            opts = q.get("options")
-            if not isinstance(opts, list):
-                errors.append(f"{prefix}: 'options' must be an array")
-            else:
-                if not (2 <= len(opts) <= 6):
-                    errors.append(f"{prefix}: 'options' length must be between 2 and 6 (got {len(opts)})")
-                cleaned = [str(x).strip() for x in opts]
-                if len(set(cleaned)) != len(cleaned):
-                    errors.append(f"{prefix}: duplicate option texts found")
-            ca = q.get("correct_answer")
-            if not isinstance(ca, int):
-                errors.append(f"{prefix}: 'correct_answer' must be integer index")
-            else:
-                if isinstance(opts, list):
-                    if not (0 <= ca < len(opts)):
-                        errors.append(f"{prefix}: 'correct_answer' index {ca} out of range for options length {len(opts)}")
-            diff = q.get("difficulty")
-            if diff is not None and diff not in allowed_difficulties:
-                errors.append(f"{prefix}: invalid difficulty '{diff}'")
 
-    if errors:
-        print("VALIDATION FAILED. Issues found:")
-        for e in errors:
-            print(" -", e)
-        return 2
+def resolve_paths(names, select_all=False):
+    """Map names, `.json` file names and glob patterns to paths under forms/.
+
+    Names that match nothing are kept as-is, so they are reported as missing.
+    """
+    available = sorted(p.name for p in FORMS_DIR.glob('*.json'))
+    if select_all:
+        return [FORMS_DIR / name for name in available]
+
+    paths = []
+    for name in names:
+        filename = name if name.endswith('.json') else name + '.json'
+        if any(ch in name for ch in '*?['):
+            matches = fnmatch.filter(available, filename)
+        else:
+            matches = [filename]
+        for match in matches:
+            if FORMS_DIR / match not in paths:
+                paths.append(FORMS_DIR / match)
+    return paths
+
+
+def validate_many(paths, workers=None):
+    """Validate several files in parallel; entries come back in input order."""
+    if len(paths) == 1:
+        return [check_file(str(paths[0]))]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check_file, map(str, paths), chunksize=max(1, len(paths) // (workers * 4))))
 
-    print("VALIDATION PASSED: quiz looks good (basic checks).")
-    return 0
+
+def print_summary(entries):
+    """Print every error grouped by file, then a one-line total."""
+    failed = [e for e in entries if not e['valid']]
+    for entry in failed:
+        print(f"FAILED {entry['file']}:")
+        for error in entry['errors']:
+            print("  -", error)
+    print(f"\nChecked {len(entries)} file(s): {len(entries) - len(failed)} passed, {len(failed)} failed.")
 
 
 def main(argv):
-    if len(argv) < 2:
-        print("Usage: python validate.py <form_name>")
+    parser = argparse.ArgumentParser(description='Validate quiz JSON files in forms/')
+    parser.add_argument('names', nargs='*', help='quiz names, .json file names or glob patterns')
+    parser.add_argument('--all', action='store_true', help='validate every file in forms/')
+    parser.add_argument('--workers', type=int, help='parallel processes (default: CPU count)')
+    parser.add_argument('--json', metavar='PATH', help="write the report as JSON ('-' for stdout)")
+    args = parser.parse_args(argv[1:])
+
+    if not args.names and not args.all:
+        print("Usage: python validate.py <form_name> [<form_name> ...] | --all")
+        return 2
+
+    paths = resolve_paths(args.names, args.all)
+    if not paths:
+        print("ERROR: no quiz file matches", " ".join(args.names))
         return 2
-    form_name = argv[1]
-    if form_name.endswith('.json'):
-        filename = form_name
+
+    single = len(paths) == 1 and not args.all and not any(ch in n for n in args.names for ch in '*?[')
+    if single and not args.json:
+        return validate_quiz(paths[0])
+
+    entries = validate_many(paths, args.workers)
+    failed = sum(1 for e in entries if not e['valid'])
+    result = {'checked': len(entries), 'failed': failed, 'files': entries}
+
+    if args.json == '-':
+        print(json.dumps(result, indent=2, ensure_ascii=False))
     else:
-        filename = form_name + '.json'
-    root = Path(__file__).resolve().parent
-    forms_dir = root / 'forms'
-    quiz_path = forms_dir / filename
-    return validate_quiz(quiz_path)
+        print_summary(entries)
+        if args.json:
+            Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+    return 2 if failed else 0
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv))